@@ -1,9 +1,32 @@
+import argparse
 import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
 
+import numpy as np
 import pandas as pd
-from utils.open_csv import leer_csv_con_encoding_detectado , leer_csv_con_encoding_detectado_Comas
+from utils.dataframes import CLAVES_PARTIDO
+
+CARPETA_PROCESADA = os.path.join("Data", "procesada")
+YEARS = [2019, 2022, 2023, 2024]
+CATEGORIAS_EXCLUIDAS = ["MINI", "PREMINI"]
+
+def cargar_datos(years=YEARS, categorias=None, excluir=CATEGORIAS_EXCLUIDAS):
+    """
+    Lee del almacén solo las temporadas (y categorías) pedidas y las deja listas
+    para el ranking: nombres normalizados, sin partidos libres ni categorías excluidas.
+
+    Returns:
+        tuple: (partidos, ranking base con todos los equipos en 0 puntos)
+    """
+    # El almacén (pyarrow) se importa recién al leer datos
+    from utils.almacen import cargar_partidos
+
+    data = cargar_partidos(anios=years, categorias=categorias, categoricas=False)
+    data, ranking_base = crear_ranking_base(data)
+    if excluir:
+        data = data[~data["categoria"].str.upper().isin([c.upper() for c in excluir])]
+    return data, ranking_base
 
 #Lee y devuelve una lista de equipos.
 def crear_ranking_base(data):
@@ -61,8 +84,35 @@ def asignar_basis_points(row):
         print(f"[LOG] Error al procesar el partido: {row}")
         return (0, 0)
 
-def peso_por_anio(anio):
-    pesos = {2019: 0.25, 2022: 0.5, 2023: 0.75, 2024: 1}
+# Casos de asignar_basis_points en orden: (BP local, BP visitante) de cada condición
+_BP_LOCAL = [0, 700, 0, 0, 750, 700, 650, 250, 300, 350]
+_BP_VISITA = [0, 0, 700, 0, 250, 300, 350, 750, 700, 650]
+
+def basis_points(ptsL, ptsV):
+    # Igual que asignar_basis_points, sobre columnas enteras: devuelve (BP local, BP visitante)
+    local = np.trunc(pd.to_numeric(pd.Series(ptsL), errors="coerce").to_numpy(dtype=float))
+    visita = np.trunc(pd.to_numeric(pd.Series(ptsV), errors="coerce").to_numpy(dtype=float))
+    invalido = np.isnan(local) | np.isnan(visita)
+    diff = np.abs(local - visita)
+    gana_local = local > visita
+    gana_visita = visita > local
+    condiciones = [
+        invalido,
+        (local == 20) & (visita == 0),
+        (local == 0) & (visita == 20),
+        (local == 0) & (visita == 0),
+        gana_local & (diff >= 20),
+        gana_local & (diff >= 10),
+        gana_local,
+        gana_visita & (diff >= 20),
+        gana_visita & (diff >= 10),
+        gana_visita,
+    ]
+    return np.select(condiciones, _BP_LOCAL, default=0), np.select(condiciones, _BP_VISITA, default=0)
+
+PESOS_ANIO = {2019: 0.25, 2022: 0.5, 2023: 0.75, 2024: 1}
+
+def peso_por_anio(anio, pesos=PESOS_ANIO):
     return pesos.get(int(anio), 1)
 
 def peso_por_fase(fase, nivel):
@@ -116,93 +166,268 @@ def peso_por_nivel(nivel):
         return 0.75
     return 1
 
+def tabla_de_pesos(funcion, *columnas):
+    # Evalúa funcion una vez por combinación distinta de valores y la reparte por código
+    codigos = np.zeros(len(columnas[0]), dtype=np.int64)
+    for columna in columnas:
+        codigo, unicos = pd.factorize(columna, use_na_sentinel=False)
+        codigos = codigos * len(unicos) + codigo
+    _, primeras, inversa = np.unique(codigos, return_index=True, return_inverse=True)
+    valores = [pd.Series(columna).to_numpy(dtype=object) for columna in columnas]
+    pesos = np.array([funcion(*(v[i] for v in valores)) for i in primeras])
+    return pesos[inversa]
+
 def get_team_positions(ranking_df):
     # Returns a dict: team_name -> position (1-based)
     return {row["Equipo"]: i+1 for i, row in ranking_df.iterrows()}
 
 def calculate_orp_vectorized(df, prev_ranking):
-    team_pos = get_team_positions(prev_ranking)
     n = len(prev_ranking)
     avg = (n + 1) / 2 if n > 0 else 0
+    # Posición de cada equipo del ranking (como get_team_positions) y avg para los que no están
+    ultimos = ~prev_ranking["Equipo"].duplicated(keep="last").to_numpy()
+    equipos = pd.Index(prev_ranking["Equipo"].to_numpy()[ultimos])
+    posiciones = np.append((prev_ranking.index.to_numpy()[ultimos] + 1).astype(float), avg)
 
-    def orp_local(row):
-        vis_pos = team_pos.get(row["visitante"], avg)
-        return 1.5 * (avg - vis_pos)
-    def orp_visit(row):
-        loc_pos = team_pos.get(row["local"], avg)
-        return 1.5 * (avg - loc_pos)
+    df["ORP_LOCAL"] = 1.5 * (avg - posiciones[equipos.get_indexer(df["visitante"])])
+    df["ORP_VISITA"] = 1.5 * (avg - posiciones[equipos.get_indexer(df["local"])])
+    return df
 
-    df["ORP_LOCAL"] = df.apply(orp_local, axis=1)
-    df["ORP_VISITA"] = df.apply(orp_visit, axis=1)
+# Regla de cada peso y las columnas que recibe; se reemplazan pasando `pesos` a las funciones de ranking
+PESOS = {
+    "peso_nivel": (peso_por_nivel, ["nivel"]),
+    "peso_anio": (peso_por_anio, ["anio"]),
+    "peso_ronda": (peso_por_ronda, ["ronda", "anio"]),
+    "peso_fase": (peso_por_fase, ["fase", "nivel"]),
+}
+
+def asignar_pesos(df, pesos=None):
+    reglas = {**PESOS, **(pesos or {})}
+    for columna, (funcion, argumentos) in reglas.items():
+        df[columna] = tabla_de_pesos(funcion, *(df[a] for a in argumentos))
     return df
 
-def process_year(data, prev_ranking, year):
-    df = data[data["anio"] == year].copy()
-    # BP assignment (vectorized)
-    bp = df.apply(asignar_basis_points, axis=1, result_type="expand")
-    df["BP_LOCAL"], df["BP_VISITA"] = bp[0], bp[1]
-    # ORP assignment (vectorized)
-    df = calculate_orp_vectorized(df, prev_ranking)
+def puntuar_partidos(df, prev_ranking=None, pesos=None):
+    # BP, ORP (0 si no hay ranking previo), pesos y puntos de cada partido
+    df["BP_LOCAL"], df["BP_VISITA"] = basis_points(df["ptsL"], df["ptsV"])
+    if prev_ranking is None:
+        df["ORP_LOCAL"] = 0
+        df["ORP_VISITA"] = 0
+    else:
+        df = calculate_orp_vectorized(df, prev_ranking)
     # Weights
-    df["peso_nivel"] = df["nivel"].apply(peso_por_nivel)
-    df["peso_anio"] = df["anio"].apply(peso_por_anio)
-    df["peso_ronda"] = df.apply(lambda row: peso_por_ronda(row["ronda"], row["anio"]), axis=1)
-    df["peso_fase"] = df.apply(lambda row: peso_por_fase(row["fase"], row["nivel"]), axis=1)
+    df = asignar_pesos(df, pesos)
     # Final points
     df["LocalSuma"] = df["peso_fase"]*df["peso_ronda"]*df["peso_anio"]*df["peso_nivel"]*(df["BP_LOCAL"]+df["ORP_LOCAL"])
     df["VisitaSuma"] = df["peso_fase"]*df["peso_ronda"]*df["peso_anio"]*df["peso_nivel"]*(df["BP_VISITA"]+df["ORP_VISITA"])
-    # Aggregate
+    return df
+
+def ordenar_ranking(ranking):
+    ranking = ranking.sort_values(by="Puntos", ascending=False).reset_index(drop=True)
+    return ranking
+
+def agregar_ranking(df):
+    # Suma de LocalSuma y VisitaSuma por equipo
     local = df.groupby("local").agg({"LocalSuma": "sum"}).reset_index().rename(columns={"local": "Equipo", "LocalSuma": "Puntos"})
     visitante = df.groupby("visitante").agg({"VisitaSuma": "sum"}).reset_index().rename(columns={"visitante": "Equipo", "VisitaSuma": "Puntos"})
     ranking = pd.concat([local, visitante]).groupby("Equipo", as_index=False).agg({"Puntos": "sum"})
-    ranking = ranking.sort_values(by="Puntos", ascending=False).reset_index(drop=True)
-    return df, ranking
+    return ordenar_ranking(ranking)
 
-def process_all_years(data, years, ranking_init=None):
+def acumular_ranking(ranking_total, ranking):
+    ranking_total = pd.concat([ranking_total, ranking]).groupby("Equipo", as_index=False).agg({"Puntos": "sum"})
+    return ordenar_ranking(ranking_total)
+
+def process_year(data, prev_ranking, year, pesos=None):
+    df = puntuar_partidos(data[data["anio"] == year].copy(), prev_ranking, pesos)
+    return df, agregar_ranking(df)
+
+def process_all_years(data, years, ranking_init=None, carpeta=CARPETA_PROCESADA, pesos=None):
+    """
+    Ranking de cada temporada y acumulado, en orden. Con carpeta=None no se
+    escribe nada y los resultados quedan solo en memoria.
+
+    Returns:
+        tuple: ({year: (partidos puntuados, ranking de la temporada)}, ranking acumulado)
+    """
     rankings = {}
     ranking_total = ranking_init.copy() if ranking_init is not None else None
     for i, year in enumerate(years):
         print(f"Procesando año {year}...")
-        if i == 0 or ranking_total is None:
-            # Primer año: sin ORP
-            df = data[data["anio"] == year].copy()
-            bp = df.apply(asignar_basis_points, axis=1, result_type="expand")
-            df["BP_LOCAL"], df["BP_VISITA"] = bp[0], bp[1]
-            df["ORP_LOCAL"] = 0
-            df["ORP_VISITA"] = 0
-        else:
-            df = data[data["anio"] == year].copy()
-            bp = df.apply(asignar_basis_points, axis=1, result_type="expand")
-            df["BP_LOCAL"], df["BP_VISITA"] = bp[0], bp[1]
-            df = calculate_orp_vectorized(df, ranking_total)
-        # Weights
-        df["peso_nivel"] = df["nivel"].apply(peso_por_nivel)
-        df["peso_anio"] = df["anio"].apply(peso_por_anio)
-        df["peso_ronda"] = df.apply(lambda row: peso_por_ronda(row["ronda"], row["anio"]), axis=1)
-        df["peso_fase"] = df.apply(lambda row: peso_por_fase(row["fase"], row["nivel"]), axis=1)
-        # Final points
-        df["LocalSuma"] = df["peso_fase"]*df["peso_ronda"]*df["peso_anio"]*df["peso_nivel"]*(df["BP_LOCAL"]+df["ORP_LOCAL"])
-        df["VisitaSuma"] = df["peso_fase"]*df["peso_ronda"]*df["peso_anio"]*df["peso_nivel"]*(df["BP_VISITA"]+df["ORP_VISITA"])
-        # Aggregate
-        local = df.groupby("local").agg({"LocalSuma": "sum"}).reset_index().rename(columns={"local": "Equipo", "LocalSuma": "Puntos"})
-        visitante = df.groupby("visitante").agg({"VisitaSuma": "sum"}).reset_index().rename(columns={"visitante": "Equipo", "VisitaSuma": "Puntos"})
-        ranking = pd.concat([local, visitante]).groupby("Equipo", as_index=False).agg({"Puntos": "sum"})
-        ranking = ranking.sort_values(by="Puntos", ascending=False).reset_index(drop=True)
+        # Primer año: sin ORP
+        prev_ranking = None if i == 0 else ranking_total
+        df, ranking = process_year(data, prev_ranking, year, pesos)
         rankings[year] = (df, ranking)
         # Actualizar ranking_total sumando el ranking de este año
         if ranking_total is None:
             ranking_total = ranking.copy()
         else:
-            ranking_total = pd.concat([ranking_total, ranking]).groupby("Equipo", as_index=False).agg({"Puntos": "sum"})
-            ranking_total = ranking_total.sort_values(by="Puntos", ascending=False).reset_index(drop=True)
-        # Guardar archivos
-        df.to_csv(f"Data/procesada/{year}.csv", index=False)
-        ranking.to_csv(f"Data/procesada/Ranking{year}.csv", index=False)
-        ranking_total.to_csv(f"Data/procesada/Ranking2019-{year}.csv", index=False)
+            ranking_total = acumular_ranking(ranking_total, ranking)
+        if carpeta is not None:
+            guardar_temporada(carpeta, year, df, ranking, ranking_total)
     return rankings, ranking_total
 
-data = leer_csv_con_encoding_detectado("Data/procesada/19-24.csv", ";")
-data, ranking_base = crear_ranking_base(data)
-data = data[~data["categoria"].str.upper().isin(["MINI", "PREMINI"])]
-years = [2019, 2022, 2023, 2024]
-process_all_years(data, years, ranking_init=ranking_base)
+def calcular_ranking(years=YEARS, data=None, categorias=None, excluir=CATEGORIAS_EXCLUIDAS,
+                     pesos=None, carpeta=None):
+    """
+    Punto de entrada del ranking para otros módulos (apps, tests, simulaciones).
+
+    Args:
+        years (list): Temporadas en orden; la primera se puntúa sin ORP.
+        data (pd.DataFrame): Partidos ya preparados; si es None se leen del almacén
+            solo las temporadas de `years` (ver cargar_datos).
+        categorias (list): Solo al leer del almacén: categorías a incluir (None = todas).
+        excluir (list): Solo al leer del almacén: categorías a descartar.
+        pesos (dict): Reglas de peso que reemplazan a las de PESOS, con la misma forma
+            {"peso_anio": (funcion, ["anio"]), ...}.
+        carpeta (str): Carpeta donde escribir los CSV; None = no escribir.
+
+    Returns:
+        tuple: ({year: (partidos puntuados, ranking de la temporada)}, ranking acumulado)
+    """
+    if data is None:
+        data, ranking_base = cargar_datos(years, categorias, excluir)
+    else:
+        data, ranking_base = crear_ranking_base(data.copy())
+    return process_all_years(data, list(years), ranking_init=ranking_base, carpeta=carpeta, pesos=pesos)
+
+def guardar_temporada(carpeta, year, df, ranking, ranking_total):
+    df.to_csv(os.path.join(carpeta, f"{year}.csv"), index=False)
+    ranking.to_csv(os.path.join(carpeta, f"Ranking{year}.csv"), index=False)
+    ranking_total.to_csv(os.path.join(carpeta, f"Ranking2019-{year}.csv"), index=False)
+
+# Columnas que identifican un partido y su resultado: si no cambian, sus puntos tampoco
+COLUMNAS_FIRMA = CLAVES_PARTIDO + ["ronda", "nivel", "ptsL", "ptsV"]
+COLUMNAS_CALCULADAS = [
+    "BP_LOCAL", "BP_VISITA", "ORP_LOCAL", "ORP_VISITA",
+    "peso_nivel", "peso_anio", "peso_ronda", "peso_fase", "LocalSuma", "VisitaSuma",
+]
+
+def firmas_partidos(df):
+    # Texto por partido con COLUMNAS_FIRMA más el número de aparición (por partidos repetidos)
+    texto = [
+        df[c].astype(object).where(df[c].notna(), "").astype(str).to_numpy() for c in COLUMNAS_FIRMA
+    ]
+    firma = pd.Series(["|".join(fila) for fila in zip(*texto)], index=df.index)
+    return firma + "#" + firma.groupby(firma).cumcount().astype(str)
+
+def leer_procesado(ruta, **kwargs):
+    # round_trip: los puntos vuelven exactamente como se escribieron
+    return pd.read_csv(ruta, float_precision="round_trip", **kwargs)
+
+def _reemplazar_equipos(ranking, nuevos, afectados):
+    # Saca del ranking guardado los equipos afectados y pone sus puntos recalculados
+    ranking = pd.concat([ranking[~ranking["Equipo"].isin(afectados)], nuevos])
+    # Mismo orden de entrada que el groupby de agregar_ranking, para que los empates queden igual
+    return ordenar_ranking(ranking.sort_values("Equipo").reset_index(drop=True))
+
+def actualizar_temporada(data, year, anterior, carpeta=CARPETA_PROCESADA, pesos=None):
+    """
+    Actualiza el ranking de una temporada sin recalcular las anteriores.
+
+    Parte del ranking acumulado hasta `anterior` (Ranking2019-{anterior}.csv)
+    y de lo guardado para `year` en una corrida previa. Solo se puntúan los
+    partidos nuevos o con resultado distinto, y solo se recalculan los puntos
+    de los equipos que jugaron esos partidos (o los que desaparecieron).
+    Escribe únicamente los tres archivos de `year`.
+
+    Args:
+        data (pd.DataFrame): Partidos (al menos los de `year`), ya pasados por crear_ranking_base.
+        year (int): Temporada a actualizar.
+        anterior (int): Última temporada ya procesada antes de `year`.
+        carpeta (str): Carpeta con los CSV de process_all_years.
+        pesos (dict): Reglas de peso, como en calcular_ranking (deben ser las de la corrida guardada).
+
+    Returns:
+        tuple: (partidos puntuados, ranking de la temporada, ranking acumulado)
+    """
+    ruta_total_previo = os.path.join(carpeta, f"Ranking2019-{anterior}.csv")
+    ranking_previo = leer_procesado(ruta_total_previo)
+    df = data[data["anio"] == year].copy()
+
+    rutas = [os.path.join(carpeta, f"{nombre}.csv") for nombre in (year, f"Ranking{year}", f"Ranking2019-{year}")]
+    # Lo guardado sirve si existe y se calculó con el acumulado vigente
+    hay_estado = all(os.path.exists(ruta) for ruta in rutas) and all(
+        os.stat(ruta).st_mtime_ns >= os.stat(ruta_total_previo).st_mtime_ns for ruta in rutas
+    )
+    if not hay_estado:
+        df = puntuar_partidos(df, ranking_previo, pesos)
+        ranking = agregar_ranking(df)
+        ranking_total = acumular_ranking(ranking_previo, ranking)
+        guardar_temporada(carpeta, year, df, ranking, ranking_total)
+        return df, ranking, ranking_total
+
+    guardados = leer_procesado(rutas[0], dtype={c: str for c in COLUMNAS_FIRMA})
+    firmas = firmas_partidos(df)
+    firmas_guardadas = firmas_partidos(guardados)
+    cambiados = ~firmas.isin(firmas_guardadas)
+    quitados = ~firmas_guardadas.isin(firmas)
+
+    # Los partidos sin cambios conservan sus valores; el resto se puntúa de nuevo
+    calculados = guardados.set_index(firmas_guardadas.to_numpy())[COLUMNAS_CALCULADAS]
+    mascara = cambiados.to_numpy()
+    valores = {c: np.empty(len(df), dtype=object) for c in COLUMNAS_CALCULADAS}
+    if (~mascara).any():
+        reusados = calculados.loc[firmas[~mascara].to_numpy()]
+        for c in COLUMNAS_CALCULADAS:
+            valores[c][~mascara] = reusados[c].to_numpy()
+    if mascara.any():
+        nuevos = puntuar_partidos(df[mascara].copy(), ranking_previo, pesos)
+        for c in COLUMNAS_CALCULADAS:
+            valores[c][mascara] = nuevos[c].to_numpy()
+    for c in COLUMNAS_CALCULADAS:
+        df[c] = pd.to_numeric(pd.Series(valores[c], index=df.index))
+
+    afectados = pd.unique(pd.concat([
+        df.loc[mascara, "local"], df.loc[mascara, "visitante"],
+        guardados.loc[quitados.to_numpy(), "local"], guardados.loc[quitados.to_numpy(), "visitante"],
+    ]))
+    print(f"{year}: {int(cambiados.sum())} partidos nuevos o cambiados, "
+          f"{int(quitados.sum())} quitados, {len(afectados)} equipos afectados")
+
+    juegan = df["local"].isin(afectados) | df["visitante"].isin(afectados)
+    puntos = agregar_ranking(df[juegan])
+    puntos = puntos[puntos["Equipo"].isin(afectados)]
+    ranking = _reemplazar_equipos(leer_procesado(rutas[1]), puntos, afectados)
+    total = acumular_ranking(ranking_previo[ranking_previo["Equipo"].isin(afectados)], puntos)
+    ranking_total = _reemplazar_equipos(leer_procesado(rutas[2]), total, afectados)
+
+    guardar_temporada(carpeta, year, df, ranking, ranking_total)
+    return df, ranking, ranking_total
+
+def parsear_argumentos(argv=None):
+    parser = argparse.ArgumentParser(description="Ranking de equipos por temporadas")
+    parser.add_argument("--anios", type=int, nargs="+", default=YEARS, help="Temporadas, en orden")
+    parser.add_argument("--categorias", nargs="+", help="Solo estas categorías")
+    parser.add_argument(
+        "--excluir", nargs="*", default=CATEGORIAS_EXCLUIDAS, help="Categorías a descartar"
+    )
+    parser.add_argument("--salida", default=CARPETA_PROCESADA, help="Carpeta de los CSV")
+    parser.add_argument(
+        "--temporada", type=int,
+        help="Actualizar solo esta temporada sobre el acumulado ya guardado (modo incremental)",
+    )
+    parser.add_argument("--top", type=int, default=0, help="Mostrar los primeros N del acumulado")
+    args = parser.parse_args(argv)
+    if args.temporada is not None and not any(y < args.temporada for y in args.anios):
+        parser.error(
+            f"--temporada {args.temporada} necesita una temporada anterior en --anios "
+            f"para partir de su acumulado; para la primera usar la corrida completa"
+        )
+    return args
+
+def main(argv=None):
+    args = parsear_argumentos(argv)
+    os.makedirs(args.salida, exist_ok=True)
+    if args.temporada is None:
+        _, ranking_total = calcular_ranking(
+            args.anios, categorias=args.categorias, excluir=args.excluir, carpeta=args.salida
+        )
+    else:
+        anterior = max(y for y in args.anios if y < args.temporada)
+        data, _ = cargar_datos([args.temporada], args.categorias, args.excluir)
+        _, _, ranking_total = actualizar_temporada(data, args.temporada, anterior, carpeta=args.salida)
+    if args.top:
+        print(ranking_total.head(args.top).to_string())
+
+if __name__ == "__main__":
+    main()
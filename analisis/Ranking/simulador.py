@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+"""
+Simulador de ranking: "¿dónde quedaríamos si ganamos los próximos N partidos?".
+
+Parte de una temporada ya puntuada (los partidos con BP, ORP y pesos de
+Functions.py) y del acumulado previo. El ORP y los pesos de un partido no
+dependen de su resultado, así que un escenario solo cambia los BP: cada
+resultado hipotético se traduce en una diferencia de puntos para local y
+visitante, sin volver a correr el ranking. Muchos escenarios sobre los mismos
+partidos se evalúan juntos como matrices (escenarios x partidos).
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+import numpy as np
+import pandas as pd
+
+from analisis.Ranking.Functions import (
+    CARPETA_PROCESADA,
+    agregar_ranking,
+    basis_points,
+    crear_ranking_base,
+    leer_procesado,
+    process_all_years,
+    process_year,
+    puntuar_partidos,
+)
+from utils.dataframes import CLAVES_PARTIDO
+
+COLUMNAS_PESO = ["peso_fase", "peso_ronda", "peso_anio", "peso_nivel"]
+
+
+def _texto(df, columnas):
+    # Clave de texto por fila; los números enteros leídos como float ("3.0") se escriben como "3"
+    valores = []
+    for c in columnas:
+        serie = df[c]
+        if pd.api.types.is_numeric_dtype(serie) and (serie.dropna() % 1 == 0).all():
+            serie = serie.astype("Int64")
+        valores.append(serie.astype(object).where(serie.notna(), "").astype(str).to_numpy())
+    return ["|".join(fila) for fila in zip(*valores)]
+
+
+def posiciones(puntos: np.ndarray) -> np.ndarray:
+    """
+    Posición (1 = primero) de cada equipo en cada escenario.
+
+    Args:
+        puntos (np.ndarray): Puntos, forma (escenarios, equipos).
+
+    Returns:
+        np.ndarray: Posiciones, misma forma; los empates se ordenan por nombre.
+    """
+    orden = np.argsort(-puntos, axis=1, kind="stable")
+    resultado = np.empty_like(orden)
+    rango = np.broadcast_to(np.arange(1, puntos.shape[1] + 1), orden.shape)
+    np.put_along_axis(resultado, orden, rango, axis=1)
+    return resultado
+
+
+class SimuladorRanking:
+    """
+    Estado de una temporada puntuada, listo para evaluar resultados hipotéticos.
+
+    Guarda por partido el factor de pesos, el ORP y los puntos actuales, y por
+    equipo el acumulado previo y los puntos de la temporada. Los equipos van en
+    orden alfabético (self.equipos).
+    """
+
+    def __init__(self, partidos: pd.DataFrame, ranking_previo: pd.DataFrame = None, pesos=None):
+        """
+        Args:
+            partidos (pd.DataFrame): Partidos de la temporada ya puntuados (puntuar_partidos
+                o el {year}.csv guardado).
+            ranking_previo (pd.DataFrame): Acumulado hasta la temporada anterior
+                (None si es la primera: sin ORP).
+            pesos (dict): Reglas de peso de la corrida, para puntuar partidos nuevos.
+        """
+        self.partidos = partidos.reset_index(drop=True)
+        self.ranking_previo = ranking_previo
+        self.pesos = pesos
+        self.anio = self.partidos["anio"].iloc[0] if len(self.partidos) else None
+
+        if ranking_previo is None:
+            previo = pd.Series(dtype=float)
+        else:
+            previo = ranking_previo.groupby("Equipo")["Puntos"].sum()
+        self.equipos = pd.Index(
+            sorted(set(previo.index) | set(self.partidos["local"]) | set(self.partidos["visitante"]))
+        )
+        temporada = agregar_ranking(self.partidos).set_index("Equipo")["Puntos"]
+        self.puntos = (
+            previo.reindex(self.equipos, fill_value=0).to_numpy(dtype=float)
+            + temporada.reindex(self.equipos, fill_value=0).to_numpy(dtype=float)
+        )
+        self.posiciones = posiciones(self.puntos[None, :])[0]
+
+    @classmethod
+    def desde_datos(cls, data: pd.DataFrame, years, pesos=None) -> "SimuladorRanking":
+        """Calcula en memoria las temporadas de `years` y simula sobre la última."""
+        data, ranking_base = crear_ranking_base(data.copy())
+        ranking_previo = None
+        if len(years) > 1:
+            _, ranking_previo = process_all_years(
+                data, list(years[:-1]), ranking_init=ranking_base, carpeta=None, pesos=pesos
+            )
+        partidos, _ = process_year(data, ranking_previo, years[-1], pesos)
+        return cls(partidos, ranking_previo, pesos)
+
+    @classmethod
+    def desde_carpeta(cls, year, anterior, carpeta=CARPETA_PROCESADA, pesos=None) -> "SimuladorRanking":
+        """Usa los partidos puntuados y el acumulado que ya escribió Functions.py."""
+        partidos = leer_procesado(os.path.join(carpeta, f"{year}.csv"))
+        ranking_previo = leer_procesado(os.path.join(carpeta, f"Ranking2019-{anterior}.csv"))
+        return cls(partidos, ranking_previo, pesos)
+
+    def _preparar(self, escenario: pd.DataFrame) -> dict:
+        """
+        Ubica cada partido del escenario: los que coinciden con uno de la temporada
+        (por las columnas de CLAVES_PARTIDO presentes) lo reemplazan; el resto son
+        partidos nuevos, que se puntúan con el ranking previo y las reglas de peso.
+        """
+        escenario = escenario.reset_index(drop=True).copy()
+        for columna in ("local", "visitante"):
+            escenario[columna] = escenario[columna].astype(str).str.strip().str.upper()
+        desconocidos = set(escenario["local"]) | set(escenario["visitante"])
+        desconocidos -= set(self.equipos)
+        if desconocidos:
+            raise ValueError(f"Equipos que no están en el ranking: {sorted(desconocidos)}")
+
+        claves = [c for c in CLAVES_PARTIDO if c in escenario.columns]
+        existentes = pd.Series(range(len(self.partidos)), index=_texto(self.partidos, claves))
+        existentes = existentes[~existentes.index.duplicated(keep=False)]
+        buscadas = _texto(escenario, claves)
+        ambiguas = set(buscadas) & set(_texto(self.partidos, claves)) - set(existentes.index)
+        if ambiguas:
+            raise ValueError(
+                f"Partidos del escenario que coinciden con varios de la temporada: {sorted(ambiguas)}; "
+                f"agregar columnas de {CLAVES_PARTIDO} para distinguirlos"
+            )
+        indices = existentes.reindex(buscadas).fillna(-1).to_numpy(dtype=np.int64)
+
+        factor = np.empty(len(escenario))
+        orp = np.empty((2, len(escenario)))
+        actuales = np.zeros((2, len(escenario)))
+        previos = indices >= 0
+        if previos.any():
+            jugados = self.partidos.iloc[indices[previos]]
+            factor[previos] = np.prod(jugados[COLUMNAS_PESO].to_numpy(dtype=float), axis=1)
+            orp[:, previos] = jugados[["ORP_LOCAL", "ORP_VISITA"]].to_numpy(dtype=float).T
+            actuales[:, previos] = jugados[["LocalSuma", "VisitaSuma"]].to_numpy(dtype=float).T
+        if (~previos).any():
+            nuevos = escenario[~previos].copy()
+            nuevos["anio"] = self.anio
+            for columna in ("fase", "ronda", "nivel", "ptsL", "ptsV"):
+                if columna not in nuevos.columns:
+                    nuevos[columna] = None
+            nuevos = puntuar_partidos(nuevos, self.ranking_previo, self.pesos)
+            factor[~previos] = np.prod(nuevos[COLUMNAS_PESO].to_numpy(dtype=float), axis=1)
+            orp[:, ~previos] = nuevos[["ORP_LOCAL", "ORP_VISITA"]].to_numpy(dtype=float).T
+
+        return {
+            "local": self.equipos.get_indexer(escenario["local"]),
+            "visitante": self.equipos.get_indexer(escenario["visitante"]),
+            "factor": factor,
+            "orp": orp,
+            "actuales": actuales,
+        }
+
+    def simular_lote(self, escenario: pd.DataFrame, ptsL, ptsV) -> dict:
+        """
+        Evalúa muchos escenarios sobre los mismos partidos.
+
+        Args:
+            escenario (pd.DataFrame): Partidos a simular (local, visitante y, para
+                reemplazar uno ya jugado, las columnas de CLAVES_PARTIDO que lo identifiquen).
+            ptsL: Tantos del local, forma (escenarios, partidos) o (partidos,).
+            ptsV: Tantos del visitante, misma forma.
+
+        Returns:
+            dict: "puntos" y "posiciones" de cada equipo, forma (escenarios, equipos),
+                en el orden de self.equipos.
+        """
+        partidos = self._preparar(escenario)
+        ptsL = np.atleast_2d(np.asarray(ptsL, dtype=float))
+        ptsV = np.atleast_2d(np.asarray(ptsV, dtype=float))
+        bp_local, bp_visita = basis_points(ptsL.ravel(), ptsV.ravel())
+        bp_local = bp_local.reshape(ptsL.shape)
+        bp_visita = bp_visita.reshape(ptsV.shape)
+
+        # Diferencia de puntos de cada partido respecto de su resultado actual
+        suma_local = partidos["factor"] * (bp_local + partidos["orp"][0]) - partidos["actuales"][0]
+        suma_visita = partidos["factor"] * (bp_visita + partidos["orp"][1]) - partidos["actuales"][1]
+
+        # Matrices (partidos x equipos) que reparten cada partido a sus dos equipos
+        filas = np.arange(len(partidos["factor"]))
+        es_local = np.zeros((len(filas), len(self.equipos)))
+        es_visita = np.zeros((len(filas), len(self.equipos)))
+        es_local[filas, partidos["local"]] = 1
+        es_visita[filas, partidos["visitante"]] = 1
+
+        puntos = self.puntos + suma_local @ es_local + suma_visita @ es_visita
+        return {"puntos": puntos, "posiciones": posiciones(puntos)}
+
+    def simular(self, escenario: pd.DataFrame) -> pd.DataFrame:
+        """
+        Ranking acumulado con los resultados de `escenario` (columnas ptsL y ptsV).
+
+        Returns:
+            pd.DataFrame: Equipo, Puntos, Posicion, PosicionActual y Cambio
+                (positivo = sube), ordenado por Posicion.
+        """
+        resultado = self.simular_lote(escenario, escenario["ptsL"].to_numpy(), escenario["ptsV"].to_numpy())
+        ranking = pd.DataFrame(
+            {
+                "Equipo": self.equipos,
+                "Puntos": resultado["puntos"][0],
+                "Posicion": resultado["posiciones"][0],
+                "PosicionActual": self.posiciones,
+            }
+        )
+        ranking["Cambio"] = ranking["PosicionActual"] - ranking["Posicion"]
+        return ranking.sort_values("Posicion").reset_index(drop=True)
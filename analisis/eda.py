@@ -6,15 +6,14 @@ import os
 # Agrega el directorio padre al path de Python
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from utils.open_csv import leer_csv_con_encoding_detectado
+from utils.almacen import cargar_partidos
 
 # === Configuración ===
 columnas_clave = ["local", "visitante", "categoria", "fase", "ronda", "nivel", "zona", "grupo",  "fecha"]
-path_archivos = "data/procesada/19-24.csv"
 output_dir = "outputs"
 os.makedirs(output_dir, exist_ok=True)
 
-df_total = leer_csv_con_encoding_detectado(path_archivos)
+df_total = cargar_partidos(categoricas=False)
 
 # === Filtrado de partidos inválidos ===
 def es_valido(row):
@@ -0,0 +1,361 @@
+# -*- coding: utf-8 -*-
+"""
+Proyección Monte Carlo de las tablas por categoría/zona/grupo de la temporada
+en curso (las mismas tablas que arma tabla_2025.py).
+
+1. La fuerza de cada equipo sale de los tantos ya jugados: por categoría se
+   ajusta por mínimos cuadrados (con regularización) un modelo
+   tantos = media + localía + ataque(equipo) - defensa(rival).
+2. Los partidos que faltan de cada grupo se simulan muchas veces a la vez:
+   matrices (simulaciones x partidos) de diferencias normales alrededor de lo
+   esperado, que se suman a la tabla actual con un producto de matrices.
+3. Se ordena cada tabla simulada por puntos, DP y PF, y se cuenta en qué
+   posición termina cada equipo.
+
+Los grupos son independientes, así que se pueden repartir entre procesos.
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import pandas as pd
+
+from utils.logger import get_logger
+
+logger = get_logger("Proyeccion")
+
+CLAVES_GRUPO = ["categoria", "zona", "grupo"]
+TAMANIO_BLOQUE = 20_000
+
+
+def puntos_tabla(ptsL, ptsV):
+    """
+    Puntos de tabla (local, visitante) de cada partido, con las reglas de
+    calcular_puntos_categoria en tabla_2025.py: 2 el ganador, 1 el perdedor,
+    0 el no presentado (20-0) y 0 a ambos en un 0-0.
+    """
+    ptsL = np.asarray(ptsL)
+    ptsV = np.asarray(ptsV)
+    condiciones = [
+        (ptsL == 20) & (ptsV == 0),
+        (ptsL == 0) & (ptsV == 20),
+        ptsL > ptsV,
+        ptsL < ptsV,
+        (ptsL == 0) & (ptsV == 0),
+    ]
+    return (
+        np.select(condiciones, [2, 0, 2, 1, 0], default=1),
+        np.select(condiciones, [0, 2, 1, 2, 0], default=1),
+    )
+
+
+def _es_walkover(df: pd.DataFrame) -> pd.Series:
+    return ((df["ptsL"] == 20) & (df["ptsV"] == 0)) | ((df["ptsL"] == 0) & (df["ptsV"].isin([0, 20])))
+
+
+def estimar_fuerzas(partidos: pd.DataFrame, regularizacion: float = 5.0) -> Dict[str, dict]:
+    """
+    Ajusta, por categoría, ataque y defensa de cada equipo a partir de los
+    partidos jugados (sin walkovers).
+
+    Args:
+        partidos (pd.DataFrame): Partidos con tantos.
+        regularizacion (float): Peso de la penalización que acerca ataque y defensa
+            a 0; evita valores extremos en equipos con pocos partidos.
+
+    Returns:
+        Dict[str, dict]: Por categoría: equipos (pd.Index), ataque y defensa
+            (np.ndarray), media, localia y desvio (desvío de los tantos de un equipo).
+    """
+    jugados = partidos.dropna(subset=["ptsL", "ptsV"])
+    jugados = jugados[~_es_walkover(jugados)]
+    modelos = {}
+    for categoria, df in jugados.groupby("categoria"):
+        equipos = pd.Index(sorted(set(df["local"]) | set(df["visitante"])))
+        n, t = len(df), len(equipos)
+        local = equipos.get_indexer(df["local"])
+        visita = equipos.get_indexer(df["visitante"])
+
+        # Dos filas por partido: tantos del local y tantos del visitante
+        # Columnas: media, localía, ataque (t), defensa (t)
+        x = np.zeros((2 * n, 2 + 2 * t))
+        filas = np.arange(n)
+        x[:, 0] = 1
+        x[filas, 1] = 1
+        x[filas, 2 + local] = 1
+        x[filas, 2 + t + visita] = -1
+        x[n + filas, 2 + visita] = 1
+        x[n + filas, 2 + t + local] = -1
+        y = np.concatenate([df["ptsL"].to_numpy(dtype=float), df["ptsV"].to_numpy(dtype=float)])
+
+        penalizacion = np.full(2 + 2 * t, regularizacion)
+        penalizacion[:2] = 0
+        beta = np.linalg.solve(x.T @ x + np.diag(penalizacion), x.T @ y)
+        residuos = y - x @ beta
+        modelos[categoria] = {
+            "equipos": equipos,
+            "ataque": beta[2:2 + t],
+            "defensa": beta[2 + t:],
+            "media": beta[0],
+            "localia": beta[1],
+            "desvio": float(np.sqrt(residuos @ residuos / max(len(y) - len(beta), 1))),
+        }
+    return modelos
+
+
+def fixture_restante(partidos: pd.DataFrame, completar: bool = True) -> pd.DataFrame:
+    """
+    Partidos por jugar: los que no tienen resultado y, si `completar`, los cruces
+    que faltan en cada grupo. Un grupo con algún cruce jugado de ida y de vuelta
+    se toma como ida y vuelta (cada par una vez de local); si no, todos contra todos.
+
+    Returns:
+        pd.DataFrame: categoria, zona, grupo, local y visitante de cada partido pendiente.
+    """
+    columnas = CLAVES_GRUPO + ["local", "visitante"]
+    pendientes = [partidos.loc[partidos["ptsL"].isna() | partidos["ptsV"].isna(), columnas]]
+    if completar:
+        for clave, df in partidos.groupby(CLAVES_GRUPO):
+            equipos = sorted(set(df["local"]) | set(df["visitante"]))
+            cruces = set(zip(df["local"], df["visitante"]))
+            ida_y_vuelta = any((v, l) in cruces for l, v in cruces)
+            faltan = []
+            for i, a in enumerate(equipos):
+                for b in equipos[i + 1:]:
+                    if ida_y_vuelta:
+                        faltan += [(l, v) for l, v in ((a, b), (b, a)) if (l, v) not in cruces]
+                    elif (a, b) not in cruces and (b, a) not in cruces:
+                        faltan.append((a, b))
+            if faltan:
+                pendientes.append(pd.DataFrame([clave + par for par in faltan], columns=columnas))
+    return pd.concat(pendientes, ignore_index=True)
+
+
+def _tabla_actual(jugados: pd.DataFrame, equipos: pd.Index) -> Dict[str, np.ndarray]:
+    """Puntos, DP y PF actuales de cada equipo del grupo."""
+    tabla = {c: np.zeros(len(equipos)) for c in ("puntos", "DP", "PF", "PJ")}
+    if jugados.empty:
+        return tabla
+    local = equipos.get_indexer(jugados["local"])
+    visita = equipos.get_indexer(jugados["visitante"])
+    ptsL = jugados["ptsL"].to_numpy(dtype=float)
+    ptsV = jugados["ptsV"].to_numpy(dtype=float)
+    puntos_local, puntos_visita = puntos_tabla(ptsL, ptsV)
+    for indice, puntos, favor, contra in ((local, puntos_local, ptsL, ptsV), (visita, puntos_visita, ptsV, ptsL)):
+        np.add.at(tabla["puntos"], indice, puntos)
+        np.add.at(tabla["PF"], indice, favor)
+        np.add.at(tabla["DP"], indice, favor - contra)
+        np.add.at(tabla["PJ"], indice, 1)
+    return tabla
+
+
+def simular_grupo(tarea: dict) -> dict:
+    """
+    Simula los partidos pendientes de un grupo y cuenta las posiciones finales.
+
+    Solo se sortea la diferencia de cada partido (local - visitante): define el
+    ganador y la DP. Como es continua, dos equipos no empatan en DP y el PF
+    (que se suma con su valor esperado) solo desempata si no quedan partidos.
+
+    Args:
+        tarea (dict): Arma proyectar: equipos, tabla actual, índices y tantos
+            esperados de los pendientes, desvío, simulaciones y semilla.
+
+    Returns:
+        dict: clave del grupo, conteo (equipos x posiciones) y puntos finales medios.
+    """
+    t = len(tarea["equipos"])
+    m = len(tarea["local"])
+    rng = np.random.default_rng(tarea["semilla"])
+    tabla = tarea["tabla"]
+    conteo = np.zeros((t, t), dtype=np.int64)
+    suma_puntos = np.zeros(t)
+
+    # Cada partido suma al local y resta al visitante (partidos x equipos)
+    signo = np.zeros((m, t), dtype=np.float32)
+    signo[np.arange(m), tarea["local"]] += 1
+    signo[np.arange(m), tarea["visitante"]] -= 1
+    # Ganado = 2 y perdido = 1: cada equipo suma 1 por partido y el ganador 1 más.
+    # Con g = 1 si gana el local, el ganador recibe g al local y 1 - g al visitante.
+    jugados = np.bincount(tarea["visitante"], minlength=t) + np.bincount(tarea["local"], minlength=t)
+    puntos_base = tabla["puntos"] + jugados + np.bincount(tarea["visitante"], minlength=t)
+    pf = tabla["PF"].copy()
+    np.add.at(pf, tarea["local"], tarea["esperado_local"])
+    np.add.at(pf, tarea["visitante"], tarea["esperado_visita"])
+    media = (tarea["esperado_local"] - tarea["esperado_visita"]).astype(np.float32)
+    desvio = np.float32(tarea["desvio"] * np.sqrt(2))
+    # Sin partidos pendientes la tabla final es una sola: alcanza con una simulación
+    restantes = tarea["simulaciones"] if m else 1
+    while restantes > 0:
+        b = min(restantes, TAMANIO_BLOQUE)
+        restantes -= b
+        diferencia = rng.standard_normal((b, m), dtype=np.float32)
+        diferencia *= desvio
+        diferencia += media
+        puntos = puntos_base + (diferencia > 0).astype(np.float32) @ signo
+        dp = tabla["DP"] + diferencia @ signo
+
+        # Orden de tabla_2025.py: puntos, DP y PF, todo descendente, en una sola clave
+        clave = puntos * 1e10 + (dp + 1e5) * 1e4 + pf
+        # orden[s, p] = equipo en la posición p; los empates quedan por nombre
+        orden = np.argsort(-clave, axis=1, kind="stable")
+        conteo += np.bincount((orden * t + np.arange(t)).ravel(), minlength=t * t).reshape(t, t)
+        suma_puntos += puntos.sum(axis=0)
+
+    simuladas = tarea["simulaciones"] if m else 1
+    return {
+        "clave": tarea["clave"],
+        "conteo": conteo * (tarea["simulaciones"] // simuladas),
+        "puntos_esperados": suma_puntos / simuladas,
+    }
+
+
+def proyectar(
+    partidos: pd.DataFrame,
+    simulaciones: int = 100_000,
+    clasificados: int = 4,
+    workers: int = 1,
+    semilla: Optional[int] = None,
+    desde_jornada: Optional[int] = None,
+    completar_fixture: bool = True,
+    regularizacion: float = 5.0,
+) -> pd.DataFrame:
+    """
+    Probabilidades de posición final de cada equipo en su grupo.
+
+    Args:
+        partidos (pd.DataFrame): Partidos de la temporada (los pendientes, sin tantos).
+        simulaciones (int): Simulaciones por grupo.
+        clasificados (int): Posiciones que clasifican (prob_clasifica = P(posición <= clasificados)).
+        workers (int): Procesos entre los que se reparten los grupos (1 = en el proceso actual).
+        semilla (int): Semilla para que la proyección sea reproducible; cada grupo
+            recibe su propia semilla derivada, así que no depende de `workers`.
+        desde_jornada (int): Para evaluar el modelo: se toman como pendientes los
+            partidos de jornadas posteriores (0 = toda la temporada).
+        completar_fixture (bool): Agregar los cruces que faltan (ver fixture_restante).
+        regularizacion (float): Ver estimar_fuerzas.
+
+    Returns:
+        pd.DataFrame: Por equipo: grupo, PJ y puntos actuales, puntos esperados,
+            posición media, prob_clasifica y prob_pos_1..prob_pos_N.
+    """
+    partidos = partidos.copy()
+    for columna in ("local", "visitante"):
+        partidos[columna] = partidos[columna].astype(str).str.strip()
+    partidos = partidos[~partidos["local"].str.contains("LIBRE") & ~partidos["visitante"].str.contains("LIBRE")]
+    if desde_jornada is not None:
+        partidos.loc[pd.to_numeric(partidos["jornada"]) > desde_jornada, ["ptsL", "ptsV"]] = np.nan
+
+    jugados = partidos.dropna(subset=["ptsL", "ptsV"])
+    modelos = estimar_fuerzas(jugados, regularizacion)
+    pendientes = fixture_restante(partidos, completar_fixture)
+    pendientes_por_grupo = dict(list(pendientes.groupby(CLAVES_GRUPO)))
+    jugados_por_grupo = dict(list(jugados.groupby(CLAVES_GRUPO)))
+
+    grupos = sorted(set(map(tuple, partidos[CLAVES_GRUPO].drop_duplicates().to_numpy())))
+    semillas = np.random.SeedSequence(semilla).spawn(len(grupos))
+    tareas = []
+    for clave, semilla_grupo in zip(grupos, semillas):
+        vacio = pendientes.iloc[:0]
+        df = partidos[(partidos[CLAVES_GRUPO] == pd.Series(clave, index=CLAVES_GRUPO)).all(axis=1)]
+        equipos = pd.Index(sorted(set(df["local"]) | set(df["visitante"])))
+        pend = pendientes_por_grupo.get(clave, vacio)
+        modelo = modelos.get(clave[0])
+        ataque = np.zeros(len(equipos))
+        defensa = np.zeros(len(equipos))
+        media, localia, desvio = 60.0, 0.0, 12.0
+        if modelo is not None:
+            posicion = modelo["equipos"].get_indexer(equipos)
+            conocido = posicion >= 0
+            ataque[conocido] = modelo["ataque"][posicion[conocido]]
+            defensa[conocido] = modelo["defensa"][posicion[conocido]]
+            media, localia, desvio = modelo["media"], modelo["localia"], modelo["desvio"]
+        local = equipos.get_indexer(pend["local"])
+        visita = equipos.get_indexer(pend["visitante"])
+        tareas.append(
+            {
+                "clave": clave,
+                "equipos": equipos,
+                "tabla": _tabla_actual(jugados_por_grupo.get(clave, jugados.iloc[:0]), equipos),
+                "local": local,
+                "visitante": visita,
+                "esperado_local": media + localia + ataque[local] - defensa[visita],
+                "esperado_visita": media + ataque[visita] - defensa[local],
+                "desvio": desvio,
+                "simulaciones": simulaciones,
+                "semilla": semilla_grupo,
+            }
+        )
+
+    if workers <= 1 or len(tareas) <= 1:
+        resultados = [simular_grupo(tarea) for tarea in tareas]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tareas))) as pool:
+            resultados = list(pool.map(simular_grupo, tareas, chunksize=max(1, len(tareas) // (4 * workers))))
+
+    filas: List[dict] = []
+    for tarea, resultado in zip(tareas, resultados):
+        probabilidades = resultado["conteo"] / simulaciones
+        for i, equipo in enumerate(tarea["equipos"]):
+            fila = dict(zip(CLAVES_GRUPO, tarea["clave"]))
+            fila.update(
+                {
+                    "equipo": equipo,
+                    "PJ": int(tarea["tabla"]["PJ"][i]),
+                    "puntos": int(tarea["tabla"]["puntos"][i]),
+                    "puntos_esperados": round(float(resultado["puntos_esperados"][i]), 2),
+                    "posicion_media": float(probabilidades[i] @ np.arange(1, len(tarea["equipos"]) + 1)),
+                    "prob_clasifica": float(probabilidades[i, :clasificados].sum()),
+                }
+            )
+            fila.update({f"prob_pos_{p + 1}": float(probabilidades[i, p]) for p in range(len(tarea["equipos"]))})
+            filas.append(fila)
+    return pd.DataFrame(filas).sort_values(CLAVES_GRUPO + ["posicion_media"]).reset_index(drop=True)
+
+
+def parsear_argumentos(argv=None):
+    parser = argparse.ArgumentParser(description="Proyección Monte Carlo de las tablas por grupo")
+    parser.add_argument("--anio", type=int, default=2025, help="Temporada a proyectar")
+    parser.add_argument("--categorias", nargs="+", help="Solo estas categorías")
+    parser.add_argument("--simulaciones", type=int, default=100_000)
+    parser.add_argument("--clasificados", type=int, default=4, help="Posiciones que clasifican")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--semilla", type=int)
+    parser.add_argument("--desde-jornada", type=int, help="Simular desde esta jornada (para evaluar el modelo)")
+    parser.add_argument(
+        "--salida", default=os.path.join("outputs", "proyeccion.csv"), help="CSV de probabilidades"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    from utils.almacen import cargar_partidos
+
+    args = parsear_argumentos(argv)
+    partidos = cargar_partidos(anios=args.anio, categorias=args.categorias, categoricas=False)
+    inicio = time.perf_counter()
+    proyeccion = proyectar(
+        partidos,
+        simulaciones=args.simulaciones,
+        clasificados=args.clasificados,
+        workers=args.workers,
+        semilla=args.semilla,
+        desde_jornada=args.desde_jornada,
+    )
+    os.makedirs(os.path.dirname(args.salida) or ".", exist_ok=True)
+    proyeccion.to_csv(args.salida, index=False)
+    logger.info(
+        f"{len(proyeccion)} equipos, {args.simulaciones} simulaciones por grupo "
+        f"en {time.perf_counter() - inicio:.1f}s -> {args.salida}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -3,11 +3,14 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 import pandas as pd
-from utils.open_csv import leer_csv_con_encoding_detectado
+from utils.almacen import cargar_partidos
 from pathlib import Path
 
-# Leer el archivo CSV de partidos
-partidos = leer_csv_con_encoding_detectado('Data/partidos_2025.csv', ";")
+# Leer los partidos 2025 del almacén Parquet
+partidos = cargar_partidos(anios=2025, categoricas=False)
+# Los tantos vienen como Int16 con <NA> en los partidos sin resultado; como float
+# (NaN) las comparaciones fila por fila dan False en lugar de fallar
+partidos[['ptsL', 'ptsV']] = partidos[['ptsL', 'ptsV']].astype('float64')
 
 # Normalizar nombres de categorías para facilitar el filtrado
 def normalizar_categoria(cat):
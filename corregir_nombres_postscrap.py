@@ -1,38 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+Normalización en lote de los nombres de equipo de todas las temporadas.
+Lee los CSV por temporada de Data/ (partidos_*.csv) en paralelo (un proceso
+por archivo), mapea de una sola vez los nombres distintos de local y
+visitante, y guarda el consolidado en Data/procesada/ como CSV y en el
+almacén Parquet de utils/almacen.py.
+
+Cada CSV leído se guarda en Data/cache/crudos/ (hasta que el CSV cambie de
+tamaño o de fecha de modificación), así que volver a normalizar después de corregir equipos_map.json no vuelve a
+detectar encodings ni a parsear los CSV.
+"""
+
+import argparse
+import hashlib
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple
+
 import pandas as pd
+
+from mapeos.loader import cargar_mapeo_equipos, indice_equipos, map_series
+from utils.almacen import RUTA_ALMACEN, archivos_temporadas, guardar_partidos
+from utils.logger import get_logger
 from utils.open_csv import leer_csv_con_encoding_detectado
-from mapeos.loader import normalizar_equipo, cargar_mapeo_equipos
-# Cargar el mapeo de equipos
 
-mapeo_equipos = cargar_mapeo_equipos()
+logger = get_logger("CorregirNombres")
+
+CARPETA_DATA = "Data"
+CARPETA_SALIDA = os.path.join(CARPETA_DATA, "procesada")
+CARPETA_CRUDOS = os.path.join(CARPETA_DATA, "cache", "crudos")
+
+
+def parsear_argumentos():
+    parser = argparse.ArgumentParser(
+        description="Normaliza los nombres de equipo de todas las temporadas"
+    )
+    parser.add_argument(
+        "--data", default=CARPETA_DATA, help="Carpeta con los CSV por temporada (partidos_*.csv)"
+    )
+    parser.add_argument("--salida", default=CARPETA_SALIDA, help="Carpeta de salida")
+    parser.add_argument(
+        "--almacen", default=RUTA_ALMACEN, help="Almacén Parquet a regenerar (ruta sin extensión)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Procesos de lectura (1 = en el proceso actual)",
+    )
+    parser.add_argument(
+        "--sin-cache", action="store_true", help="Releer los CSV aunque estén en Data/cache/crudos"
+    )
+    return parser.parse_args()
+
+
+def ruta_cache_crudos(ruta_archivo: str) -> str:
+    """Copia en Data/cache/crudos/ de un CSV, por ruta absoluta (dos Data/ distintos no se pisan)."""
+    ruta = os.path.abspath(ruta_archivo)
+    clave = hashlib.sha1(ruta.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(CARPETA_CRUDOS, f"{os.path.basename(ruta)}.{clave}.pkl")
+
+
+def leer_temporada(ruta_archivo: str, usar_cache: bool = True) -> pd.DataFrame:
+    """
+    Lee el CSV de una temporada tal cual (sin normalizar).
+    La copia en Data/cache/crudos/ guarda el tamaño y el mtime del CSV que
+    leyó y vale mientras ambos coincidan.
+    """
+    estado = os.stat(ruta_archivo)
+    firma = (estado.st_size, estado.st_mtime_ns)
+    ruta_cache = ruta_cache_crudos(ruta_archivo)
+    if usar_cache and os.path.exists(ruta_cache):
+        firma_guardada, df = pd.read_pickle(ruta_cache)
+        if firma_guardada == firma:
+            return df
+
+    df = leer_csv_con_encoding_detectado(ruta_archivo, sep=";")
+    os.makedirs(CARPETA_CRUDOS, exist_ok=True)
+    tmp = f"{ruta_cache}.tmp"
+    pd.to_pickle((firma, df), tmp)
+    os.replace(tmp, ruta_cache)
+    return df
+
+
+def normalizar_equipos(df: pd.DataFrame) -> pd.DataFrame:
+    """Normaliza local y visitante en un solo paso sobre los nombres distintos de ambas columnas."""
+    n = len(df)
+    nombres = map_series(pd.concat([df["local"], df["visitante"]], ignore_index=True))
+    df = df.copy()
+    df["local"] = nombres.iloc[:n].to_numpy()
+    df["visitante"] = nombres.iloc[n:].to_numpy()
+    return df
+
+
+def _procesar_archivo(tarea: Tuple[str, bool]) -> Tuple[pd.DataFrame, List[str]]:
+    ruta_archivo, usar_cache = tarea
+    df = leer_temporada(ruta_archivo, usar_cache)
+    crudos = pd.concat([df["local"], df["visitante"]]).dropna().tolist()
+    return normalizar_equipos(df), crudos
+
 
-# Ruta a la carpeta con los CSVs
-carpeta_data = 'Data'
-carpeta_salida = os.path.join(carpeta_data, 'procesada')
-os.makedirs(carpeta_salida, exist_ok=True)
+def main():
+    args = parsear_argumentos()
+    os.makedirs(args.salida, exist_ok=True)
+    inicio = time.perf_counter()
 
-# Lista para almacenar los DataFrames corregidos
-dataframes = []
+    archivos = archivos_temporadas(args.data)
+    tareas = [(ruta, not args.sin_cache) for ruta in archivos]
+    if args.workers <= 1 or len(tareas) <= 1:
+        resultados = [_procesar_archivo(tarea) for tarea in tareas]
+    else:
+        with ProcessPoolExecutor(max_workers=min(args.workers, len(tareas))) as pool:
+            resultados = list(pool.map(_procesar_archivo, tareas))
+    for ruta, (df, _) in zip(archivos, resultados):
+        logger.info(f"Procesado: {ruta} ({len(df)} partidos)")
 
-# Recorremos todos los CSV de la carpeta Data
-for archivo in os.listdir(carpeta_data):
-    ruta_archivo = os.path.join(carpeta_data, archivo)
+    df_final = pd.concat([df for df, _ in resultados], ignore_index=True)
 
-    if archivo.endswith('.csv') and os.path.isfile(ruta_archivo):
-        print(f'Procesando: {archivo}')
-        df = leer_csv_con_encoding_detectado(ruta_archivo)
+    ruta_salida = os.path.join(args.salida, "19-24 procesado.csv")
+    df_final.to_csv(ruta_salida, sep=";", index=False)
+    logger.info(f"Archivo guardado en: {ruta_salida}")
 
-        # Normalizamos los nombres de los equipos
-        df['local'] = df['local'].apply(lambda x: normalizar_equipo(x, mapeo_equipos))
-        df['visitante'] = df['visitante'].apply(lambda x: normalizar_equipo(x, mapeo_equipos))
+    guardar_partidos(df_final, args.almacen, reemplazar_todo=True)
+    logger.info(f"Almacén de partidos regenerado en: {args.almacen}.parquet")
 
-        dataframes.append(df)
+    # Sugerencias para los nombres que no están en el mapa (se revisan a mano)
+    ruta_sugerencias = os.path.join(args.salida, "sugerencias_equipos.csv")
+    nombres_crudos = [nombre for _, crudos in resultados for nombre in crudos]
+    indice_equipos(cargar_mapeo_equipos()).exportar_sugerencias(ruta_sugerencias, nombres_crudos)
 
-# Concatenamos todo en un único DataFrame
-df_final = pd.concat(dataframes, ignore_index=True)
+    logger.info(
+        f"{len(df_final)} partidos de {len(archivos)} archivos normalizados "
+        f"en {time.perf_counter() - inicio:.1f}s"
+    )
 
-# Guardamos el resultado
-ruta_salida = os.path.join(carpeta_salida, '19-24 procesado.csv')
-df_final.to_csv(ruta_salida, sep=';', index=False)
 
-print(f'Archivo guardado en: {ruta_salida}')
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""
+Índice de normalización de nombres de equipos.
+Las claves de equipos_map.json se canonicalizan una sola vez (mayúsculas, sin
+acentos, comillas, puntos, guiones ni espacios), así que variantes como
+'BOCA JUNIORS  "B"' o 'Boca Juniors B' no necesitan una entrada propia.
+Los nombres de destino se resuelven a sí mismos ignorando solo espacios y
+puntuación: un nombre que ya es consistente no se cambia de mayúsculas
+(p. ej. 'CLUB GEI BLANCO' no pasa a 'Club GEI BLANCO').
+Los nombres desconocidos se dejan como vienen; para ellos se ofrecen
+sugerencias por similitud de trigramas, que se exportan para revisión y
+nunca se aplican solas.
+"""
+
+import csv
+import os
+import re
+import unicodedata
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from utils.logger import get_logger
+
+logger = get_logger("IndiceEquipos")
+
+UMBRAL_SUGERENCIA = 0.6
+
+_NO_ALFANUMERICO = re.compile(r"[^A-Z0-9]")
+_SEPARADORES = re.compile(r"[\W_]")
+
+
+def clave_equipo(nombre: str) -> str:
+    """
+    Forma canónica de un nombre para buscarlo en el índice.
+
+    Ejemplo:
+        'Cañuelas F.C. - Sub 17' -> 'CANUELASFCSUB17'
+    """
+    texto = unicodedata.normalize("NFKD", nombre.upper())
+    texto = "".join(c for c in texto if not unicodedata.combining(c))
+    return _NO_ALFANUMERICO.sub("", texto)
+
+
+def _clave_destino(nombre: str) -> str:
+    """Nombre sin espacios ni puntuación, respetando mayúsculas y acentos."""
+    return _SEPARADORES.sub("", unicodedata.normalize("NFC", nombre))
+
+
+def _trigramas(clave: str) -> set:
+    texto = f"  {clave} "
+    return {texto[i : i + 3] for i in range(len(texto) - 2)}
+
+
+class IndiceEquipos:
+    """
+    Búsqueda O(1) de nombres de equipo sobre las claves canonicalizadas del mapa.
+    Cada nombre crudo se resuelve una vez y se recuerda, así que en el camino
+    caliente solo hay una búsqueda en un dict.
+    """
+
+    def __init__(self, mapeo_equipos: Dict[str, str]):
+        # Claves del mapa por forma canónica
+        self._canonicos: Dict[str, str] = {}
+        # Nombres de destino por forma sin separadores (sin tocar mayúsculas)
+        self._destinos: Dict[str, str] = {
+            _clave_destino(destino): destino for destino in mapeo_equipos.values()
+        }
+        origenes: Dict[str, str] = {}
+        for nombre, destino in mapeo_equipos.items():
+            clave = clave_equipo(nombre)
+            anterior = origenes.get(clave)
+            if anterior is not None and mapeo_equipos[anterior] != destino:
+                logger.warning(
+                    f"'{nombre}' y '{anterior}' son el mismo nombre canónico ({clave}) "
+                    f"con destinos distintos; se usa '{destino}'"
+                )
+            origenes[clave] = nombre
+            self._canonicos[clave] = destino
+        self._resueltos: Dict[str, str] = {}
+        self._trigramas: Optional[Tuple[Dict[str, List[str]], Dict[str, int]]] = None
+        self._candidatos: Dict[str, str] = {}
+
+    def normalizar(self, nombre: str) -> str:
+        """Nombre canónico del equipo, o el nombre sin espacios en los bordes si no está en el mapa."""
+        resultado = self._resueltos.get(nombre)
+        if resultado is None:
+            resultado = self._canonicos.get(clave_equipo(nombre))
+            if resultado is None:
+                resultado = self._destinos.get(_clave_destino(nombre), nombre.strip())
+            self._resueltos[nombre] = resultado
+        return resultado
+
+    def conocido(self, nombre: str) -> bool:
+        return clave_equipo(nombre) in self._canonicos or _clave_destino(nombre) in self._destinos
+
+    def desconocidos(self) -> List[str]:
+        """Nombres normalizados hasta ahora que no figuran en el mapa."""
+        return sorted({n.strip() for n in self._resueltos if not self.conocido(n)})
+
+    def _indice_trigramas(self) -> Tuple[Dict[str, List[str]], Dict[str, int]]:
+        """
+        ({trigrama: [claves]}, {clave: cantidad de trigramas}) sobre las claves
+        canónicas del mapa y de los destinos; se arma con la primera sugerencia.
+        """
+        if self._trigramas is None:
+            self._candidatos = dict(self._canonicos)
+            for destino in self._destinos.values():
+                self._candidatos.setdefault(clave_equipo(destino), destino)
+            por_trigrama: Dict[str, List[str]] = {}
+            tamanios: Dict[str, int] = {}
+            for clave in self._candidatos:
+                trigramas = _trigramas(clave)
+                tamanios[clave] = len(trigramas)
+                for trigrama in trigramas:
+                    por_trigrama.setdefault(trigrama, []).append(clave)
+            self._trigramas = (por_trigrama, tamanios)
+        return self._trigramas
+
+    def sugerir(
+        self, nombre: str, umbral: float = UMBRAL_SUGERENCIA, limite: int = 3
+    ) -> List[Tuple[str, float]]:
+        """
+        Nombres canónicos parecidos a `nombre`, de mayor a menor similitud.
+
+        Args:
+            nombre (str): Nombre a buscar.
+            umbral (float): Similitud mínima (coeficiente de Dice sobre trigramas, 0 a 1).
+            limite (int): Cantidad máxima de sugerencias.
+
+        Returns:
+            List[Tuple[str, float]]: Pares (nombre canónico, similitud).
+        """
+        consulta = _trigramas(clave_equipo(nombre))
+        por_trigrama, tamanios = self._indice_trigramas()
+        comunes = Counter()
+        for trigrama in consulta:
+            comunes.update(por_trigrama.get(trigrama, ()))
+
+        mejores: Dict[str, float] = {}
+        for clave, n in comunes.items():
+            similitud = 2 * n / (len(consulta) + tamanios[clave])
+            if similitud < umbral:
+                continue
+            destino = self._candidatos[clave]
+            if similitud > mejores.get(destino, 0):
+                mejores[destino] = similitud
+        ordenadas = sorted(mejores.items(), key=lambda par: (-par[1], par[0]))
+        return [(destino, round(similitud, 3)) for destino, similitud in ordenadas[:limite]]
+
+    def sugerencias(
+        self, nombres: Iterable[str], umbral: float = UMBRAL_SUGERENCIA
+    ) -> List[Dict]:
+        """
+        Mejor sugerencia para cada nombre desconocido de `nombres` que tenga
+        algún candidato por encima del umbral.
+        """
+        filas = []
+        nombres = (n.strip() for n in nombres if isinstance(n, str))
+        for nombre, apariciones in Counter(nombres).items():
+            if self.conocido(nombre):
+                continue
+            candidatos = self.sugerir(nombre, umbral)
+            if not candidatos:
+                continue
+            filas.append(
+                {
+                    "nombre": nombre,
+                    "apariciones": apariciones,
+                    "sugerencia": candidatos[0][0],
+                    "similitud": candidatos[0][1],
+                    "alternativas": " | ".join(d for d, _ in candidatos[1:]),
+                }
+            )
+        filas.sort(key=lambda f: (-f["apariciones"], f["nombre"]))
+        return filas
+
+    def exportar_sugerencias(
+        self, path: str, nombres: Iterable[str], umbral: float = UMBRAL_SUGERENCIA
+    ) -> int:
+        """
+        Escribe en CSV las sugerencias para los nombres desconocidos, para
+        revisarlas a mano y pasar las correctas a equipos_map.json.
+
+        Returns:
+            int: Cantidad de sugerencias exportadas.
+        """
+        filas = self.sugerencias(nombres, umbral)
+        directorio = os.path.dirname(path)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        columnas = ["nombre", "apariciones", "sugerencia", "similitud", "alternativas"]
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=columnas, delimiter=";")
+            writer.writeheader()
+            writer.writerows(filas)
+        logger.info(f"{len(filas)} sugerencias de nombres de equipo exportadas a {path}")
+        return len(filas)
@@ -1,24 +1,152 @@
 import json
 import os
-from typing import Dict
+import threading
+from typing import Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from mapeos.equipos import IndiceEquipos
 
 BASE_DIR = os.path.dirname(__file__)
 
 
+class RegistroMapeos:
+    """
+    Caché de los JSON de mapeos/ compartido por todo el proceso.
+    Cada archivo se lee la primera vez que se pide y se vuelve a leer solo si
+    cambió su mtime, así que un proceso largo toma las correcciones del mapa
+    sin reiniciarse. Mientras el archivo no cambie se devuelve siempre el
+    mismo dict (no modificarlo): los índices que se arman por identidad del
+    mapa, como el de equipos o el de llaves de playoffs, se reutilizan.
+    """
+
+    def __init__(self, directorio: str = BASE_DIR):
+        self.directorio = directorio
+        self._lock = threading.Lock()
+        # archivo -> (mtime_ns, datos, {nombre de índice: (versión, índice)})
+        self._entradas: Dict[str, tuple] = {}
+
+    def _entrada(self, archivo: str) -> tuple:
+        path = os.path.join(self.directorio, archivo)
+        mtime = os.stat(path).st_mtime_ns
+        entrada = self._entradas.get(archivo)
+        if entrada is not None and entrada[0] == mtime:
+            return entrada
+        with self._lock:
+            entrada = self._entradas.get(archivo)
+            if entrada is None or entrada[0] != mtime:
+                with open(path, "r", encoding="utf-8") as f:
+                    entrada = (mtime, json.load(f), {})
+                self._entradas[archivo] = entrada
+            return entrada
+
+    def obtener(self, archivo: str):
+        """Contenido del JSON, leído de nuevo solo si el archivo cambió."""
+        return self._entrada(archivo)[1]
+
+    def indice(self, archivo: str, nombre: str, construir: Callable, version=None):
+        """
+        Índice derivado del JSON (construir(datos)), que se arma una vez por
+        versión del archivo. Si además depende de otro objeto (p. ej. el mapa de
+        equipos), `version` es ese objeto: cuando se pide con otro (por
+        identidad) el índice se reconstruye y reemplaza al anterior.
+        """
+        _, datos, indices = self._entrada(archivo)
+        guardado = indices.get(nombre)
+        if guardado is None or guardado[0] is not version:
+            guardado = (version, construir(datos))
+            indices[nombre] = guardado
+        return guardado[1]
+
+    def limpiar(self):
+        with self._lock:
+            self._entradas.clear()
+
+
+REGISTRO = RegistroMapeos()
+
+
 def cargar_mapeo_categorias() -> Dict[str, str]:
-    path = os.path.join(BASE_DIR, "categorias_map.json")
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return REGISTRO.obtener("categorias_map.json")
 
 
 def cargar_mapeo_equipos() -> Dict[str, str]:
-    path = os.path.join(BASE_DIR, "equipos_map.json")
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return REGISTRO.obtener("equipos_map.json")
+
+
+def cargar_llaves_playoffs() -> Dict:
+    return REGISTRO.obtener("llaves_playoffs.json")
+
+
+def _categorias_sin_mayusculas(mapeo_categorias: Dict[str, str]) -> Dict[str, str]:
+    # Ante claves que solo difieren en mayúsculas gana la primera del archivo
+    indice = {}
+    for nombre, categoria in mapeo_categorias.items():
+        indice.setdefault(nombre.casefold(), categoria)
+    return indice
+
+
+def mapear_categoria(nombre: str, default: Optional[str] = None) -> Optional[str]:
+    """
+    Categoría de categorias_map.json para el nombre del sitio: primero exacto
+    y después ignorando mayúsculas. Si no figura devuelve `default`.
+    """
+    if not isinstance(nombre, str):
+        return default
+    categoria = cargar_mapeo_categorias().get(nombre)
+    if categoria is not None:
+        return categoria
+    indice = REGISTRO.indice("categorias_map.json", "casefold", _categorias_sin_mayusculas)
+    return indice.get(nombre.casefold(), default)
+
+
+# (mapeo_equipos, índice) del último mapa de equipos usado
+_INDICE_EQUIPOS = None
+
+
+def indice_equipos(mapeo_equipos: Dict[str, str]) -> IndiceEquipos:
+    """Índice canonicalizado del mapa de equipos; se arma una vez por mapa."""
+    global _INDICE_EQUIPOS
+    cache = _INDICE_EQUIPOS
+    if cache is not None and cache[0] is mapeo_equipos:
+        return cache[1]
+    indice = IndiceEquipos(mapeo_equipos)
+    _INDICE_EQUIPOS = (mapeo_equipos, indice)
+    return indice
 
 
 def normalizar_equipo(nombre: str, mapeo_equipos: Dict[str, str]) -> str:
     if not isinstance(nombre, str):
         return nombre
-    nombre_upper = nombre.upper().strip()
-    return mapeo_equipos.get(nombre_upper, nombre.strip())
+    return indice_equipos(mapeo_equipos).normalizar(nombre)
+
+
+def map_series(serie: pd.Series, mapeo: str = "equipos") -> pd.Series:
+    """
+    Aplica un mapeo a toda una columna resolviendo cada valor distinto una sola vez.
+
+    Args:
+        serie (pd.Series): Nombres de equipo o de categoría tal como vienen del sitio.
+        mapeo (str): 'equipos' (normalizar_equipo) o 'categorias' (mapear_categoria;
+            los nombres sin mapear quedan igual).
+
+    Returns:
+        pd.Series: Columna mapeada, con el mismo índice. Los nulos quedan nulos.
+    """
+    if mapeo == "equipos":
+        mapeo_equipos = cargar_mapeo_equipos()
+        traducir = lambda valor: normalizar_equipo(valor, mapeo_equipos)
+    elif mapeo == "categorias":
+        traducir = lambda valor: mapear_categoria(valor, valor)
+    else:
+        raise ValueError(f"Mapeo desconocido: '{mapeo}' (usar 'equipos' o 'categorias')")
+
+    # Un código por valor distinto (-1 para nulos) y una sola traducción por código
+    codigos, unicos = pd.factorize(serie)
+    traducidos = np.array([traducir(valor) for valor in unicos] + [None], dtype=object)
+    resultado = traducidos[codigos]
+    nulos = codigos < 0
+    if nulos.any():
+        resultado[nulos] = serie.to_numpy()[nulos]
+    return pd.Series(resultado, index=serie.index, name=serie.name)
@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+"""
+Resolución de la estructura de cada partido (ronda, nivel, zona y grupo) a
+partir de lo que devuelven los parsers de fase, grupo y jornada.
+
+`resolver_estructura` es la versión fila por fila que usa el scraper;
+`resolver_estructura_lote` hace lo mismo sobre un DataFrame completo
+(inferir_ronda una vez por combinación distinta de argumentos, sin los
+equipos fuera de los playoffs, y máscaras para la precedencia), para
+re-derivar todos los partidos históricos después de corregir un parser sin
+volver a scrapear.
+"""
+
+from typing import Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from parsers.fases import parsear_fases
+from parsers.grupos import parsear_grupos
+from parsers.jornadas import parsear_jornada
+from parsers.rondas import inferir_ronda
+
+# Columnas de entrada de resolver_estructura_lote: fase_info y grupo_info aplanados
+CAMPOS_FASE = ("fase", "ronda", "nivel", "zona", "grupo")
+CAMPOS_GRUPO = ("nivel", "zona", "grupo")
+COLUMNAS_FASE = tuple(f"fase_{c}" for c in CAMPOS_FASE)
+COLUMNAS_GRUPO = tuple(f"grupo_{c}" for c in CAMPOS_GRUPO)
+
+# Fases (en mayúsculas) en las que inferir_ronda usa local y visitante; en el
+# resto devuelve None sin mirar los equipos
+FASES_CON_EQUIPOS = ("PLAYOFF", "FINAL FOUR", "CUARTOS NIVEL 3")
+
+
+def resolver_estructura(
+    year: int,
+    cat_mapa: str,
+    fase_info: Dict,
+    grupo_info: Optional[Dict],
+    ronda: str,
+    jornada: str,
+    local_raw: str,
+    visitante_raw: str,
+    equipos_map,
+    inferir: Callable = inferir_ronda,
+) -> Dict:
+    """
+    Combina fase, grupo, jornada e inferencia de rondas de un partido.
+
+    Args:
+        year (int): Año del torneo.
+        cat_mapa (str): Categoría normalizada.
+        fase_info (Dict): Resultado de parsear_fase.
+        grupo_info (Optional[Dict]): Resultado de parsear_grupo (None si la fase no tiene grupos).
+        ronda (str): Ronda explícita del título de la jornada ('' si no tiene).
+        jornada (str): Número de jornada.
+        local_raw (str): Equipo local tal como viene del HTML.
+        visitante_raw (str): Equipo visitante tal como viene del HTML.
+        equipos_map: Mapa de normalización de equipos.
+        inferir (Callable): Función de inferencia de rondas (el scraper pasa la perfilada).
+
+    Returns:
+        Dict: 'ronda', 'nivel', 'zona' y 'grupo' del partido.
+    """
+    ronda_inferida = inferir(
+        year,
+        cat_mapa,
+        (
+            fase_info.get("nivel", "Desconocido")
+            if fase_info.get("nivel") != "Desconocido"
+            else grupo_info.get("nivel", "Desconocido")
+        ),
+        fase_info.get("zona", ""),
+        jornada,
+        fase_info.get("fase", ""),
+        local_raw,
+        visitante_raw,
+        equipos_map,
+    )
+
+    # Adaptar para usar el dict completo retornado por inferir_ronda
+    ronda_val = None
+    llave_val = None
+    nivel_val = None
+    if isinstance(ronda_inferida, dict):
+        ronda_val = ronda_inferida.get("ronda") if ronda == '' else ronda
+        llave_val = ronda_inferida.get("llave")
+        nivel_val = ronda_inferida.get("nivel")
+    else:
+        ronda_val = ronda_inferida if ronda == '' else ronda
+        llave_val = None
+        nivel_val = None
+
+    fase_actual = fase_info.get("fase", "").upper()
+
+    return {
+        "ronda": (
+            fase_info["ronda"]
+            if fase_info.get("ronda") != "Desconocida"
+            else (
+                ronda_val
+                if ronda_val is not None and ronda_val != "Desconocida"
+                else ronda
+            )
+        ),
+        "nivel": (
+            nivel_val
+            if nivel_val is not None and nivel_val != "Desconocido"
+            else (
+                fase_info["nivel"]
+                if fase_info["nivel"] != "Desconocido"
+                else grupo_info.get("nivel", "Desconocido")
+            )
+        ),
+        "zona": (
+            fase_info["zona"]
+            if fase_info["zona"] != "Desconocida"
+            else grupo_info.get("zona", "Desconocida")
+        ),
+        "grupo": (
+            llave_val if fase_actual in ["PLAYOFF", "FINAL FOUR"] and llave_val
+            else (
+                fase_info["grupo"] if fase_info.get("grupo") not in [None, "Desconocido"]
+                else grupo_info.get("grupo", "Desconocido")
+            )
+        ),
+    }
+
+
+def _nulos(valores: np.ndarray) -> np.ndarray:
+    """None o NaN, comparando elemento a elemento (más rápido que pd.isna en object)."""
+    return (valores == None) | (valores != valores)  # noqa: E711
+
+
+def _mapear(valores: np.ndarray, funcion: Callable) -> np.ndarray:
+    """Aplica `funcion` una vez por valor distinto de `valores`."""
+    memo = {}
+    resultado = np.empty(len(valores), dtype=object)
+    resultado[:] = [
+        memo[v] if v in memo else memo.setdefault(v, funcion(v)) for v in valores
+    ]
+    return resultado
+
+
+def _por_clave(funcion: Callable, claves, *columnas) -> list:
+    """
+    Aplica `funcion` a los valores de `columnas` una vez por clave distinta de
+    `claves` (la primera fila con cada clave) y reparte el resultado.
+    """
+    memo = {}
+    resultado = []
+    for clave, argumentos in zip(claves, zip(*columnas)):
+        if clave not in memo:
+            memo[clave] = funcion(*argumentos)
+        resultado.append(memo[clave])
+    return resultado
+
+
+def resolver_estructura_lote(
+    df: pd.DataFrame, equipos_map, inferir: Callable = inferir_ronda
+) -> pd.DataFrame:
+    """
+    Versión vectorizada de resolver_estructura sobre muchos partidos.
+
+    Args:
+        df (pd.DataFrame): Una fila por partido con columnas 'anio', 'categoria',
+            fase_* (fase, ronda, nivel, zona, grupo de parsear_fase), grupo_*
+            (nivel, zona, grupo de parsear_grupo; nulos si la fase no tiene grupos),
+            'ronda_jornada' (ronda del título de la jornada), 'jornada', 'local'
+            y 'visitante' (nombres sin normalizar).
+        equipos_map: Mapa de normalización de equipos.
+        inferir (Callable): Función de inferencia de rondas, como en resolver_estructura.
+
+    Returns:
+        pd.DataFrame: Copia de `df` con las columnas 'ronda', 'nivel', 'zona',
+            'grupo' y 'llave' resueltas igual que en el scraper.
+    """
+    df = df.copy()
+    n = len(df)
+
+    def columna(nombre, defecto=None):
+        valores = df[nombre].to_numpy(dtype=object)
+        if defecto is None:
+            return valores
+        return np.where(_nulos(valores), defecto, valores)
+
+    anio = df["anio"].to_numpy().astype(int)
+    categoria = columna("categoria")
+    fase = _mapear(columna("fase_fase"), lambda f: f.upper() if isinstance(f, str) else "")
+    jornada = columna("jornada", "")
+    ronda_jornada = columna("ronda_jornada", "")
+    fase_ronda, fase_nivel, fase_zona, fase_grupo = (
+        columna(c) for c in ("fase_ronda", "fase_nivel", "fase_zona", "fase_grupo")
+    )
+    grupo_nivel = columna("grupo_nivel", "Desconocido")
+    grupo_zona = columna("grupo_zona", "Desconocida")
+    grupo_grupo = columna("grupo_grupo", "Desconocido")
+
+    nivel_arg = np.where(fase_nivel == "Desconocido", grupo_nivel, fase_nivel)
+
+    # Resultado de inferir_ronda por fila: si devuelve dict, su ronda, su nivel y la llave
+    es_dict = np.zeros(n, dtype=bool)
+    ronda_r = np.full(n, None, dtype=object)
+    nivel_r = np.full(n, None, dtype=object)
+    llave = np.full(n, None, dtype=object)
+
+    # inferir_ronda se llama una vez por combinación distinta de sus argumentos y
+    # el resultado se reparte a todas las filas con esa combinación. Los equipos
+    # solo entran en la clave en las fases que los usan: en la fase regular
+    # (casi todos los partidos) basta una llamada por categoría, nivel, zona y jornada
+    argumentos = (
+        anio.tolist(), categoria, nivel_arg, columna("fase_zona", ""), jornada,
+        columna("fase_fase", ""), columna("local"), columna("visitante"),
+    )
+    usa_equipos = np.isin(fase, FASES_CON_EQUIPOS)
+    local_clave = np.where(usa_equipos, argumentos[6], None)
+    visitante_clave = np.where(usa_equipos, argumentos[7], None)
+    inferidas = _por_clave(
+        lambda *args: inferir(*args, equipos_map),
+        zip(*argumentos[:6], local_clave, visitante_clave),
+        *argumentos,
+    )
+    for i, resultado in enumerate(inferidas):
+        if isinstance(resultado, dict):
+            es_dict[i] = True
+            ronda_r[i] = resultado.get("ronda")
+            nivel_r[i] = resultado.get("nivel")
+            llave[i] = resultado.get("llave")
+
+    # Mismas reglas de precedencia que resolver_estructura
+    ronda_val = np.where(ronda_jornada == "", np.where(es_dict, ronda_r, None), ronda_jornada)
+    ronda_val_ok = (ronda_val != None) & (ronda_val != "Desconocida")  # noqa: E711
+    df["ronda"] = np.where(
+        fase_ronda == "Desconocida",
+        np.where(ronda_val_ok, ronda_val, ronda_jornada),
+        fase_ronda,
+    )
+    nivel_val = np.where(es_dict, nivel_r, None)
+    nivel_val_ok = (nivel_val != None) & (nivel_val != "Desconocido")  # noqa: E711
+    df["nivel"] = np.where(nivel_val_ok, nivel_val, nivel_arg)
+    df["zona"] = np.where(fase_zona == "Desconocida", grupo_zona, fase_zona)
+    sin_grupo_fase = (fase_grupo == None) | (fase_grupo == "Desconocido")  # noqa: E711
+    grupo_fase = np.where(sin_grupo_fase, grupo_grupo, fase_grupo)
+    con_llave = np.isin(fase, ["PLAYOFF", "FINAL FOUR"]) & (llave != None)  # noqa: E711
+    df["grupo"] = np.where(con_llave, llave, grupo_fase)
+    df["llave"] = np.where(es_dict, llave, None)
+    return df
+
+
+def parsear_textos_lote(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Aplica los parsers de fase, grupo y jornada a las columnas de texto crudo
+    'fase_text', 'grupo_text' (nulo si la fase no tiene grupos) y 'jornada_text',
+    una vez por texto distinto de cada temporada, y agrega las columnas fase_*,
+    grupo_*, 'ronda_jornada', 'jornada' y 'fecha' que espera resolver_estructura_lote.
+    """
+    df = df.copy()
+    fase_cols = {c: [None] * len(df) for c in COLUMNAS_FASE}
+    grupo_cols = {c: [None] * len(df) for c in COLUMNAS_GRUPO}
+    posiciones = np.arange(len(df))
+    for anio, filas in df.groupby(df["anio"].astype(int), sort=False).indices.items():
+        filas = posiciones[filas]
+        fases = df["fase_text"].iloc[filas].tolist()
+        for i, info in zip(filas, parsear_fases(anio, fases)):
+            for campo in CAMPOS_FASE:
+                fase_cols[f"fase_{campo}"][i] = info[campo]
+        grupos = df["grupo_text"].iloc[filas].tolist()
+        con_grupo = [(i, (f, g)) for i, f, g in zip(filas, fases, grupos) if isinstance(g, str)]
+        for (i, _), info in zip(con_grupo, parsear_grupos(anio, [par for _, par in con_grupo])):
+            for campo in CAMPOS_GRUPO:
+                grupo_cols[f"grupo_{campo}"][i] = info[campo]
+    for columna, valores in {**fase_cols, **grupo_cols}.items():
+        df[columna] = pd.Series(valores, index=df.index, dtype=object)
+
+    jornadas = {texto: parsear_jornada(texto) for texto in pd.unique(df["jornada_text"])}
+    partes = df["jornada_text"].map(jornadas)
+    df["ronda_jornada"] = partes.str[0]
+    df["jornada"] = partes.str[1]
+    df["fecha"] = partes.str[2]
+    return df
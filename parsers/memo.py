@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""
+Memoización de los parsers de fase, grupo y jornada.
+Los mismos textos se repiten en todas las categorías de un torneo (y cada
+encabezado de jornada en cada página), así que el resultado de cada
+(año, texto) se guarda en un LRU acotado. Opcionalmente lo aprendido se
+persiste en JSON para que la próxima corrida no vuelva a evaluar las reglas.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List
+
+from parsers.fases import parsear_fase
+from parsers.grupos import parsear_grupo
+from parsers.jornadas import parsear_jornada
+from utils.logger import get_logger
+
+logger = get_logger("MemoParsers")
+
+RUTA_MEMO = os.path.join("Data", "cache", "parsers.json")
+
+_DIRECTORIO_PARSERS = os.path.dirname(os.path.abspath(__file__))
+# Si cambia alguno de estos archivos, lo persistido deja de valer
+_ARCHIVOS_FIRMA = (
+    "fases.py",
+    "grupos.py",
+    "jornadas.py",
+    "motor_reglas.py",
+    os.path.join("reglas", "fases.json"),
+    os.path.join("reglas", "grupos.json"),
+)
+
+
+class MemoParser:
+    """
+    LRU acotado alrededor de un parser puro, seguro entre hilos.
+    La clave son los argumentos posicionales, p. ej. (year, fase_text).
+    Los resultados dict se devuelven copiados para que quien llama pueda modificarlos.
+    """
+
+    def __init__(self, nombre: str, funcion: Callable, maximo: int = 8192):
+        self.nombre = nombre
+        self.funcion = funcion
+        self.maximo = maximo
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+        self._cache: "OrderedDict[tuple, object]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __call__(self, *args):
+        with self._lock:
+            resultado = self._cache.get(args)
+            if resultado is not None:
+                self._cache.move_to_end(args)
+                self.aciertos += 1
+        if resultado is None:
+            # Se calcula fuera del lock: si dos hilos coinciden, el resultado es el mismo
+            resultado = self.funcion(*args)
+            with self._lock:
+                self.fallos += 1
+                self._guardar(args, resultado)
+        return dict(resultado) if isinstance(resultado, dict) else resultado
+
+    def _guardar(self, clave: tuple, resultado):
+        if isinstance(resultado, dict):
+            resultado = dict(resultado)
+        self._cache[clave] = resultado
+        self._cache.move_to_end(clave)
+        while len(self._cache) > self.maximo:
+            self._cache.popitem(last=False)
+            self.desalojos += 1
+
+    def estadisticas(self) -> Dict:
+        total = self.aciertos + self.fallos
+        return {
+            "parser": self.nombre,
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+            "tasa_aciertos": round(self.aciertos / total, 4) if total else None,
+            "entradas": len(self._cache),
+            "desalojos": self.desalojos,
+        }
+
+    def limpiar(self):
+        with self._lock:
+            self._cache.clear()
+            self.aciertos = self.fallos = self.desalojos = 0
+
+    def exportar(self) -> List[List]:
+        """Entradas [argumentos, resultado] de la menos a la más usada."""
+        with self._lock:
+            return [[list(clave), resultado] for clave, resultado in self._cache.items()]
+
+    def importar(self, entradas: List[List]):
+        with self._lock:
+            for clave, resultado in entradas:
+                if isinstance(resultado, list):
+                    resultado = tuple(resultado)  # JSON no distingue tuplas
+                self._guardar(tuple(clave), resultado)
+
+
+PARSEAR_FASE = MemoParser("parsear_fase", parsear_fase)
+PARSEAR_GRUPO = MemoParser("parsear_grupo", parsear_grupo)
+PARSEAR_JORNADA = MemoParser("parsear_jornada", parsear_jornada)
+MEMOS = (PARSEAR_FASE, PARSEAR_GRUPO, PARSEAR_JORNADA)
+
+
+def firma_parsers() -> str:
+    """Huella del código y las reglas de los parsers."""
+    h = hashlib.sha1()
+    for nombre in _ARCHIVOS_FIRMA:
+        with open(os.path.join(_DIRECTORIO_PARSERS, nombre), "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+def cargar_memo(path: str = RUTA_MEMO) -> int:
+    """
+    Carga los resultados persistidos si fueron generados con los mismos parsers.
+
+    Returns:
+        int: Cantidad de entradas cargadas (0 si no hay archivo o quedó obsoleto).
+    """
+    if not os.path.exists(path):
+        return 0
+    with open(path, "r", encoding="utf-8") as f:
+        datos = json.load(f)
+    if datos.get("firma") != firma_parsers():
+        logger.info(f"Memo de parsers en {path} descartado: cambiaron los parsers o sus reglas")
+        return 0
+    cargadas = 0
+    for memo in MEMOS:
+        entradas = datos.get("parsers", {}).get(memo.nombre, [])
+        memo.importar(entradas)
+        cargadas += len(entradas)
+    logger.info(f"Memo de parsers: {cargadas} resultados cargados desde {path}")
+    return cargadas
+
+
+def guardar_memo(path: str = RUTA_MEMO):
+    directorio = os.path.dirname(path)
+    if directorio:
+        os.makedirs(directorio, exist_ok=True)
+    datos = {
+        "firma": firma_parsers(),
+        "parsers": {memo.nombre: memo.exportar() for memo in MEMOS},
+    }
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(datos, f, ensure_ascii=False)
+    os.replace(tmp, path)
+    logger.info(f"Memo de parsers guardado en {path}")
+
+
+def registrar_estadisticas():
+    """Muestra en el log aciertos y fallos de cada parser memoizado."""
+    for memo in MEMOS:
+        e = memo.estadisticas()
+        tasa = f"{100 * e['tasa_aciertos']:.1f}%" if e["tasa_aciertos"] is not None else "-"
+        logger.info(
+            f"{e['parser']}: {e['aciertos']} aciertos, {e['fallos']} fallos ({tasa}), "
+            f"{e['entradas']} entradas, {e['desalojos']} desalojos"
+        )
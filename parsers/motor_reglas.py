@@ -0,0 +1,296 @@
+# -*- coding: utf-8 -*-
+"""
+Motor de reglas declarativas para los parsers de fases y grupos.
+
+Las reglas de cada temporada viven en un JSON (parsers/reglas/) y se compilan una
+sola vez: las expresiones regulares, conjuntos y funciones quedan resueltos en el
+árbol y cada texto se evalúa recorriéndolo, con la misma semántica que la cadena
+if/elif que se escribiría a mano.
+
+Formato de una regla (todas las claves son opcionales):
+
+    {
+        "si": {"fase": {"contiene": [...], "alguno": [...], "ninguno": [...],
+                        "igual": str | [...], "regex": str}},
+        "preparar": {"grupo": [<ajuste>, ...]},      # modifica los textos de entrada
+        "fijar": {"fase": "Playoff", "nivel": 3},     # valores fijos
+        "extraer": [                                  # pasos en orden
+            [                                         # alternativas: gana la primera que matchea
+                {"patron": "...", "en": "grupo", "modo": "search" | "match" | "fullmatch",
+                 "campos": {"zona": 1, "grupo": [3, "UNICO"], "nivel": "INTERCONFERENCIA {1}"},
+                 "requerido": false},                 # true: si tampoco matchea, ValueError
+                {"campos": {"zona": "Desc"}}          # sin patrón: siempre aplica
+            ]
+        ],
+        "funcion": "nombre",                          # función Python registrada
+        "reglas": [...],                              # subreglas
+        "todas": false,                               # false: solo la primera que aplica (if/elif)
+                                                      # true: todas las que aplican (if sucesivos)
+        "ajustes": {"zona": [<ajuste>, ...]},         # se aplican al final sobre los valores
+        "nota": "..."                                 # comentario libre, se ignora
+    }
+
+Campos: un entero es el número de grupo del patrón; [n, defecto] usa el grupo n
+o `defecto` si quedó vacío (con defecto null no se asigna); un texto es una
+plantilla donde {n} se reemplaza por el grupo n (sin llaves es un valor fijo).
+
+Ajustes: {"strip": true}, {"reemplazar": [viejo, nuevo]}, {"sub": [patron, reemplazo]},
+{"mapear": {valor: nuevo}}.
+
+Una regla "aplica" cuando se cumple su condición `si` (o no tiene), aunque
+ninguno de sus patrones de extracción matchee; para que un valor que falta sea
+un error (en vez de quedar el inicial) se marca la alternativa con "requerido".
+"""
+
+import json
+import re
+from typing import Callable, Dict, List, Optional, Tuple
+
+_GRUPO_PLANTILLA = re.compile(r"\{(\d+)\}")
+
+
+# ----------------------------------------------------------------
+# Compilación
+# ----------------------------------------------------------------
+
+
+def _compilar_ajustes(ajustes: List[Dict]) -> List[Tuple]:
+    compilados = []
+    for ajuste in ajustes:
+        if ajuste.get("strip"):
+            compilados.append(("strip",))
+        elif "reemplazar" in ajuste:
+            viejo, nuevo = ajuste["reemplazar"]
+            compilados.append(("reemplazar", viejo, nuevo))
+        elif "sub" in ajuste:
+            patron, reemplazo = ajuste["sub"]
+            compilados.append(("sub", re.compile(patron).sub, reemplazo))
+        elif "mapear" in ajuste:
+            compilados.append(("mapear", dict(ajuste["mapear"])))
+        else:
+            raise ValueError(f"Ajuste no soportado: {ajuste}")
+    return compilados
+
+
+def _compilar_condicion(si: Dict) -> List[Tuple]:
+    criterios_compilados = []
+    for texto, criterios in si.items():
+        for tipo, valor in criterios.items():
+            if tipo == "igual":
+                if not isinstance(valor, str):
+                    valor = frozenset(valor)
+            elif tipo == "regex":
+                valor = re.compile(valor).search
+            elif tipo not in ("contiene", "alguno", "ninguno"):
+                raise ValueError(f"Condición no soportada: {tipo}")
+            criterios_compilados.append((tipo, texto, valor))
+    return criterios_compilados
+
+
+def _compilar_campo(especificacion) -> Tuple:
+    if isinstance(especificacion, int):
+        return ("grupo", especificacion)
+    if isinstance(especificacion, list):
+        numero, defecto = especificacion
+        return ("grupo_o", numero, defecto)
+    if _GRUPO_PLANTILLA.search(especificacion):
+        # split alterna literal, número de grupo, literal, ...
+        piezas = _GRUPO_PLANTILLA.split(especificacion)
+        return (
+            "plantilla",
+            [int(pieza) if i % 2 else pieza for i, pieza in enumerate(piezas) if i % 2 or pieza],
+        )
+    return ("fijo", especificacion)
+
+
+def _compilar_alternativa(alternativa: Dict, objetivo: str) -> Tuple:
+    """(buscar, texto, campos, requerido); buscar es None si la alternativa no tiene patrón."""
+    patron = alternativa.get("patron")
+    buscar = None
+    if patron is not None:
+        buscar = getattr(re.compile(patron), alternativa.get("modo", "search"))
+    campos = [(campo, _compilar_campo(e)) for campo, e in alternativa["campos"].items()]
+    return buscar, alternativa.get("en", objetivo), campos, alternativa.get("requerido", False)
+
+
+def _compilar_regla(regla: Dict, objetivo: str, funciones: Dict[str, Callable]) -> Dict:
+    return {
+        "si": _compilar_condicion(regla.get("si", {})),
+        "preparar": [(t, _compilar_ajustes(a)) for t, a in regla.get("preparar", {}).items()],
+        "fijar": list(regla.get("fijar", {}).items()),
+        "extraer": [
+            [_compilar_alternativa(a, objetivo) for a in alternativas]
+            for alternativas in regla.get("extraer", [])
+        ],
+        "funcion": funciones[regla["funcion"]] if "funcion" in regla else None,
+        "reglas": [_compilar_regla(r, objetivo, funciones) for r in regla.get("reglas", [])],
+        "todas": regla.get("todas", False),
+        "ajustes": [(c, _compilar_ajustes(a)) for c, a in regla.get("ajustes", {}).items()],
+    }
+
+
+# ----------------------------------------------------------------
+# Evaluación
+# ----------------------------------------------------------------
+
+
+def _ajustar(valor: str, ajustes: List[Tuple]) -> str:
+    for ajuste in ajustes:
+        tipo = ajuste[0]
+        if tipo == "strip":
+            valor = valor.strip()
+        elif tipo == "reemplazar":
+            valor = valor.replace(ajuste[1], ajuste[2])
+        elif tipo == "sub":
+            valor = ajuste[1](ajuste[2], valor)
+        else:
+            valor = ajuste[1].get(valor, valor)
+    return valor
+
+
+def _cumple(si: List[Tuple], textos: Dict[str, str]) -> bool:
+    for tipo, texto, valor in si:
+        t = textos[texto]
+        if tipo == "igual":
+            ok = t == valor if isinstance(valor, str) else t in valor
+        elif tipo == "contiene":
+            ok = all(x in t for x in valor)
+        elif tipo == "alguno":
+            ok = any(x in t for x in valor)
+        elif tipo == "ninguno":
+            ok = not any(x in t for x in valor)
+        else:
+            ok = valor(t) is not None
+        if not ok:
+            return False
+    return True
+
+
+def _asignar(valores: Dict, campos: List[Tuple], m):
+    for campo, (tipo, *datos) in campos:
+        if tipo == "grupo":
+            valores[campo] = m.group(datos[0])
+        elif tipo == "grupo_o":
+            numero, defecto = datos
+            g = m.group(numero)
+            if defecto is None:
+                if g:
+                    valores[campo] = g
+            else:
+                valores[campo] = g or defecto
+        elif tipo == "plantilla":
+            valores[campo] = "".join(
+                str(m.group(p)) if isinstance(p, int) else p for p in datos[0]
+            )
+        else:
+            valores[campo] = datos[0]
+
+
+def _extraer(valores: Dict, alternativas: List[Tuple], textos: Dict[str, str]):
+    """Gana la primera alternativa que matchea."""
+    for buscar, texto, campos, requerido in alternativas:
+        if buscar is None:
+            _asignar(valores, campos, None)
+            return
+        m = buscar(textos[texto])
+        if m is not None:
+            _asignar(valores, campos, m)
+            return
+        if requerido:
+            raise ValueError(f"Sin coincidencia para {buscar.__self__.pattern!r} en {textos[texto]!r}")
+
+
+def _evaluar(regla: Dict, valores: Dict, textos: Dict[str, str]):
+    for texto, ajustes in regla["preparar"]:
+        textos[texto] = _ajustar(textos[texto], ajustes)
+    for campo, valor in regla["fijar"]:
+        valores[campo] = valor
+    for alternativas in regla["extraer"]:
+        _extraer(valores, alternativas, textos)
+    if regla["funcion"] is not None:
+        regla["funcion"](valores, textos)
+    _evaluar_reglas(regla["reglas"], regla["todas"], valores, textos)
+    for campo, ajustes in regla["ajustes"]:
+        if isinstance(valores[campo], str):
+            valores[campo] = _ajustar(valores[campo], ajustes)
+
+
+def _evaluar_reglas(reglas: List[Dict], todas: bool, valores: Dict, textos: Dict[str, str]):
+    """todas=False: solo la primera que aplica (if/elif); todas=True: todas las que aplican."""
+    for regla in reglas:
+        if _cumple(regla["si"], textos):
+            _evaluar(regla, valores, textos)
+            if not todas:
+                return
+
+
+# ----------------------------------------------------------------
+# Tabla de reglas
+# ----------------------------------------------------------------
+
+
+class TablaReglas:
+    """
+    Reglas compiladas de todas las temporadas de un parser.
+
+    El JSON tiene la forma:
+        {"objetivo": "fase", "inicial": {...},
+         "temporadas": {"2019": {"inicial": {...}, <regla raíz>}, ...}}
+    donde `objetivo` es el texto sobre el que se aplican los patrones por defecto
+    e `inicial` los valores de partida (la temporada puede sobreescribir algunos).
+    """
+
+    def __init__(self, definicion: Dict, funciones: Optional[Dict[str, Callable]] = None):
+        funciones = funciones or {}
+        objetivo = definicion["objetivo"]
+        self.inicial_por_defecto = dict(definicion["inicial"])
+        self._temporadas = {}
+        for anio, temporada in definicion["temporadas"].items():
+            inicial = {**self.inicial_por_defecto, **temporada.get("inicial", {})}
+            self._temporadas[int(anio)] = (
+                inicial,
+                _compilar_regla(temporada, objetivo, funciones),
+            )
+
+    @classmethod
+    def cargar(cls, path: str, funciones: Optional[Dict[str, Callable]] = None) -> "TablaReglas":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f), funciones)
+
+    @property
+    def temporadas(self) -> List[int]:
+        return sorted(self._temporadas)
+
+    def __contains__(self, year: int) -> bool:
+        return year in self._temporadas
+
+    def iniciales(self, year: int) -> Dict:
+        """Valores de partida de la temporada (o los generales si no tiene reglas)."""
+        temporada = self._temporadas.get(year)
+        return dict(temporada[0] if temporada is not None else self.inicial_por_defecto)
+
+    def aplicar(
+        self, year: int, textos: Dict[str, str], valores: Optional[Dict] = None
+    ) -> Dict:
+        """
+        Evalúa las reglas de la temporada sobre los textos (ya en mayúsculas).
+
+        Args:
+            year (int): Temporada.
+            textos (Dict[str, str]): Textos de entrada por nombre ('fase', 'grupo').
+            valores (Optional[Dict]): Valores a completar en el lugar; por defecto
+                los iniciales de la temporada. Si una regla lanza una excepción
+                (p. ej. ValueError por una alternativa requerida), quedan los valores
+                asignados hasta ese momento, igual que en las cadenas if/elif originales.
+
+        Returns:
+            Dict: Valores resultantes.
+        """
+        temporada = self._temporadas.get(year)
+        if temporada is None:
+            return dict(self.inicial_por_defecto) if valores is None else valores
+        if valores is None:
+            valores = dict(temporada[0])
+        # Los ajustes de "preparar" modifican los textos para el resto de la evaluación
+        _evaluar_reglas([temporada[1]], False, valores, dict(textos))
+        return valores
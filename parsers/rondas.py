@@ -2,10 +2,11 @@
 """
 Parseador de Rondas para torneos FEBAMBA.
 Deducción de rondas en Playoffs y Final Four.
+Los cruces de cada Final Four están en mapeos/llaves_playoffs.json.
 """
 
-from typing import Optional, Dict
-from mapeos.loader import normalizar_equipo
+from typing import Optional, Dict, Tuple
+from mapeos.loader import REGISTRO, normalizar_equipo
 
 
 def inferir_ronda(
@@ -38,11 +39,13 @@ def inferir_ronda(
         ronda = inferir_ronda_2022_cuartos_nivel3(jornada)
         return {"ronda": ronda, "nivel": nivel, "llave": llave}
     elif fase.upper() == "FINAL FOUR":
-        if anio == 2022:
-            return inferir_ronda_2022_final_four(llave, categoria, equipos_map)
-        if anio in [2019, 2023, 2024]:
-            ronda = inferir_ronda_generica_final_four(llave, categoria, jornada, equipos_map)
-            return {"ronda": ronda, "nivel": None, "llave": llave}
+        temporada = _indice_llaves(equipos_map).get(anio)
+        if temporada is None:
+            return None
+        if not temporada[1]:
+            return inferir_ronda_2022_final_four(llave, categoria, equipos_map, anio)
+        ronda = inferir_ronda_generica_final_four(llave, categoria, jornada, equipos_map, anio)
+        return {"ronda": ronda, "nivel": None, "llave": llave}
     return None
 
 
@@ -103,72 +106,17 @@ def inferir_ronda_2022_cuartos_nivel3(jornada: str) -> Optional[str]:
 
 
 def inferir_ronda_2022_final_four(
-    llave: str, categoria: str, equipos_map
+    llave: str, categoria: str, equipos_map, anio: int = 2022
 ) -> Optional[Dict]:
     """
     Busca la llave en todos los niveles de la categoría para FINAL FOUR 2022.
     Devuelve dict con 'nivel', 'ronda' y 'llave'.
     """
-    semifinales_raw = {
-        "JUVENILES": [
-            ("2", "COOPERARIOS DE QUILMES-EL TALAR"),
-            ("2", "VICTORIA-ARGENTINOS DE CASTELAR B"),
-            ("1", "SAN LORENZO AZUL-RACING CLUB"),
-            ("1", "C S D PRESIDENTE DERQUI-SP.ESCOBAR"),
-        ],
-        "CADETES": [
-            ("2", "SOCIEDAD HEBRAICA ARGENTINA-ARGENTINOS DE CASTELAR B"),
-            ("2", "17 DE AGOSTO-CLUB SOCIAL Y ATLETICO EZEIZA"),
-            ("1", "CAZA Y PESCA A-C S D PRESIDENTE DERQUI"),
-            ("1", "PINOCHO-CAÑUELAS FC - Sub17"),
-        ],
-        "IFNATILES": [
-            ("2", "17 DE AGOSTO-LOS ANDES"),
-            ("2", "SAN MIGUEL-CLUB 3 DE FEBRERO AZUL"),
-        ],
-        "INFANTILES": [
-            ("1", "IMPERIO BLANCO-CLUB GIMNASIA Y ESGRIMA DE LA PLATA"),
-            ("1", "C S D PRESIDENTE DERQUI-CAZA Y PESCA A"),
-        ],
-        "PREINFANTILES": [
-            ("2", "U GRAL.ARMENIA-CLUB SOCIAL ALEJANDRO KORN"),
-            ("2", "SAN MIGUEL-VICTORIA"),
-            ("1", "QUILMES A.C-COMUNICACIONES"),
-            ("1", "CLUB 3 DE FEBRERO BLANCO-GEI AZUL"),
-        ],
-    }
-    finales_raw = {
-        "JUVENILES": [
-            ("2", "EL TALAR-VICTORIA"),
-            ("1", "SAN LORENZO AZUL-SP.ESCOBAR"),
-        ],
-        "CADETES": [
-            ("2", "SOCIEDAD HEBRAICA ARGENTINA-CLUB SOCIAL Y ATLETICO EZEIZA"),
-            ("1", "PINOCHO-CAZA Y PESCA A"),
-        ],
-        "INFANTILES": [
-            ("2", "SAN MIGUEL-17 DE AGOSTO"),
-            ("1", "CLUB GIMNASIA Y ESGRIMA DE LA PLATA-CAZA Y PESCA A"),
-        ],
-        "PREINFANTILES": [
-            ("2", "VICTORIA-CLUB SOCIAL ALEJANDRO KORN"),
-            ("1", "QUILMES A.C-GEI AZUL"),
-        ],
-    }
-    c = categoria.upper()
-    # Buscar en semifinales
-    for n, a_b in semifinales_raw.get(c, []):
-        a, b = a_b.split("-", 1)
-        llave_norm = f"{normalizar_equipo(a, equipos_map)}-{normalizar_equipo(b, equipos_map)}"
-        if llave == llave_norm:
-            return {"nivel": n, "ronda": "SEMIFINAL", "llave": llave}
-    # Buscar en finales si no se encontró en semifinales
-    for n, a_b in finales_raw.get(c, []):
-        a, b = a_b.split("-", 1)
-        llave_norm = f"{normalizar_equipo(a, equipos_map)}-{normalizar_equipo(b, equipos_map)}"
-        if llave == llave_norm:
-            return {"nivel": n, "ronda": "FINAL", "llave": llave}
-    return None
+    cruce = _buscar_llave(anio, categoria, llave, equipos_map)
+    if cruce is None:
+        return None
+    ronda, nivel = cruce
+    return {"nivel": nivel, "ronda": ronda, "llave": llave}
 
 
 def inferir_ronda_generica_playoff(jornada: str) -> Optional[str]:
@@ -181,7 +129,7 @@ def inferir_ronda_generica_playoff(jornada: str) -> Optional[str]:
 
 
 def inferir_ronda_generica_final_four(
-    llave: str, categoria: str, jornada: str, equipos_map
+    llave: str, categoria: str, jornada: str, equipos_map, anio: int = 2023
 ) -> Optional[str]:
     """
     Deducción genérica de ronda para Final Four según llave y jornada.
@@ -189,70 +137,64 @@ def inferir_ronda_generica_final_four(
     if not jornada.isdigit():
         return None
     # No se usa nivel, se busca en todos los niveles de la categoría
-    semifinales_raw = {
-        "JUVENILES": [
-            "COOPERADORES DE QUILMES-EL TALAR",
-            "VICTORIA-ARGENTINOS DE CASTELAR B",
-            "SAN LORENZO AZUL-RACING CLUB",
-            "C S D PRESIDENTE DERQUI-SP.ESCOBAR",
-        ],
-        "CADETES": [
-            "SOCIEDAD HEBRAICA ARGENTINA-ARGENTINOS DE CASTELAR B",
-            "17 DE AGOSTO-CLUB SOCIAL Y ATLETICO EZEIZA",
-            "CAZA Y PESCA A-C S D PRESIDENTE DERQUI",
-            "PINOCHO-CAÑUELAS FC - Sub17",
-        ],
-        "IFNATILES": [
-            "17 DE AGOSTO-LOS ANDES",
-            "SAN MIGUEL-CLUB 3 DE FEBRERO AZUL",
-        ],
-        "INFANTILES": [
-            "IMPERIO BLANCO-CLUB GIMNASIA Y ESGRIMA DE LA PLATA",
-            "C S D PRESIDENTE DERQUI-CAZA Y PESCA A",
-        ],
-        "PREINFANTILES": [
-            "U GRAL.ARMENIA-CLUB SOCIAL ALEJANDRO KORN",
-            "SAN MIGUEL-VICTORIA",
-            "QUILMES A.C-COMUNICACIONES",
-            "CLUB 3 DE FEBRERO BLANCO-GEI AZUL",
-        ],
-    }
-    finales_raw = {
-        "JUVENILES": [
-            "EL TALAR-VICTORIA",
-            "SAN LORENZO AZUL-SP.ESCOBAR",
-        ],
-        "CADETES": [
-            "SOCIEDAD HEBRAICA ARGENTINA-CLUB SOCIAL Y ATLETICO EZEIZA",
-            "PINOCHO-CAZA Y PESCA A",
-        ],
-        "INFANTILES": [
-            "SAN MIGUEL-17 DE AGOSTO",
-            "CLUB GIMNASIA Y ESGRIMA DE LA PLATA-CAZA Y PESCA A",
-        ],
-        "PREINFANTILES": [
-            "VICTORIA-CLUB SOCIAL ALEJANDRO KORN",
-            "QUILMES A.C-GEI AZUL",
-        ],
-    }
-    c = categoria.upper()
-    semifinales = {
-        f"{normalizar_equipo(a, equipos_map)}-{normalizar_equipo(b, equipos_map)}"
-        for a_b in semifinales_raw.get(c, [])
-        for a, b in [a_b.split("-", 1)]
-    }
-    finales = {
-        f"{normalizar_equipo(a, equipos_map)}-{normalizar_equipo(b, equipos_map)}"
-        for a_b in finales_raw.get(c, [])
-        for a, b in [a_b.split("-", 1)]
-    }
-    if llave in semifinales:
-        return "SEMIFINAL"
-    if llave in finales:
-        return "FINAL"
+    cruce = _buscar_llave(anio, categoria, llave, equipos_map)
+    if cruce is not None:
+        return cruce[0]
     return {1: "SEMIFINAL", 2: "FINAL"}.get(int(jornada))
 
 
+def _indice_llaves(equipos_map) -> Dict[int, Tuple[Dict, bool]]:
+    """
+    Índice de las llaves de Final Four de mapeos/llaves_playoffs.json, con los
+    equipos ya normalizados: {anio: ({(categoria, "LOCAL-VISITANTE"): (ronda, nivel)},
+    ronda_por_jornada)}. Cada llave entra en los dos sentidos; ante un choque
+    gana el sentido original y, entre llaves, la primera del archivo
+    (semifinales antes que finales). Se arma una vez por versión del archivo
+    y del mapa de equipos.
+    """
+    # El registro descarta el índice si cambia llaves_playoffs.json y lo reemplaza
+    # si cambia el mapa de equipos: el de cargar_mapeo_equipos() es el mismo dict
+    # mientras no cambie el mtime de equipos_map.json, igual que en indice_equipos
+    return REGISTRO.indice(
+        "llaves_playoffs.json",
+        "llaves_normalizadas",
+        lambda datos: _construir_indice_llaves(datos, equipos_map),
+        version=equipos_map,
+    )
+
+
+def _construir_indice_llaves(datos: Dict, equipos_map) -> Dict[int, Tuple[Dict, bool]]:
+    por_llaves = {}
+    for nombre, categorias in datos["llaves"].items():
+        indice = {}
+        invertidas = []
+        for categoria, cruces in categorias.items():
+            c = categoria.upper()
+            for cruce in cruces:
+                a, b = (normalizar_equipo(e, equipos_map) for e in cruce["llave"])
+                valor = (cruce["ronda"], cruce["nivel"])
+                indice.setdefault((c, f"{a}-{b}"), valor)
+                invertidas.append(((c, f"{b}-{a}"), valor))
+        for clave, valor in invertidas:
+            indice.setdefault(clave, valor)
+        por_llaves[nombre] = indice
+
+    return {
+        int(anio): (por_llaves[temporada["final_four"]], temporada["ronda_por_jornada"])
+        for anio, temporada in datos["temporadas"].items()
+    }
+
+
+def _buscar_llave(
+    anio: int, categoria: str, llave: str, equipos_map
+) -> Optional[Tuple[str, Optional[str]]]:
+    """(ronda, nivel) de la llave en la Final Four de la temporada, o None."""
+    temporada = _indice_llaves(equipos_map).get(anio)
+    if temporada is None:
+        return None
+    return temporada[0].get((categoria.upper(), llave))
+
+
 def _map_ronda(jornada: int, estructura: list) -> Optional[str]:
     """
     Mapea el número de jornada a la ronda correspondiente según la estructura.
@@ -1,3 +1,4 @@
+import argparse
 import os
 import sys
 import pandas as pd
@@ -6,54 +7,237 @@ from datetime import date
 # Agregar el directorio raíz del proyecto al sys.path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from parsers.memo import RUTA_MEMO, cargar_memo, guardar_memo, registrar_estadisticas
+from scraper.archivo import DIRECTORIO_ARCHIVO, ArchivoPaginas
+from scraper.checkpoint import Checkpoint
+from scraper.incremental import EstadoIncremental
 from scraper.main import FebambaScraper
+from utils.almacen import RUTA_ALMACEN, guardar_partidos
+from utils.cache_http import RUTA_POR_DEFECTO, CacheHTTP
+from utils.dataframes import combinar_partidos
+from utils.metricas import DIRECTORIO_METRICAS, METRICAS
+from utils.open_csv import leer_csv_con_encoding_detectado
+from utils.perfilado import PerfilCProfile, Perfilador
+from utils.requester import configurar_cache
 
-# Lista de torneos a scrapear
+# Lista de torneos a scrapear. "cerrada" marca las temporadas terminadas: sus
+# páginas en la caché HTTP no vencen nunca (las demás se revalidan según --ttl-vigente)
 torneos_a_scrapear = [
     #{
     #    "id": 16,
     #    "url": "https://competicionescabb.gesdeportiva.es/competicion.aspx?competencia=16",
     #    "Anio": 2019,
+    #    "cerrada": True,
     #    "torneo": "Torneo Formativas 2019",
     #},
     #{
     #    "id": 307,
     #    "url": "https://competicionescabb.gesdeportiva.es/competicion.aspx?competencia=307",
     #    "Anio": 2022,
+    #    "cerrada": True,
     #    "torneo": "TORNEO FORMATIVAS 2022",
     #},
     #{
     #    "id": 682,
     #    "url": "https://competicionescabb.gesdeportiva.es/competicion.aspx?competencia=682",
     #    "Anio": 2023,
+    #    "cerrada": True,
     #    "torneo": "FORMATIVAS 2023",
     #},
     #{
     #    "id": 1178,
     #    "url": "https://competicionescabb.gesdeportiva.es/competicion.aspx?competencia=1178",
     #    "Anio": 2024,
+    #    "cerrada": True,
     #    "torneo": "FORMATIVAS 2024",
     #},
     {
         "id": 1623,
         "url": "https://competicionescabb.gesdeportiva.es/competicion.aspx?competencia=1623",
         "Anio": 2025,
+        "cerrada": False,
         "torneo": "FORMATIVAS 2025",
     },
 ]
 
 
-def main():
-    scraper = FebambaScraper(base_url="https://competicionescabb.gesdeportiva.es/")
+def parsear_argumentos():
+    parser = argparse.ArgumentParser(description="Scraping de torneos formativos FEBAMBA")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Hilos de descarga concurrentes (1 = recorrido en serie)",
+    )
+    parser.add_argument(
+        "--rps",
+        type=float,
+        default=4.0,
+        help="Solicitudes por segundo iniciales del limitador adaptativo",
+    )
+    parser.add_argument(
+        "--rps-max",
+        type=float,
+        default=None,
+        help="Techo de solicitudes por segundo si el servidor responde bien (default 4x --rps)",
+    )
+    parser.add_argument(
+        "--parser",
+        choices=["lxml", "bs4"],
+        default="lxml",
+        help="Backend de extracción HTML",
+    )
+    parser.add_argument(
+        "--cache",
+        default=RUTA_POR_DEFECTO,
+        help="Archivo SQLite de la caché HTTP",
+    )
+    parser.add_argument(
+        "--sin-cache",
+        action="store_true",
+        help="Descargar todo de nuevo sin usar la caché HTTP",
+    )
+    parser.add_argument(
+        "--ttl-vigente",
+        type=float,
+        default=0,
+        help="Segundos de frescura de las páginas de la temporada en curso (0 = revalidar siempre)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Parsear solo los grupos con cambios y combinarlos con Data/partidos_<anio>.csv",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Retomar desde el checkpoint de la corrida anterior sin repetir grupos completados",
+    )
+    parser.add_argument(
+        "--archivar",
+        action="store_true",
+        help=f"Archivar el HTML crudo de cada grupo en {DIRECTORIO_ARCHIVO}/ para re-parsear sin red",
+    )
+    parser.add_argument(
+        "--memo-parsers",
+        nargs="?",
+        const=RUTA_MEMO,
+        default=None,
+        metavar="ARCHIVO",
+        help=f"Persistir los resultados de los parsers de fase/grupo/jornada entre corridas (default {RUTA_MEMO})",
+    )
+    parser.add_argument(
+        "--metricas",
+        default=DIRECTORIO_METRICAS,
+        help="Carpeta donde exportar el resumen JSON/CSV de solicitudes HTTP",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Medir el tiempo de cada etapa (fetch, parse, inferencia, normalización) por temporada y categoría",
+    )
+    parser.add_argument(
+        "--profile-cprofile",
+        default=None,
+        metavar="ARCHIVO",
+        help="Además volcar un perfil cProfile (pstats) a ARCHIVO; conviene con --workers 1",
+    )
+    return parser.parse_args()
+
+
+def configurar_cache_torneos(args, torneos):
+    """
+    Torneos marcados "cerrada" sin vencimiento; el resto (o sin la marca) se
+    revalida según --ttl-vigente. Devuelve la caché (None con --sin-cache).
+    """
+    if args.sin_cache:
+        return None
+    cache = CacheHTTP(path=args.cache, ttl_por_defecto=args.ttl_vigente)
+    for torneo in torneos:
+        cache.fijar_ttl(torneo["id"], None if torneo.get("cerrada", False) else args.ttl_vigente)
+    configurar_cache(cache)
+    return cache
+
+
+def abrir_archivo(scraper, torneo, archivar, agregar):
+    """Asigna al scraper el archivo de páginas del torneo (o ninguno)."""
+    scraper.archivo = ArchivoPaginas.para_torneo(torneo, agregar=agregar) if archivar else None
+
+
+def cerrar_archivo(scraper):
+    if scraper.archivo is not None:
+        scraper.archivo.cerrar()
+        scraper.archivo = None
+
+
+def cerrar_checkpoint(scraper):
+    """Cierra el checkpoint del torneo y lo devuelve (o None) para poder borrarlo después."""
+    checkpoint = scraper.checkpoint
+    if checkpoint is not None:
+        checkpoint.cerrar()
+        scraper.checkpoint = None
+    return checkpoint
+
+
+def actualizar_incremental(scraper, torneos, retomar=False, archivar=False):
+    """Re-parsea solo los grupos con jornadas nuevas y los combina con Data/partidos_<anio>.csv."""
+    for torneo in torneos:
+        print(f"Actualizando: {torneo['torneo']} ({torneo['Anio']})")
+        scraper.estado_incremental = EstadoIncremental.para_torneo(torneo)
+        scraper.checkpoint = Checkpoint.para_torneo(torneo, retomar=retomar)
+        abrir_archivo(scraper, torneo, archivar, agregar=True)
+        previos = len(scraper.partidos_acumulados)
+        try:
+            partidos = scraper.scrap_torneo(torneo)[previos:]
+        except Exception as e:
+            print(f"Error al scrapear {torneo['torneo']}: {e}")
+            continue
+        finally:
+            cerrar_archivo(scraper)
+            checkpoint = cerrar_checkpoint(scraper)
+
+        output_path = os.path.join("Data", f"partidos_{torneo['Anio']}.csv")
+        if os.path.exists(output_path):
+            existentes = leer_csv_con_encoding_detectado(
+                output_path, ";", dtype=str, keep_default_na=False
+            )
+        else:
+            existentes = pd.DataFrame()
+        df = combinar_partidos(existentes, pd.DataFrame(partidos))
+        df.to_csv(output_path, sep=";", index=False, encoding="utf-8")
+        # Si ya existe el almacén Parquet, se reemplaza la temporada actualizada
+        if os.path.isdir(f"{RUTA_ALMACEN}.parquet"):
+            guardar_partidos(df)
+        scraper.estado_incremental.guardar()
+        # Los partidos ya están en el CSV: un --resume posterior no debe reusarlos
+        checkpoint.eliminar()
+        print(
+            f"Archivo actualizado: {output_path} "
+            f"({len(partidos)} partidos de grupos con cambios, {len(df)} en total)"
+        )
+
+
+def scrapear_completo(scraper, torneos, retomar=False, archivar=False):
+    """Scrapea los torneos completos y guarda todos los partidos en Data/<fecha>.csv."""
     all_partidos = []
+    terminados = []
 
-    for torneo in torneos_a_scrapear:
+    for torneo in torneos:
         print(f"Scrapeando: {torneo['torneo']} ({torneo['Anio']})")
+        scraper.checkpoint = Checkpoint.para_torneo(torneo, retomar=retomar)
+        abrir_archivo(scraper, torneo, archivar, agregar=retomar)
+        completo = False
         try:
             partidos = scraper.scrap_torneo(torneo)
             all_partidos.extend(partidos)
+            completo = True
         except Exception as e:
             print(f"Error al scrapear {torneo['torneo']}: {e}")
+        finally:
+            cerrar_archivo(scraper)
+            checkpoint = cerrar_checkpoint(scraper)
+        if completo:
+            terminados.append(checkpoint)
 
     if all_partidos:
         df = pd.DataFrame(all_partidos)
@@ -61,9 +245,47 @@ def main():
         output_path = os.path.join("Data", f"{date.today()}.csv")
         df.to_csv(output_path, index=False, encoding="utf-8-sig")
         print(f"Archivo guardado en: {output_path}")
+        # Solo con el CSV escrito se borran los checkpoints de los torneos terminados
+        for checkpoint in terminados:
+            checkpoint.eliminar()
     else:
         print("No se encontraron partidos para los torneos seleccionados.")
 
 
+def main():
+    args = parsear_argumentos()
+    cache = configurar_cache_torneos(args, torneos_a_scrapear)
+    scraper = FebambaScraper(
+        base_url="https://competicionescabb.gesdeportiva.es/",
+        max_workers=args.workers,
+        solicitudes_por_segundo=args.rps,
+        max_solicitudes_por_segundo=args.rps_max,
+        extractor=args.parser,
+        perfilador=Perfilador() if args.profile else None,
+    )
+    if args.memo_parsers:
+        cargar_memo(args.memo_parsers)
+    try:
+        with PerfilCProfile(args.profile_cprofile):
+            if args.incremental:
+                actualizar_incremental(
+                    scraper, torneos_a_scrapear, retomar=args.resume, archivar=args.archivar
+                )
+            else:
+                scrapear_completo(
+                    scraper, torneos_a_scrapear, retomar=args.resume, archivar=args.archivar
+                )
+    finally:
+        if cache is not None:
+            # Vuelca los accesos pendientes que usa el desalojo
+            cache.cerrar()
+        METRICAS.exportar(args.metricas)
+        registrar_estadisticas()
+        if args.memo_parsers:
+            guardar_memo(args.memo_parsers)
+        if scraper.perfilador is not None:
+            scraper.perfilador.imprimir()
+
+
 if __name__ == "__main__":
     main()
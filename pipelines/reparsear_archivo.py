@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+"""
+Re-parseo offline de las páginas archivadas por el scraper (--archivar).
+Pasa cada página de Data/archivo/ por los extractores y parsers actuales,
+repartiendo el trabajo entre procesos, y regenera partidos_<anio>.csv sin
+acceder a la red. Sirve para aplicar a temporadas viejas un arreglo en
+parsers/ o mapeos/ sin volver a scrapear.
+
+Por defecto escribe en Data/reparseado/. El archivo puede estar incompleto
+(descargas fallidas o una corrida interrumpida no archivan esas páginas), así
+que un CSV existente con más grupos o partidos no se reemplaza salvo con
+--sobrescribir.
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+# Agregar el directorio raíz del proyecto al sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mapeos.loader import cargar_mapeo_equipos
+from scraper.archivo import DIRECTORIO_ARCHIVO, paginas_vigentes
+from scraper.extractores import obtener_extractor
+from scraper.main import parsear_pagina_grupo
+from utils.logger import get_logger
+from utils.open_csv import leer_csv_con_encoding_detectado
+
+logger = get_logger("ReparsearArchivo")
+
+PAGINAS_POR_LOTE = 64
+CARPETA_SALIDA = os.path.join("Data", "reparseado")
+COLUMNAS_GRUPO = ["categoria", "fase", "zona", "grupo"]
+
+# Extractor y mapa de equipos de cada proceso worker
+_EXTRACTOR = None
+_EQUIPOS_MAP = None
+
+
+def parsear_argumentos():
+    parser = argparse.ArgumentParser(
+        description="Regenera los CSV de partidos a partir del archivo de páginas crudas"
+    )
+    parser.add_argument(
+        "--archivos",
+        nargs="+",
+        default=None,
+        help=f"Archivos de páginas a procesar (default {DIRECTORIO_ARCHIVO}/paginas_*.gz)",
+    )
+    parser.add_argument(
+        "--anios", type=int, nargs="+", default=None, help="Solo estas temporadas"
+    )
+    parser.add_argument(
+        "--salida", default=CARPETA_SALIDA, help="Carpeta donde escribir partidos_<anio>.csv"
+    )
+    parser.add_argument(
+        "--sobrescribir",
+        action="store_true",
+        help="Reemplazar CSV existentes aunque el re-parseo tenga menos grupos o partidos",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Procesos de parseo (1 = en el proceso actual)",
+    )
+    parser.add_argument(
+        "--parser", choices=["lxml", "bs4"], default="lxml", help="Backend de extracción HTML"
+    )
+    return parser.parse_args()
+
+
+def _iniciar_worker(extractor: str):
+    global _EXTRACTOR, _EQUIPOS_MAP
+    _EXTRACTOR = obtener_extractor(extractor)
+    _EQUIPOS_MAP = cargar_mapeo_equipos()
+
+
+def _reparsear_lote(paginas: List[Dict]) -> List[Dict]:
+    partidos = []
+    for pagina in paginas:
+        partidos.extend(
+            parsear_pagina_grupo(
+                pagina["html"],
+                pagina["url"],
+                pagina["anio"],
+                pagina["categoria"],
+                pagina["fase_text"],
+                pagina["grupo_text"],
+                extractor=_EXTRACTOR,
+                equipos_map=_EQUIPOS_MAP,
+            )
+        )
+    return partidos
+
+
+def cargar_paginas(archivos: List[str], anios=None) -> List[Dict]:
+    """Última versión de cada página de los archivos, en el orden del recorrido original."""
+    paginas = []
+    for path in archivos:
+        vigentes = [p for p in paginas_vigentes(path) if not anios or p["anio"] in anios]
+        logger.info(f"{path}: {len(vigentes)} páginas")
+        paginas.extend(vigentes)
+    return paginas
+
+
+def reparsear(paginas: List[Dict], workers: int = 1, extractor: str = "lxml") -> List[Dict]:
+    """
+    Parsea las páginas y devuelve los partidos en el mismo orden que el scraper.
+
+    Args:
+        paginas (List[Dict]): Registros de scraper.archivo.leer_archivo.
+        workers (int): Procesos en paralelo; con 1 se parsea en el proceso actual.
+        extractor (str): Backend de extracción HTML.
+
+    Returns:
+        List[Dict]: Partidos con las mismas columnas que los CSV de Data/.
+    """
+    lotes = [
+        paginas[i : i + PAGINAS_POR_LOTE] for i in range(0, len(paginas), PAGINAS_POR_LOTE)
+    ]
+    partidos = []
+    if workers <= 1:
+        _iniciar_worker(extractor)
+        for lote in lotes:
+            partidos.extend(_reparsear_lote(lote))
+        return partidos
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_iniciar_worker, initargs=(extractor,)
+    ) as pool:
+        for partidos_lote in pool.map(_reparsear_lote, lotes):
+            partidos.extend(partidos_lote)
+    return partidos
+
+
+def _conteos(df: pd.DataFrame):
+    return df[COLUMNAS_GRUPO].astype(str).drop_duplicates().shape[0], len(df)
+
+
+def motivo_para_no_sobrescribir(df_nuevo: pd.DataFrame, path: str) -> Optional[str]:
+    """
+    Compara el re-parseo de una temporada con el CSV que ya está en `path`.
+
+    Returns:
+        Optional[str]: Por qué no reemplazarlo (el nuevo tiene menos grupos o
+            partidos), o None si no existe o el nuevo no pierde nada.
+    """
+    if not os.path.exists(path):
+        return None
+    grupos_nuevos, partidos_nuevos = _conteos(df_nuevo)
+    grupos, partidos = _conteos(leer_csv_con_encoding_detectado(path, sep=";", dtype=str))
+    if grupos_nuevos < grupos or partidos_nuevos < partidos:
+        return (
+            f"el re-parseo tiene {grupos_nuevos} grupos y {partidos_nuevos} partidos, "
+            f"el existente {grupos} y {partidos}"
+        )
+    return None
+
+
+def main():
+    args = parsear_argumentos()
+    archivos = args.archivos or sorted(
+        glob.glob(os.path.join(DIRECTORIO_ARCHIVO, "paginas_*.gz"))
+    )
+    if not archivos:
+        logger.error(f"No hay archivos de páginas en {DIRECTORIO_ARCHIVO}")
+        return
+
+    inicio = time.perf_counter()
+    paginas = cargar_paginas(archivos, args.anios)
+    partidos = reparsear(paginas, workers=args.workers, extractor=args.parser)
+    if not partidos:
+        logger.warning("No se obtuvieron partidos de las páginas archivadas")
+        return
+
+    df = pd.DataFrame(partidos)
+    os.makedirs(args.salida, exist_ok=True)
+    for anio, df_anio in df.groupby("anio", sort=True):
+        output_path = os.path.join(args.salida, f"partidos_{anio}.csv")
+        motivo = motivo_para_no_sobrescribir(df_anio, output_path)
+        if motivo and not args.sobrescribir:
+            logger.error(f"No se reemplaza {output_path}: {motivo} (usar --sobrescribir)")
+            continue
+        if motivo:
+            logger.warning(f"Se reemplaza {output_path} con menos datos: {motivo}")
+        df_anio.to_csv(output_path, sep=";", index=False, encoding="utf-8")
+        logger.info(f"Archivo regenerado: {output_path} ({len(df_anio)} partidos)")
+    logger.info(
+        f"{len(paginas)} páginas y {len(partidos)} partidos re-parseados "
+        f"en {time.perf_counter() - inicio:.1f}s con {args.workers} procesos"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,55 +1,309 @@
+# -*- coding: utf-8 -*-
+"""
+Descubrimiento de competencias en GesDeportiva.
+Recorre los IDs de `competicion.aspx?competencia=<id>` con varios workers
+asíncronos, agrega cada competencia encontrada a `gesdeportiva.jsonl` apenas
+se encuentra y al final reescribe el índice completo `gesdeportiva.json`
+(si la corrida se corta, lo ya encontrado se recupera del JSONL).
+
+Por defecto retoma desde el mayor ID conocido y se detiene sola después de
+`--max-vacios` IDs seguidos sin competencia. Los IDs cuya descarga falló
+(agotados los reintentos) no cuentan como vacíos: se guardan en `fallidos`
+del índice y se vuelven a consultar al comienzo de la corrida siguiente.
+"""
+
+import argparse
+import asyncio
 import json
-import requests
+import os
+import sys
+from typing import Dict, Optional, Set
 
 from bs4 import BeautifulSoup
 
-competencias = {
-    "competencias" : []
-}
-for id in range(1480):
-    url = f"https://competicionescabb.gesdeportiva.es/competicion.aspx?competencia={id}"
-
-    response = requests.get(url)
-    html_content = response.text
-
-    # Parse the HTML content
-    soup = BeautifulSoup(html_content, 'html.parser')
-    print(str(id))
-    titulo = soup.find("div", {"class": "col-12 tituloPagina"}).text.strip()
-    print(titulo)
-    if titulo != "Error al cargar la información":
-        try:
-            federacion = soup.find("span", id="LTituloDelegacion").text.strip()
-            torneo = soup.find("span", id="LTituloCompeticion").text.strip()
-            print(federacion + "-" + torneo)
-            competencias["competencias"].append(
-                {
-                    "id": id,
-                    "url": url,
-                    "federacion": federacion,
-                    "torneo": torneo,
-                }
+# Agregar el directorio raíz del proyecto al sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.logger import get_logger
+from utils.metricas import DIRECTORIO_METRICAS, METRICAS
+from utils.requester import (
+    SesionAsync,
+    SolicitudFallida,
+    configurar_limitador,
+    hacer_solicitud_async,
+)
+
+logger = get_logger("TorneosGes")
+
+URL_COMPETENCIA = "https://competicionescabb.gesdeportiva.es/competicion.aspx?competencia={id}"
+TITULO_ERROR = "Error al cargar la información"
+RUTA_JSON = "gesdeportiva.json"
+RUTA_JSONL = "gesdeportiva.jsonl"
+
+
+def parsear_competencia(comp_id: int, html: Optional[bytes]) -> Optional[Dict]:
+    """
+    Interpreta la página de una competencia.
+
+    Args:
+        comp_id (int): ID de la competencia.
+        html (Optional[bytes]): Contenido de la página (None si devolvió 404).
+
+    Returns:
+        Optional[Dict]: id, url y, si están, federacion y torneo; None si el ID está vacío.
+    """
+    if not html:
+        return None
+
+    try:
+        # El sitio sirve UTF-8; sin esto el título de error puede no coincidir
+        html = html.decode("utf-8")
+    except UnicodeDecodeError:
+        pass
+    soup = BeautifulSoup(html, "html.parser")
+    titulo_div = soup.find("div", {"class": "col-12 tituloPagina"})
+    if titulo_div is None:
+        return None
+    if titulo_div.text.strip() == TITULO_ERROR:
+        return None
+
+    competencia = {"id": comp_id, "url": URL_COMPETENCIA.format(id=comp_id)}
+    federacion = soup.find("span", id="LTituloDelegacion")
+    torneo = soup.find("span", id="LTituloCompeticion")
+    if federacion is not None and torneo is not None:
+        competencia["federacion"] = federacion.text.strip()
+    if torneo is not None:
+        competencia["torneo"] = torneo.text.strip()
+    return competencia
+
+
+def _leer_jsonl(ruta_jsonl: str):
+    """Devuelve los registros válidos del JSONL (una línea cortada a mitad se descarta)."""
+    if not os.path.exists(ruta_jsonl):
+        return []
+    registros = []
+    with open(ruta_jsonl, "r", encoding="utf-8") as f:
+        for linea in f:
+            try:
+                registros.append(json.loads(linea))
+            except json.JSONDecodeError:
+                continue
+    return registros
+
+
+def cargar_indice(ruta_json: str = RUTA_JSON, ruta_jsonl: str = RUTA_JSONL) -> Dict[int, Dict]:
+    """Une el índice JSON con lo que haya quedado en el JSONL de corridas anteriores."""
+    indice = {}
+    if os.path.exists(ruta_json):
+        with open(ruta_json, "r", encoding="utf-8") as f:
+            for competencia in json.load(f)["competencias"]:
+                indice[competencia["id"]] = competencia
+    for registro in _leer_jsonl(ruta_jsonl):
+        if "fallido" not in registro:
+            indice[registro["id"]] = registro
+    return indice
+
+
+def cargar_fallidos(ruta_json: str = RUTA_JSON, ruta_jsonl: str = RUTA_JSONL) -> Set[int]:
+    """
+    IDs cuya descarga falló en corridas anteriores y que todavía no se encontraron.
+
+    Args:
+        ruta_json (str): Índice JSON (lista `fallidos`).
+        ruta_jsonl (str): Registro incremental (líneas `{"fallido": id}`).
+
+    Returns:
+        Set[int]: IDs a reintentar.
+    """
+    fallidos = set()
+    if os.path.exists(ruta_json):
+        with open(ruta_json, "r", encoding="utf-8") as f:
+            fallidos.update(json.load(f).get("fallidos", []))
+    encontrados = set()
+    for registro in _leer_jsonl(ruta_jsonl):
+        if "fallido" in registro:
+            fallidos.add(registro["fallido"])
+        else:
+            encontrados.add(registro["id"])
+    return fallidos - encontrados
+
+
+def guardar_indice(indice: Dict[int, Dict], ruta_json: str = RUTA_JSON, fallidos=()):
+    """Escribe `gesdeportiva.json` ordenado por ID, reemplazándolo de forma atómica."""
+    competencias = {
+        "competencias": [indice[k] for k in sorted(indice)],
+        "fallidos": sorted(set(fallidos) - set(indice)),
+    }
+    tmp = f"{ruta_json}.tmp"
+    with open(tmp, "w") as json_file:
+        json.dump(competencias, json_file, indent=4)
+    os.replace(tmp, ruta_json)
+
+
+async def descubrir(
+    desde: int,
+    hasta: Optional[int] = None,
+    workers: int = 16,
+    max_vacios: int = 50,
+    al_encontrar=None,
+    fallidos: Optional[Set[int]] = None,
+    al_fallar=None,
+) -> Dict[int, Dict]:
+    """
+    Recorre IDs a partir de `desde` repartiéndolos entre `workers` tareas.
+
+    Cada worker toma el siguiente ID libre de un contador compartido, así que el
+    rango se reparte dinámicamente. Se deja de tomar IDs al pasar `hasta` o cuando
+    hay más de `max_vacios` IDs vacíos seguidos después de la última competencia
+    encontrada. Un ID cuya descarga falla no es vacío: no suma a esa cuenta y
+    queda en `fallidos`. Los `fallidos` previos a `desde` se consultan primero.
+
+    Args:
+        desde (int): Primer ID a consultar.
+        hasta (Optional[int]): Último ID a consultar (sin límite si es None).
+        workers (int): Solicitudes simultáneas.
+        max_vacios (int): IDs vacíos consecutivos tolerados antes de cortar.
+        al_encontrar (callable): Se llama con cada competencia apenas se encuentra.
+        fallidos (Optional[Set[int]]): IDs cuya descarga falló; se actualiza en el lugar
+            (salen los que se resuelven y entran los que fallan en esta corrida).
+        al_fallar (callable): Se llama con cada ID cuya descarga falla.
+
+    Returns:
+        Dict[int, Dict]: Competencias encontradas por ID.
+    """
+    if fallidos is None:
+        fallidos = set()
+    pendientes = sorted(f for f in fallidos if f < desde)
+    estado = {"siguiente": desde, "ultimo": desde - 1}
+    fallidos_rango = set()
+    encontradas = {}
+
+    def vacios_desde_ultimo(comp_id: int) -> int:
+        fallidos_despues = sum(1 for f in fallidos_rango if f > estado["ultimo"])
+        return comp_id - estado["ultimo"] - fallidos_despues
+
+    async with SesionAsync(max_por_host=workers) as sesion:
+
+        async def trabajador():
+            while True:
+                if pendientes:
+                    comp_id = pendientes.pop(0)
+                else:
+                    comp_id = estado["siguiente"]
+                    if hasta is not None and comp_id > hasta:
+                        return
+                    if vacios_desde_ultimo(comp_id) > max_vacios:
+                        return
+                    estado["siguiente"] += 1
+
+                try:
+                    html = await hacer_solicitud_async(
+                        URL_COMPETENCIA.format(id=comp_id),
+                        sesion,
+                        max_intentos=3,
+                        lanzar_si_falla=True,
+                    )
+                except SolicitudFallida:
+                    logger.warning(f"{comp_id}: falló la descarga, se reintentará")
+                    fallidos.add(comp_id)
+                    if comp_id >= desde:
+                        fallidos_rango.add(comp_id)
+                    if al_fallar is not None:
+                        al_fallar(comp_id)
+                    continue
+
+                fallidos.discard(comp_id)
+                competencia = parsear_competencia(comp_id, html)
+                if competencia is None:
+                    logger.debug(f"{comp_id}: sin competencia")
+                    continue
+
+                if comp_id >= desde:
+                    estado["ultimo"] = max(estado["ultimo"], comp_id)
+                encontradas[comp_id] = competencia
+                logger.info(f"{comp_id}: {competencia.get('torneo', competencia['url'])}")
+                if al_encontrar is not None:
+                    al_encontrar(competencia)
+
+        await asyncio.gather(*(trabajador() for _ in range(workers)))
+
+    return encontradas
+
+
+def parsear_argumentos():
+    parser = argparse.ArgumentParser(description="Descubrimiento de competencias de GesDeportiva")
+    parser.add_argument(
+        "--desde",
+        type=int,
+        default=None,
+        help="Primer ID a consultar (por defecto, el mayor ID conocido + 1)",
+    )
+    parser.add_argument("--hasta", type=int, default=None, help="Último ID a consultar")
+    parser.add_argument("--workers", type=int, default=16, help="Solicitudes simultáneas")
+    parser.add_argument(
+        "--rps", type=float, default=8.0, help="Solicitudes por segundo iniciales"
+    )
+    parser.add_argument(
+        "--rps-max", type=float, default=None, help="Techo de solicitudes por segundo"
+    )
+    parser.add_argument(
+        "--max-vacios",
+        type=int,
+        default=50,
+        help="Cortar después de esta cantidad de IDs seguidos sin competencia",
+    )
+    parser.add_argument("--json", default=RUTA_JSON, help="Índice JSON de competencias")
+    parser.add_argument("--jsonl", default=RUTA_JSONL, help="Registro incremental JSONL")
+    parser.add_argument(
+        "--metricas", default=DIRECTORIO_METRICAS, help="Carpeta del resumen de solicitudes HTTP"
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parsear_argumentos()
+    configurar_limitador(args.rps, maximo=args.rps_max, max_en_vuelo=args.workers)
+    indice = cargar_indice(args.json, args.jsonl)
+    fallidos = cargar_fallidos(args.json, args.jsonl)
+    desde = args.desde if args.desde is not None else max(indice, default=-1) + 1
+    logger.info(
+        f"{len(indice)} competencias conocidas, {len(fallidos)} IDs a reintentar, "
+        f"buscando desde el ID {desde}"
+    )
+
+    with open(args.jsonl, "a", encoding="utf-8") as jsonl:
+
+        def al_encontrar(competencia):
+            indice[competencia["id"]] = competencia
+            jsonl.write(json.dumps(competencia) + "\n")
+            jsonl.flush()
+
+        def al_fallar(comp_id):
+            jsonl.write(json.dumps({"fallido": comp_id}) + "\n")
+            jsonl.flush()
+
+        encontradas = asyncio.run(
+            descubrir(
+                desde,
+                args.hasta,
+                args.workers,
+                args.max_vacios,
+                al_encontrar,
+                fallidos=fallidos,
+                al_fallar=al_fallar,
             )
-        except:
-            try: 
-                torneo = soup.find("span", id="LTituloCompeticion").text.strip()
-                print(torneo)
-                competencias["competencias"].append(
-                    {
-                        "id": id,
-                        "url": url,
-                        "torneo":torneo,
-                    }
-                )
-            except:
-                print(url)
-                competencias["competencias"].append(
-                    {
-                        "id": id,
-                        "url": url,
-                    }
-                )
-
-    # Escribir la estructura competencia en un archivo JSON
-with open('gesdeportiva.json', 'w') as json_file:
-    json.dump(competencias, json_file, indent=4)
\ No newline at end of file
+        )
+
+    guardar_indice(indice, args.json, fallidos)
+    # El JSONL solo protege contra cortes a mitad de corrida; ya está volcado en el JSON
+    open(args.jsonl, "w").close()
+    logger.info(
+        f"{len(encontradas)} competencias nuevas; índice con {len(indice)} guardado en {args.json}"
+    )
+    if fallidos:
+        logger.warning(f"{len(fallidos)} IDs fallaron y se reintentarán en la próxima corrida")
+    METRICAS.exportar(args.metricas, f"descubrimiento_{METRICAS.inicio:%Y-%m-%d_%H%M%S}")
+
+
+if __name__ == "__main__":
+    main()
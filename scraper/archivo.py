@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+Archivo de páginas crudas de grupos para re-parsear sin volver a scrapear.
+Cada página de partidos se guarda comprimida con su contexto (temporada,
+categoría, textos de fase y grupo), de modo que un arreglo en los parsers se
+pueda aplicar a temporadas viejas con pipelines/reparsear_archivo.py.
+"""
+
+import gzip
+import json
+import os
+import re
+import threading
+import zlib
+from typing import Dict, Iterator, Optional
+
+from utils.logger import get_logger
+
+logger = get_logger("ArchivoPaginas")
+
+DIRECTORIO_ARCHIVO = os.path.join("Data", "archivo")
+
+# Estado de formularios ASP.NET: cambia en cada visita, pesa la mayor parte de
+# la página comprimida y ningún extractor lo usa
+_ESTADO_ASPNET = re.compile(
+    rb'(<input[^>]*name="__(?:VIEWSTATE|VIEWSTATEGENERATOR|EVENTVALIDATION)"[^>]*value=")[^"]*'
+)
+
+
+def _compactar_html(html: bytes) -> bytes:
+    return _ESTADO_ASPNET.sub(rb"\1", html)
+
+
+class ArchivoPaginas:
+    """
+    Archivo gzip append-only de páginas de grupo.
+
+    Formato (dentro del gzip): por página, una línea JSON con el contexto y la
+    cantidad de bytes, seguida del HTML tal cual (sin el estado ASP.NET):
+        {"url": ..., "anio": ..., "categoria": ..., "fase_text": ..., "grupo_text": ...,
+         "orden": ..., "bytes": N}\\n<N bytes de HTML>\\n
+    Cada escritura es un miembro gzip propio, así que una corrida cortada a la
+    mitad solo pierde la última página. Si una URL aparece varias veces, vale
+    la última.
+    """
+
+    def __init__(self, path: str, agregar: bool = False):
+        """
+        Args:
+            path (str): Archivo .gz del torneo.
+            agregar (bool): Si es True conserva lo archivado antes (modo incremental
+                o --resume); si es False empieza un archivo nuevo.
+        """
+        self.path = path
+        self.paginas = 0
+        self._lock = threading.Lock()
+        directorio = os.path.dirname(path)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        self._archivo = open(path, "ab" if agregar else "wb")
+
+    @classmethod
+    def para_torneo(cls, torneo_info: Dict, agregar: bool = False) -> "ArchivoPaginas":
+        path = os.path.join(DIRECTORIO_ARCHIVO, f"paginas_{torneo_info['id']}.gz")
+        return cls(path, agregar=agregar)
+
+    def guardar(
+        self,
+        url: str,
+        anio: int,
+        categoria: str,
+        fase_text: str,
+        grupo_text: Optional[str],
+        orden: int,
+        html: bytes,
+    ):
+        """Archiva la página de partidos de un grupo (o de una fase sin grupos)."""
+        if isinstance(html, str):
+            html = html.encode("utf-8")
+        html = _compactar_html(html)
+        encabezado = json.dumps(
+            {
+                "url": url,
+                "anio": anio,
+                "categoria": categoria,
+                "fase_text": fase_text,
+                "grupo_text": grupo_text,
+                "orden": orden,
+                "bytes": len(html),
+            },
+            ensure_ascii=False,
+        ).encode("utf-8")
+        # Se comprime fuera del lock; el lock solo ordena las escrituras
+        miembro = gzip.compress(encabezado + b"\n" + html + b"\n", compresslevel=6)
+        with self._lock:
+            self._archivo.write(miembro)
+            self.paginas += 1
+
+    def cerrar(self):
+        with self._lock:
+            self._archivo.close()
+        logger.info(f"{self.paginas} páginas archivadas en {self.path}")
+
+
+def leer_archivo(path: str) -> Iterator[Dict]:
+    """
+    Recorre las páginas de un archivo, sin deduplicar.
+    Cada registro trae el contexto y el HTML en la clave 'html' (bytes).
+    """
+    with gzip.open(path, "rb") as f:
+        try:
+            while True:
+                linea = f.readline()
+                if not linea:
+                    return
+                registro = json.loads(linea)
+                registro["html"] = f.read(registro.pop("bytes"))
+                f.readline()
+                yield registro
+        except (EOFError, zlib.error, gzip.BadGzipFile, json.JSONDecodeError):
+            # Última página a medio escribir: se descarta
+            logger.warning(f"{path} termina con una página incompleta, se descarta")
+
+
+def paginas_vigentes(path: str) -> Iterator[Dict]:
+    """Páginas del archivo quedándose con la última versión de cada URL, en orden de recorrido."""
+    ultimas: Dict[str, Dict] = {}
+    for registro in leer_archivo(path):
+        ultimas[registro["url"]] = registro
+    return iter(sorted(ultimas.values(), key=lambda r: r["orden"]))
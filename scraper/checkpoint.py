@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""
+Checkpoint de scraping para torneos largos.
+Cada grupo terminado se agrega como una línea JSON a un archivo append-only,
+de modo que una corrida interrumpida pueda retomarse sin repetir lo ya hecho.
+Cuando el torneo termina y sus partidos quedan guardados, el checkpoint se
+elimina para que un --resume posterior no sirva partidos viejos.
+"""
+
+import json
+import os
+import threading
+from typing import Dict, List, Optional
+
+from utils.logger import get_logger
+
+logger = get_logger("Checkpoint")
+
+DIRECTORIO_CHECKPOINTS = os.path.join("Data", "cache")
+
+
+class Checkpoint:
+    """
+    Registro durable de unidades de trabajo (grupos) completadas.
+
+    Formato JSONL: una línea {"unidad": <url del grupo>, "partidos": [...]} por grupo,
+    con "huella" (la del modo incremental) si se indicó al registrarlo.
+    Una última línea truncada (proceso cortado a mitad de escritura) se descarta al retomar.
+    """
+
+    def __init__(self, path: str, retomar: bool = False):
+        """
+        Args:
+            path (str): Archivo JSONL del checkpoint.
+            retomar (bool): Si es True carga las unidades ya completadas;
+                si es False empieza un checkpoint vacío.
+        """
+        self.path = path
+        self.completadas: Dict[str, List[Dict]] = {}
+        self.huellas: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+        directorio = os.path.dirname(path)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+
+        if retomar and os.path.exists(path):
+            self._cargar()
+            logger.info(
+                f"Retomando desde {path}: {len(self.completadas)} grupos ya completados"
+            )
+        self._archivo = open(path, "a" if retomar else "w", encoding="utf-8")
+
+    @classmethod
+    def para_torneo(cls, torneo_info: Dict, retomar: bool = False) -> "Checkpoint":
+        path = os.path.join(DIRECTORIO_CHECKPOINTS, f"checkpoint_{torneo_info['id']}.jsonl")
+        return cls(path, retomar=retomar)
+
+    def _cargar(self):
+        validas = []
+        descartadas = 0
+        sin_salto = False
+        with open(self.path, "r", encoding="utf-8") as f:
+            for linea in f:
+                sin_salto = not linea.endswith("\n")
+                try:
+                    registro = json.loads(linea)
+                except json.JSONDecodeError:
+                    descartadas += 1
+                    continue
+                self.completadas[registro["unidad"]] = registro["partidos"]
+                if registro.get("huella") is not None:
+                    self.huellas[registro["unidad"]] = registro["huella"]
+                validas.append(linea.rstrip("\n") + "\n")
+
+        if descartadas or sin_salto:
+            # Reescribir sin las líneas rotas para que los próximos appends queden alineados
+            if descartadas:
+                logger.warning(f"{descartadas} líneas incompletas en {self.path}, se descartan")
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.writelines(validas)
+            os.replace(tmp, self.path)
+
+    def completada(self, unidad: str) -> bool:
+        return unidad in self.completadas
+
+    def partidos(self, unidad: str) -> List[Dict]:
+        return self.completadas[unidad]
+
+    def huella(self, unidad: str) -> Optional[str]:
+        """Huella incremental guardada con la unidad (None si no se registró)."""
+        return self.huellas.get(unidad)
+
+    def registrar(self, unidad: str, partidos: List[Dict], huella: Optional[str] = None):
+        """
+        Agrega un grupo terminado y fuerza la escritura a disco.
+
+        Args:
+            unidad (str): URL del grupo.
+            partidos (List[Dict]): Partidos del grupo.
+            huella (Optional[str]): Huella de sus tablas en el modo incremental, para
+                restaurarla al retomar aunque el estado incremental no llegó a guardarse.
+        """
+        registro = {"unidad": unidad, "partidos": partidos}
+        if huella is not None:
+            registro["huella"] = huella
+        linea = json.dumps(registro, ensure_ascii=False)
+        with self._lock:
+            self._archivo.write(linea + "\n")
+            self._archivo.flush()
+            os.fsync(self._archivo.fileno())
+            self.completadas[unidad] = partidos
+            if huella is not None:
+                self.huellas[unidad] = huella
+
+    def cerrar(self):
+        with self._lock:
+            if not self._archivo.closed:
+                self._archivo.close()
+
+    def eliminar(self):
+        """Cierra y borra el checkpoint (el torneo terminó y sus partidos ya están guardados)."""
+        self.cerrar()
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""
+Extractores de HTML para el scraper de FEBAMBA.
+Sacan de cada página solo lo que el scraper necesita (opciones de los
+selectores y tablas de partidos) como tuplas livianas, con dos backends
+intercambiables: BeautifulSoup (html.parser) y lxml.
+"""
+
+from typing import List, Optional, Tuple
+
+import lxml.html
+from bs4 import BeautifulSoup
+
+# (value, texto) de cada <option>; value puede ser None
+Opcion = Tuple[Optional[str], str]
+# (local, pts_local, pts_visitante, visitante)
+FilaPartido = Tuple[str, str, str, str]
+# (texto del H4 de la jornada, filas de la tabla)
+TablaJornada = Tuple[Optional[str], List[FilaPartido]]
+
+ID_PANEL_PARTIDOS = "ctl00_ContentPlaceHolder1_UpdatePanel1"
+ID_CALENDARIO = "calendario"
+
+
+class ExtractorBS4:
+    """Backend de referencia: BeautifulSoup con html.parser."""
+
+    nombre = "bs4"
+
+    def opciones(self, html, nombre_select: str) -> Optional[List[Opcion]]:
+        """
+        Devuelve las opciones del <select name=nombre_select>, o None si no existe.
+        """
+        soup = BeautifulSoup(html, "html.parser")
+        select = soup.find("select", {"name": nombre_select})
+        if not select:
+            return None
+        return [(option.get("value"), option.text.strip()) for option in select.find_all("option")]
+
+    def tablas_partidos(self, html) -> Optional[List[TablaJornada]]:
+        """
+        Devuelve las tablas de partidos de una página de grupo.
+
+        Returns:
+            None si no existe el panel de partidos; si no, una lista (posiblemente vacía)
+            de (texto de jornada, filas) con las filas de al menos 4 celdas, sin el encabezado.
+        """
+        soup = BeautifulSoup(html, "html.parser")
+        tab_pane = soup.find("div", id=ID_PANEL_PARTIDOS) or soup.find(
+            "div", id=ID_CALENDARIO
+        )
+        if not tab_pane:
+            return None
+
+        tables = tab_pane.find_all("table", class_="tabla") or tab_pane.find_all(
+            "table"
+        )
+        resultado = []
+        for table in tables:
+            jornada_tag = table.find_previous_sibling("h4") or table.find_previous("h4")
+            jornada = jornada_tag.text.strip() if jornada_tag is not None else None
+            filas = []
+            for row in table.find_all("tr")[1:]:
+                cells = row.find_all("td")
+                if len(cells) < 4:
+                    continue
+                filas.append(tuple(c.text.strip() for c in cells[:4]))
+            resultado.append((jornada, filas))
+        return resultado
+
+
+class ExtractorLxml:
+    """Backend rápido en C (libxml2) con la misma salida que ExtractorBS4."""
+
+    nombre = "lxml"
+
+    _XPATH_TABLAS_CLASE = (
+        ".//table[contains(concat(' ', normalize-space(@class), ' '), ' tabla ')]"
+    )
+
+    @staticmethod
+    def _documento(html):
+        # Se decodifica antes de parsear para tratar el texto igual que BeautifulSoup
+        if isinstance(html, bytes):
+            try:
+                html = html.decode("utf-8")
+            except UnicodeDecodeError:
+                html = html.decode("windows-1252", errors="replace")
+        return lxml.html.document_fromstring(html)
+
+    def opciones(self, html, nombre_select: str) -> Optional[List[Opcion]]:
+        doc = self._documento(html)
+        selects = doc.xpath("//select[@name=$nombre]", nombre=nombre_select)
+        if not selects:
+            return None
+        return [
+            (option.get("value"), option.text_content().strip())
+            for option in selects[0].iter("option")
+        ]
+
+    def tablas_partidos(self, html) -> Optional[List[TablaJornada]]:
+        doc = self._documento(html)
+        paneles = doc.xpath("//div[@id=$id]", id=ID_PANEL_PARTIDOS) or doc.xpath(
+            "//div[@id=$id]", id=ID_CALENDARIO
+        )
+        if not paneles:
+            return None
+
+        tab_pane = paneles[0]
+        tables = tab_pane.xpath(self._XPATH_TABLAS_CLASE) or tab_pane.xpath(".//table")
+        resultado = []
+        for table in tables:
+            jornada_tags = table.xpath("preceding-sibling::h4[1]") or table.xpath(
+                "preceding::h4[1]"
+            )
+            jornada = jornada_tags[0].text_content().strip() if jornada_tags else None
+            filas = []
+            for row in table.xpath(".//tr")[1:]:
+                cells = row.xpath(".//td")
+                if len(cells) < 4:
+                    continue
+                filas.append(tuple(c.text_content().strip() for c in cells[:4]))
+            resultado.append((jornada, filas))
+        return resultado
+
+
+EXTRACTORES = {
+    ExtractorBS4.nombre: ExtractorBS4,
+    ExtractorLxml.nombre: ExtractorLxml,
+}
+
+
+def obtener_extractor(nombre: str = "lxml"):
+    """
+    Devuelve una instancia del extractor pedido ('lxml' o 'bs4').
+    """
+    try:
+        return EXTRACTORES[nombre]()
+    except KeyError:
+        raise ValueError(
+            f"Extractor no soportado: {nombre}. Usar uno de {sorted(EXTRACTORES)}."
+        )
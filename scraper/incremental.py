@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+Estado del modo incremental del scraper.
+Guarda una huella de las tablas de partidos de cada grupo para volver a
+parsear solo los grupos cuyas jornadas cambiaron desde la corrida anterior.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, Optional
+
+from utils.logger import get_logger
+
+logger = get_logger("Incremental")
+
+DIRECTORIO_ESTADO = os.path.join("Data", "cache")
+
+
+def huella_tablas(tablas) -> str:
+    """
+    Calcula la huella de las tablas de partidos de un grupo, tal como las
+    devuelve el extractor: texto de cada jornada y celdas de cada fila.
+    No se usa el HTML crudo para no depender del __VIEWSTATE ni de otros
+    campos que cambian en cada visita.
+    """
+    h = hashlib.sha1()
+    for jornada_text, filas in tablas:
+        h.update((jornada_text or "").encode("utf-8"))
+        for fila in filas:
+            h.update(b"\x1e")
+            h.update("\x1f".join(fila).encode("utf-8"))
+        h.update(b"\x1d")
+    return h.hexdigest()
+
+
+class EstadoIncremental:
+    """Huellas por URL de grupo, persistidas en JSON entre corridas."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.huellas: Dict[str, str] = {}
+        self.cambiados = 0
+        self.sin_cambios = 0
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.huellas = json.load(f)
+
+    @classmethod
+    def para_torneo(cls, torneo_info: Dict) -> "EstadoIncremental":
+        return cls(os.path.join(DIRECTORIO_ESTADO, f"incremental_{torneo_info['id']}.json"))
+
+    def cambio(self, url_grupo: str, tables) -> bool:
+        """Devuelve True si las tablas del grupo difieren de la última corrida y registra la nueva huella."""
+        huella = huella_tablas(tables)
+        with self._lock:
+            if self.huellas.get(url_grupo) == huella:
+                self.sin_cambios += 1
+                return False
+            self.huellas[url_grupo] = huella
+            self.cambiados += 1
+            return True
+
+    def restaurar(self, url_grupo: str, huella: Optional[str]):
+        """
+        Registra la huella de un grupo retomado de un checkpoint: se parseó en la
+        corrida cortada, cuyo estado incremental no llegó a guardarse.
+        """
+        if huella is None:
+            return
+        with self._lock:
+            self.huellas[url_grupo] = huella
+
+    def guardar(self):
+        directorio = os.path.dirname(self.path)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.huellas, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.path)
+        logger.info(
+            f"Estado incremental guardado: {self.cambiados} grupos con cambios, "
+            f"{self.sin_cambios} sin cambios"
+        )
@@ -4,31 +4,182 @@ Scraper principal del ETL de FEBAMBA.
 Extrae partidos de torneos formativos.
 """
 
-import time
-from bs4 import BeautifulSoup
-from typing import List, Dict
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Tuple
 
 from mapeos.loader import (
     cargar_mapeo_categorias,
     cargar_mapeo_equipos,
+    mapear_categoria,
     normalizar_equipo,
 )
-from parsers.fases import parsear_fase
-from parsers.grupos import parsear_grupo
-from parsers.jornadas import parsear_jornada
+from parsers.estructura import resolver_estructura
+from parsers.memo import PARSEAR_FASE, PARSEAR_GRUPO, PARSEAR_JORNADA
 from parsers.rondas import inferir_ronda
+from scraper.archivo import ArchivoPaginas
+from scraper.checkpoint import Checkpoint
+from scraper.extractores import obtener_extractor
+from scraper.incremental import EstadoIncremental
 from utils.logger import get_logger
-from utils.requester import hacer_solicitud
+from utils.perfilado import Perfilador
+from utils.requester import configurar_limitador, hacer_solicitud
 
 logger = get_logger("FebambaScraper")
 
 
+def _opciones_validas(opciones) -> List[Tuple[str, str]]:
+    """Filtra las opciones (value, texto) de un <select>, quitando el placeholder."""
+    return [
+        (valor, texto)
+        for valor, texto in opciones
+        if valor and valor != "0" and "Seleccionar" not in texto
+    ]
+
+
+def extraer_partidos(
+    tables,
+    year,
+    cat_mapa,
+    fase_info,
+    grupo_info,
+    equipos_map,
+    parsear_jornada=PARSEAR_JORNADA,
+    inferir=inferir_ronda,
+    normalizar=normalizar_equipo,
+) -> List[Dict]:
+    """
+    Arma los partidos jugados de las tablas (jornada, filas) de un grupo.
+    Es la parte del parseo que no depende del scraper: la usan FebambaScraper
+    y el re-parseo offline (parsear_pagina_grupo).
+    """
+    partidos = []
+
+    for jornada_text, filas in tables:
+        ronda, jornada, fecha = parsear_jornada(jornada_text)
+
+        for local_raw, pts_local_raw, pts_visitante_raw, visitante_raw in filas:
+            # Si los puntos están vacíos, el partido no se jugó; lo omitimos
+            if not pts_local_raw or not pts_visitante_raw:
+                continue
+
+            estructura = resolver_estructura(
+                year,
+                cat_mapa,
+                fase_info,
+                grupo_info,
+                ronda,
+                jornada,
+                local_raw,
+                visitante_raw,
+                equipos_map,
+                inferir=inferir,
+            )
+
+            partido = {
+                "anio": year,
+                "categoria": cat_mapa,
+                "fase": fase_info.get("fase"),
+                "ronda": estructura["ronda"],
+                "nivel": estructura["nivel"],
+                "zona": estructura["zona"],
+                "grupo": estructura["grupo"],
+                "jornada": jornada,
+                "fecha": fecha,
+                "local": normalizar(local_raw, equipos_map),
+                "ptsL": pts_local_raw,
+                "visitante": normalizar(visitante_raw, equipos_map),
+                "ptsV": pts_visitante_raw,
+            }
+
+            if partido["fase"]== "Playoff" and (partido["categoria"] == "MINI" or partido["categoria"] == "PREMINI"):
+                continue
+            else:
+                partidos.append(partido)
+
+    return partidos
+
+
+def parsear_pagina_grupo(
+    html, url_grupo, year, cat_mapa, fase_text, grupo_text=None, extractor=None, equipos_map=None
+) -> List[Dict]:
+    """
+    Parsea una página de partidos ya descargada (p. ej. del archivo de páginas)
+    a partir de los textos originales de fase y grupo. No arma un FebambaScraper,
+    así que no toca la red ni el limitador global del requester.
+
+    Args:
+        extractor: Instancia de scraper/extractores.py (default lxml).
+        equipos_map (dict): Mapa de equipos (default el de mapeos/).
+    """
+    extractor = extractor if extractor is not None else obtener_extractor()
+    equipos_map = equipos_map if equipos_map is not None else cargar_mapeo_equipos()
+    tables = extractor.tablas_partidos(html)
+    if not tables:
+        logger.warning(f"No se encontraron tablas de partidos en {url_grupo}")
+        return []
+    fase_info = PARSEAR_FASE(year, fase_text)
+    grupo_info = PARSEAR_GRUPO(year, fase_text, grupo_text) if grupo_text is not None else None
+    return extraer_partidos(tables, year, cat_mapa, fase_info, grupo_info, equipos_map)
+
+
 class FebambaScraper:
-    def __init__(self, base_url: str):
+    def __init__(
+        self,
+        base_url: str,
+        max_workers: int = 1,
+        solicitudes_por_segundo: float = 4.0,
+        max_solicitudes_por_segundo: Optional[float] = None,
+        estado_incremental: Optional[EstadoIncremental] = None,
+        checkpoint: Optional[Checkpoint] = None,
+        extractor: str = "lxml",
+        perfilador: Optional[Perfilador] = None,
+        archivo: Optional[ArchivoPaginas] = None,
+    ):
+        """
+        Args:
+            base_url (str): URL base del sitio de competiciones.
+            max_workers (int): Hilos de descarga. Con 1 se recorre en serie (modo original).
+            solicitudes_por_segundo (float): Ritmo inicial del limitador global del requester.
+            max_solicitudes_por_segundo (Optional[float]): Techo al que el limitador puede
+                acelerar mientras el servidor responda bien (default 4x el inicial).
+            estado_incremental (EstadoIncremental): Si se indica, solo se parsean los grupos
+                cuyas tablas de partidos cambiaron desde la corrida anterior.
+            checkpoint (Checkpoint): Si se indica, cada grupo terminado se guarda en disco
+                y los grupos ya registrados no se vuelven a descargar.
+            extractor (str): Backend de extracción de HTML ('lxml' o 'bs4'), ver scraper/extractores.py.
+            perfilador (Perfilador): Si se indica, mide el tiempo de cada etapa
+                (descarga, extracción, parsers, inferencia, normalización) por temporada y categoría.
+            archivo (ArchivoPaginas): Si se indica, cada página de partidos descargada se
+                archiva cruda con su contexto para poder re-parsearla sin red.
+        """
         self.base_url = base_url
         self.categorias_map = cargar_mapeo_categorias()
         self.equipos_map = cargar_mapeo_equipos()
         self.partidos_acumulados = []
+        self.max_workers = max(1, max_workers)
+        self.estado_incremental = estado_incremental
+        self.checkpoint = checkpoint
+        self.extractor = obtener_extractor(extractor)
+        self.perfilador = perfilador
+        self.archivo = archivo
+        self._orden_grupos = itertools.count()
+
+        # Sin perfilador se usan las funciones originales, sin costo extra
+        etapa = perfilador.envolver if perfilador is not None else (lambda _, f: f)
+        self._hacer_solicitud = etapa("fetch", hacer_solicitud)
+        # Los parsers de texto pasan por la memoización de parsers/memo.py
+        self._parsear_fase = etapa("parsear_fase", PARSEAR_FASE)
+        self._parsear_grupo = etapa("parsear_grupo", PARSEAR_GRUPO)
+        self._parsear_jornada = etapa("parsear_jornada", PARSEAR_JORNADA)
+        self._inferir_ronda = etapa("inferir_ronda", inferir_ronda)
+        self._normalizar_equipo = etapa("normalizar_equipo", normalizar_equipo)
+        self.extractor.opciones = etapa("extraer_html", self.extractor.opciones)
+        self.extractor.tablas_partidos = etapa("extraer_html", self.extractor.tablas_partidos)
+        # El ritmo lo fija el limitador adaptativo, tanto en serie como en concurrente
+        configurar_limitador(
+            solicitudes_por_segundo, maximo=max_solicitudes_por_segundo
+        )
 
     def scrap_torneo(self, torneo_info: Dict) -> List[Dict]:
         """Scrapea todo un torneo: categorías, fases, grupos y partidos."""
@@ -39,39 +190,38 @@ class FebambaScraper:
         logger.info(
             f"\n--- Iniciando scraping para Torneo: {torneo_info['torneo']} ({year}) ---"
         )
-        html = hacer_solicitud(url_inicial)
+        self._contexto(year, "(torneo)")
+        # Si los mapas cambiaron en disco desde la última vez, se toman los nuevos
+        self.categorias_map = cargar_mapeo_categorias()
+        self.equipos_map = cargar_mapeo_equipos()
+        html = self._hacer_solicitud(url_inicial)
         if not html:
             logger.error(f"No se pudo obtener página inicial {url_inicial}")
             return []
 
-        soup = BeautifulSoup(html, "html.parser")
-        categorias_select = soup.find("select", {"name": "DDLCategorias"})
-        if not categorias_select:
+        categorias_select = self.extractor.opciones(html, "DDLCategorias")
+        if categorias_select is None:
             logger.warning(f"No se encontró selector de categorías en {url_inicial}")
             return []
 
-        for option in categorias_select.find_all("option"):
-            cat_web = option.text.strip()
-            cat_id = option.get("value")
-            if not cat_id or cat_id == "0" or "Seleccionar" in cat_web:
-                continue
-
+        categorias = []
+        for cat_id, cat_web in _opciones_validas(categorias_select):
             if cat_web.lower() == "mosquitos":
                 logger.info("Saltando categoría: Mosquitos")
                 continue
 
-            # Buscar ignorando mayúsculas/minúsculas
-            cat_mapa = self.categorias_map.get(cat_web, None)
-            if cat_mapa is None:
-                # Intentar buscar por lower-case
-                cat_mapa = next(
-                    (
-                        v
-                        for k, v in self.categorias_map.items()
-                        if k.lower() == cat_web.lower()
-                    ),
-                    cat_web,
-                )
+            # Exacto y, si no, ignorando mayúsculas/minúsculas
+            cat_mapa = mapear_categoria(cat_web, cat_web)
+            categorias.append((cat_web, cat_mapa, cat_id))
+
+        if self.max_workers > 1:
+            partidos = self._scrap_torneo_concurrente(year, url_inicial, categorias)
+            self.partidos_acumulados.extend(partidos)
+            logger.info(f"Partidos acumulados: {len(self.partidos_acumulados)}")
+            return self.partidos_acumulados
+
+        for cat_web, cat_mapa, cat_id in categorias:
+            self._contexto(year, cat_mapa)
             logger.info(
                 f"Procesando Categoría: {cat_web} ➔ Mapeada como {cat_mapa}, ID: {cat_id}"
             )
@@ -82,40 +232,112 @@ class FebambaScraper:
             self.partidos_acumulados.extend(partidos_categoria)
 
             logger.info(f"Partidos acumulados: {len(self.partidos_acumulados)}")
-            time.sleep(2)
 
         return self.partidos_acumulados
 
-    def _scrap_fases_categoria(self, year, cat_mapa, url_torneo, cat_id) -> List[Dict]:
-        """Scrapea todas las fases de una categoría."""
-        url_fases = f"{url_torneo}&categoria={cat_id}"
-        html = hacer_solicitud(url_fases)
+    def _contexto(self, year, cat_mapa):
+        """Imputa las mediciones siguientes de este hilo a la temporada y categoría dadas."""
+        if self.perfilador is not None:
+            self.perfilador.contexto(year, cat_mapa)
+
+    def _descargar(self, url, year, cat_mapa):
+        self._contexto(year, cat_mapa)
+        return self._hacer_solicitud(url)
+
+    def _scrap_torneo_concurrente(self, year, url_torneo, categorias) -> List[Dict]:
+        """
+        Recorre el árbol categoría → fase → grupo como una cola de trabajo por nivel,
+        repartida entre un pool de hilos. El ritmo lo fija el limitador global del
+        requester, compartido con el modo serie.
+
+        Las páginas se descargan en paralelo pero los resultados se recombinan en el
+        orden de los selectores, así que los partidos salen en el mismo orden que en serie.
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            # Nivel 1: página de fases de cada categoría
+            urls_fases = [f"{url_torneo}&categoria={cat_id}" for _, _, cat_id in categorias]
+            unidades_fase = []
+            htmls = pool.map(
+                lambda args: self._descargar(*args),
+                [(url, year, cat_mapa) for (_, cat_mapa, _), url in zip(categorias, urls_fases)],
+            )
+            for (cat_web, cat_mapa, cat_id), url_fases, html in zip(
+                categorias, urls_fases, htmls
+            ):
+                self._contexto(year, cat_mapa)
+                logger.info(
+                    f"Procesando Categoría: {cat_web} ➔ Mapeada como {cat_mapa}, ID: {cat_id}"
+                )
+                for fase_id, fase_text in self._opciones_fase(html, url_fases):
+                    unidades_fase.append(
+                        (cat_mapa, f"{url_fases}&fase={fase_id}", fase_text)
+                    )
+
+            # Nivel 2: página de grupos de cada fase
+            htmls = pool.map(
+                lambda args: self._descargar(*args),
+                [(url, year, cat_mapa) for cat_mapa, url, _ in unidades_fase],
+            )
+            unidades_grupo = []
+            for (cat_mapa, url_grupos, fase_text), html in zip(unidades_fase, htmls):
+                if not html:
+                    continue
+                self._contexto(year, cat_mapa)
+                fase_info = self._parsear_fase(year, fase_text)
+                grupos_select = self.extractor.opciones(html, "DDLGrupos")
+                if grupos_select is None:
+                    # Sin grupos: la propia página de la fase tiene los partidos
+                    unidades_grupo.append(
+                        (url_grupos, cat_mapa, fase_info, None, html, (fase_text, None),
+                         next(self._orden_grupos))
+                    )
+                    continue
+                for grupo_id, grupo_text in _opciones_validas(grupos_select):
+                    grupo_info = self._parsear_grupo(year, fase_text, grupo_text)
+                    url_grupo = f"{url_grupos}&grupo={grupo_id}"
+                    unidades_grupo.append(
+                        (url_grupo, cat_mapa, fase_info, grupo_info, None, (fase_text, grupo_text),
+                         next(self._orden_grupos))
+                    )
+
+            # Nivel 3: partidos de cada grupo
+            def procesar(unidad):
+                url_grupo, cat_mapa, fase_info, grupo_info, html, textos, orden = unidad
+                self._contexto(year, cat_mapa)
+                return self._scrap_partidos_grupo(
+                    url_grupo, year, cat_mapa, fase_info, grupo_info, html, textos, orden
+                )
+
+            partidos = []
+            for partidos_grupo in pool.map(procesar, unidades_grupo):
+                partidos.extend(partidos_grupo)
+
+        return partidos
+
+    def _opciones_fase(self, html, url_fases) -> List[Tuple[str, str]]:
+        """Devuelve las opciones (id, texto) válidas de DDLFases de una página de categoría."""
         if not html:
             return []
-
-        soup = BeautifulSoup(html, "html.parser")
-        fases_select = soup.find("select", {"name": "DDLFases"})
-        if not fases_select:
+        fases_select = self.extractor.opciones(html, "DDLFases")
+        if fases_select is None:
             logger.error(f"No se encontró DDLFases en {url_fases}")
             return []
+        return _opciones_validas(fases_select)
 
-        partidos_categoria = []
-
-        for option in fases_select.find_all("option"):
-            fase_id = option.get("value")
-            fase_text = option.text.strip()
+    def _scrap_fases_categoria(self, year, cat_mapa, url_torneo, cat_id) -> List[Dict]:
+        """Scrapea todas las fases de una categoría."""
+        url_fases = f"{url_torneo}&categoria={cat_id}"
+        html = self._hacer_solicitud(url_fases)
 
-            if not fase_id or fase_id == "0" or "Seleccionar" in fase_text:
-                continue
+        partidos_categoria = []
 
-            fase_info = parsear_fase(year, fase_text)
+        for fase_id, fase_text in self._opciones_fase(html, url_fases):
+            fase_info = self._parsear_fase(year, fase_text)
             partidos_fase = self._scrap_grupos_fase(
                 year, cat_mapa, url_fases, fase_info, fase_id, fase_text
             )
             partidos_categoria.extend(partidos_fase)
 
-            time.sleep(1)
-
         return partidos_categoria
 
     def _scrap_grupos_fase(
@@ -123,160 +345,102 @@ class FebambaScraper:
     ) -> List[Dict]:
         """Scrapea todos los grupos de una fase."""
         url_grupos = f"{url_fase}&fase={fase_id}"
-        html = hacer_solicitud(url_grupos)
+        html = self._hacer_solicitud(url_grupos)
         if not html:
             return []
 
-        soup = BeautifulSoup(html, "html.parser")
-        grupos_select = soup.find("select", {"name": "DDLGrupos"})
+        grupos_select = self.extractor.opciones(html, "DDLGrupos")
 
         partidos_fase = []
 
-        if not grupos_select:
+        if grupos_select is None:
             # Si no hay grupos, scrapeamos directamente
             partidos_grupo = self._scrap_partidos_grupo(
-                url_grupos, year, cat_mapa, fase_info, None
+                url_grupos, year, cat_mapa, fase_info, None, textos=(fase_text, None)
             )
             partidos_fase.extend(partidos_grupo)
         else:
-            for option in grupos_select.find_all("option"):
-                grupo_id = option.get("value")
-                grupo_text = option.text.strip()
-
-                if not grupo_id or grupo_id == "0" or "Seleccionar" in grupo_text:
-                    continue
-
-                grupo_info = parsear_grupo(year, fase_text, grupo_text)
+            for grupo_id, grupo_text in _opciones_validas(grupos_select):
+                grupo_info = self._parsear_grupo(year, fase_text, grupo_text)
                 url_grupo = f"{url_grupos}&grupo={grupo_id}"
 
                 partidos_grupo = self._scrap_partidos_grupo(
-                    url_grupo, year, cat_mapa, fase_info, grupo_info
+                    url_grupo, year, cat_mapa, fase_info, grupo_info, textos=(fase_text, grupo_text)
                 )
                 partidos_fase.extend(partidos_grupo)
 
-                time.sleep(0.5)
-
         return partidos_fase
 
     def _scrap_partidos_grupo(
-        self, url_grupo, year, cat_mapa, fase_info, grupo_info
+        self,
+        url_grupo,
+        year,
+        cat_mapa,
+        fase_info,
+        grupo_info,
+        html=None,
+        textos=(None, None),
+        orden=None,
     ) -> List[Dict]:
-        """Scrapea partidos de un grupo específico."""
-        html = hacer_solicitud(url_grupo)
+        """
+        Scrapea partidos de un grupo específico.
+        Si ya se descargó la página (fase sin grupos) se puede pasar su `html`.
+        `textos` (fase, grupo originales) y `orden` (posición en el recorrido)
+        solo se usan para el archivo de páginas.
+        """
+        if orden is None:
+            orden = next(self._orden_grupos)
+        if self.checkpoint is not None and self.checkpoint.completada(url_grupo):
+            if self.estado_incremental is not None:
+                self.estado_incremental.restaurar(url_grupo, self.checkpoint.huella(url_grupo))
+            return self.checkpoint.partidos(url_grupo)
+
+        if html is None:
+            html = self._hacer_solicitud(url_grupo)
         if not html:
             return []
+        if self.archivo is not None:
+            self.archivo.guardar(url_grupo, year, cat_mapa, *textos, orden, html)
 
-        soup = BeautifulSoup(html, "html.parser")
-        tab_pane = soup.find(
-            "div", id="ctl00_ContentPlaceHolder1_UpdatePanel1"
-        ) or soup.find("div", id="calendario")
+        partidos = self._parsear_partidos_grupo(
+            html, url_grupo, year, cat_mapa, fase_info, grupo_info
+        )
+        if self.checkpoint is not None:
+            huella = (
+                self.estado_incremental.huellas.get(url_grupo)
+                if self.estado_incremental is not None
+                else None
+            )
+            self.checkpoint.registrar(url_grupo, partidos, huella)
+        return partidos
 
-        if not tab_pane:
+    def _parsear_partidos_grupo(
+        self, html, url_grupo, year, cat_mapa, fase_info, grupo_info
+    ) -> List[Dict]:
+        """Extrae los partidos jugados del HTML de un grupo."""
+        tables = self.extractor.tablas_partidos(html)
+        if tables is None:
             logger.warning(f"No se encontró div de partidos en {url_grupo}")
             return []
 
-        tables = tab_pane.find_all("table", class_="tabla") or tab_pane.find_all(
-            "table"
-        )
         if not tables:
             logger.warning(f"No se encontraron tablas de partidos en {url_grupo}")
             return []
 
-        partidos = []
-
-        for table in tables:
-            jornada_tag = table.find_previous_sibling("h4") or table.find_previous("h4")
-            ronda, jornada, fecha = parsear_jornada(jornada_tag.text.strip())
-
-            for row in table.find_all("tr")[1:]:
-                cells = row.find_all("td")
-                if len(cells) < 4:
-                    continue
-
-                local_raw, pts_local_raw, pts_visitante_raw, visitante_raw = [
-                    c.text.strip() for c in cells[:4]
-                ]
-
-                # Si los puntos están vacíos, el partido no se jugó; lo omitimos
-                if not pts_local_raw or not pts_visitante_raw:
-                    continue
-
-                ronda_inferida = inferir_ronda(
-                    year,
-                    cat_mapa,
-                    (
-                        fase_info.get("nivel", "Desconocido")
-                        if fase_info.get("nivel") != "Desconocido"
-                        else grupo_info.get("nivel", "Desconocido")
-                    ),
-                    fase_info.get("zona", ""),
-                    jornada,
-                    fase_info.get("fase", ""),
-                    local_raw,
-                    visitante_raw,
-                    self.equipos_map,
-                )
-
-                # Adaptar para usar el dict completo retornado por inferir_ronda
-                ronda_val = None
-                llave_val = None
-                nivel_val = None
-                if isinstance(ronda_inferida, dict):
-                    ronda_val = ronda_inferida.get("ronda") if ronda == '' else ronda
-                    llave_val = ronda_inferida.get("llave")
-                    nivel_val = ronda_inferida.get("nivel")
-                else:
-                    ronda_val = ronda_inferida if ronda == '' else ronda
-                    llave_val = None
-                    nivel_val = None
-
-                fase_actual = fase_info.get("fase", "").upper()
-
-                partido = {
-                    "anio": year,
-                    "categoria": cat_mapa,
-                    "fase": fase_info.get("fase"),
-                    "ronda": (
-                        fase_info["ronda"]
-                        if fase_info.get("ronda") != "Desconocida"
-                        else (
-                            ronda_val
-                            if ronda_val is not None and ronda_val != "Desconocida"
-                            else ronda
-                        )
-                    ),
-                    "nivel": (
-                        nivel_val
-                        if nivel_val is not None and nivel_val != "Desconocido"
-                        else (
-                            fase_info["nivel"]
-                            if fase_info["nivel"] != "Desconocido"
-                            else grupo_info.get("nivel", "Desconocido")
-                        )
-                    ),
-                    "zona": (
-                        fase_info["zona"]
-                        if fase_info["zona"] != "Desconocida"
-                        else grupo_info.get("zona", "Desconocida")
-                    ),
-                    "grupo": (
-                        llave_val if fase_actual in ["PLAYOFF", "FINAL FOUR"] and llave_val
-                        else (
-                            fase_info["grupo"] if fase_info.get("grupo") not in [None, "Desconocido"]
-                            else grupo_info.get("grupo", "Desconocido")
-                        )
-                    ),
-                    "jornada": jornada,
-                    "fecha": fecha,
-                    "local": normalizar_equipo(local_raw, self.equipos_map),
-                    "ptsL": pts_local_raw,
-                    "visitante": normalizar_equipo(visitante_raw, self.equipos_map),
-                    "ptsV": pts_visitante_raw,
-                }
-
-                if partido["fase"]== "Playoff" and (partido["categoria"] == "MINI" or partido["categoria"] == "PREMINI"):
-                    continue
-                else:
-                    partidos.append(partido)
+        if self.estado_incremental is not None and not self.estado_incremental.cambio(
+            url_grupo, tables
+        ):
+            logger.debug(f"Sin cambios en {url_grupo}, se conservan los partidos guardados")
+            return []
 
-        return partidos
+        return extraer_partidos(
+            tables,
+            year,
+            cat_mapa,
+            fase_info,
+            grupo_info,
+            self.equipos_map,
+            parsear_jornada=self._parsear_jornada,
+            inferir=self._inferir_ronda,
+            normalizar=self._normalizar_equipo,
+        )
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark de los backends de extracción HTML sobre las páginas guardadas en tests/fixtures.
+
+Uso:
+    python tests/bench_extractores.py [repeticiones]
+"""
+
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from scraper.extractores import EXTRACTORES
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+
+def medir(extractor, paginas, repeticiones):
+    def recorrer():
+        for nombre, html in paginas:
+            if nombre.startswith("grupo"):
+                extractor.tablas_partidos(html)
+            else:
+                for select in ("DDLCategorias", "DDLFases", "DDLGrupos"):
+                    extractor.opciones(html, select)
+
+    return min(timeit.repeat(recorrer, number=repeticiones, repeat=3)) / repeticiones
+
+
+def main():
+    repeticiones = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    paginas = [(p.name, p.read_bytes()) for p in sorted(FIXTURES.glob("*.html"))]
+
+    tiempos = {}
+    for nombre, clase in EXTRACTORES.items():
+        tiempos[nombre] = medir(clase(), paginas, repeticiones)
+        print(f"{nombre:>5}: {tiempos[nombre] * 1000:8.2f} ms por pasada ({len(paginas)} páginas)")
+
+    print(f"lxml es {tiempos['bs4'] / tiempos['lxml']:.1f}x más rápido que bs4")
+
+
+if __name__ == "__main__":
+    main()
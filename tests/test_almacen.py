@@ -0,0 +1,79 @@
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# Add the parent directory to sys.path to resolve the ModuleNotFoundError
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from utils.almacen import cargar_partidos, guardar_partidos
+
+COLUMNAS = ["anio", "categoria", "fase", "zona", "grupo", "jornada", "fecha", "local", "ptsL", "visitante", "ptsV"]
+PARTIDOS = [
+    (2019, "JUVENILES", "Fase Regular", "NORTE", "A", 1, "23/11/2019", "PINOCHO", 76, "VICTORIA", 64),
+    (2019, "CADETES", "Fase Regular", "SUR", "B", 2, None, "EL TALAR", 50, "PINOCHO", 51),
+    (2025, "CADETES", "1ER ETAPA", "NORTE", 4, 3, "9/3/2025", "VICTORIA", 20, "EL TALAR", 0),
+]
+
+
+def _partidos(filas=PARTIDOS):
+    return pd.DataFrame(filas, columns=COLUMNAS)
+
+
+def test_esquema_y_filtros(tmp_path):
+    ruta = str(tmp_path / "partidos")
+    guardar_partidos(_partidos(), ruta)
+
+    df = cargar_partidos(ruta=ruta)
+    assert list(df.columns[:2]) == ["anio", "categoria"]
+    assert str(df["anio"].dtype) == "int16"
+    assert str(df["ptsL"].dtype) == "Int16"
+    assert isinstance(df["local"].dtype, pd.CategoricalDtype)
+    assert df["fecha"].dropna().dt.year.tolist() == [2019, 2025]
+
+    cadetes_2019 = cargar_partidos(anios=2019, categorias="CADETES", ruta=ruta)
+    assert cadetes_2019["local"].tolist() == ["EL TALAR"]
+    norte = cargar_partidos(filtros=[("zona", "==", "NORTE")], categoricas=False, ruta=ruta)
+    assert sorted(norte["grupo"]) == ["4", "A"]
+    assert norte["grupo"].dtype == object
+
+
+def test_guardar_reemplaza_solo_las_temporadas_presentes(tmp_path):
+    ruta = str(tmp_path / "partidos")
+    guardar_partidos(_partidos(), ruta)
+    # Como lo escribe el modo incremental: todo texto, con una fila vacía
+    nueva = _partidos([PARTIDOS[2], (None,) * len(COLUMNAS)]).astype(str).replace("None", "")
+    nueva.loc[0, "ptsL"] = "22"
+    guardar_partidos(nueva, ruta)
+
+    df = cargar_partidos(ruta=ruta)
+    assert len(df) == 3
+    assert df.loc[df["anio"] == 2025, "ptsL"].tolist() == [22]
+
+
+def test_sin_almacen_lee_los_csv_por_temporada(tmp_path):
+    data = tmp_path / "Data"
+    data.mkdir()
+    (data / "partidos_2024.csv").write_text(
+        "anio;categoria;zona;jornada;local;ptsL;visitante;ptsV\n"
+        "2024;JUVENILES;NORTE;1;A.F.A.L.P.;70;PINOCHO;60\n"
+        "2024;CADETES;SUR;2;PINOCHO;;VICTORIA;\n",
+        encoding="utf-8",
+    )
+    (data / "2025-10-01.csv").write_text("anio,local\n2025,X\n", encoding="utf-8-sig")
+    ruta = str(data / "almacen" / "partidos")
+
+    df = cargar_partidos(ruta=ruta)
+    assert len(df) == 2
+    assert str(df["ptsL"].dtype) == "Int16" and df["ptsL"].isna().sum() == 1
+    # Mismos nombres normalizados que guarda corregir_nombres_postscrap.py
+    assert df["local"].tolist()[0] == "A.F.A.L.P. A"
+    sur = cargar_partidos(anios=[2024], filtros=[("zona", "==", "SUR")], columnas=["local"], ruta=ruta)
+    assert sur["local"].tolist() == ["PINOCHO"]
+    assert cargar_partidos(anios=2019, ruta=ruta).empty
+
+
+def test_sin_almacen_ni_csv(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        cargar_partidos(ruta=str(tmp_path / "Data" / "almacen" / "partidos"))
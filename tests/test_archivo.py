@@ -0,0 +1,67 @@
+import sys
+from pathlib import Path
+
+# Add the parent directory to sys.path to resolve the ModuleNotFoundError
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+import pandas as pd
+
+from parsers.fases import parsear_fase
+from parsers.grupos import parsear_grupo
+from pipelines.reparsear_archivo import motivo_para_no_sobrescribir, reparsear
+from scraper.archivo import ArchivoPaginas, leer_archivo, paginas_vigentes
+from scraper.main import FebambaScraper, parsear_pagina_grupo
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+CONTEXTO = (2019, "JUVENILES", "CONFERENCIA SUR 2 2DA FASE", "ZONA SUR A 2")
+
+
+def _archivar(path, paginas):
+    archivo = ArchivoPaginas(str(path))
+    for url, orden, html in paginas:
+        archivo.guardar(url, *CONTEXTO, orden, html)
+    archivo.cerrar()
+
+
+def test_ultima_version_de_cada_url_en_orden(tmp_path):
+    path = tmp_path / "paginas.gz"
+    _archivar(path, [("b", 1, b"<p>b1</p>"), ("a", 0, b"<p>a</p>"), ("b", 1, b"<p>b2</p>")])
+    vigentes = list(paginas_vigentes(str(path)))
+    assert [(p["url"], p["html"]) for p in vigentes] == [("a", b"<p>a</p>"), ("b", b"<p>b2</p>")]
+    assert vigentes[0]["grupo_text"] == CONTEXTO[3]
+
+
+def test_pagina_incompleta_se_descarta(tmp_path):
+    path = tmp_path / "paginas.gz"
+    _archivar(path, [("a", 0, b"<p>a</p>"), ("b", 1, b"<p>b</p>" * 100)])
+    path.write_bytes(path.read_bytes()[:-20])
+    assert [p["url"] for p in leer_archivo(str(path))] == ["a"]
+
+
+def test_reparseo_igual_al_parseo_directo(tmp_path):
+    html = (FIXTURES / "grupo.html").read_bytes()
+    path = tmp_path / "paginas.gz"
+    _archivar(path, [("grupo", 0, html)])
+    year, categoria, fase_text, grupo_text = CONTEXTO
+    # Lo que arma el scraper al descargar la página
+    directo = FebambaScraper(base_url="")._scrap_partidos_grupo(
+        "grupo",
+        year,
+        categoria,
+        parsear_fase(year, fase_text),
+        parsear_grupo(year, fase_text, grupo_text),
+        html=html,
+    )
+    assert directo
+    assert parsear_pagina_grupo(html, "grupo", *CONTEXTO) == directo
+    assert reparsear(list(paginas_vigentes(str(path)))) == directo
+
+
+def test_no_sobrescribir_con_archivo_incompleto(tmp_path):
+    html = (FIXTURES / "grupo.html").read_bytes()
+    partidos = pd.DataFrame(parsear_pagina_grupo(html, "grupo", *CONTEXTO))
+    path = tmp_path / "partidos_2019.csv"
+    partidos.to_csv(path, sep=";", index=False)
+    assert motivo_para_no_sobrescribir(partidos, str(path)) is None
+    assert motivo_para_no_sobrescribir(partidos.iloc[:-1], str(path))
+    assert motivo_para_no_sobrescribir(partidos.iloc[:-1], str(tmp_path / "nuevo.csv")) is None
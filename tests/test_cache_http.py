@@ -0,0 +1,129 @@
+import os
+import sqlite3
+import sys
+from pathlib import Path
+
+# Add the parent directory to sys.path to resolve the ModuleNotFoundError
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from utils import requester
+from utils.cache_http import CacheHTTP
+
+URL = "https://competicionescabb.gesdeportiva.es/partidos.aspx?competencia=1623&grupo=1"
+
+
+class Reloj:
+    def __init__(self, ahora=1000.0):
+        self.ahora = ahora
+
+    def __call__(self):
+        return self.ahora
+
+
+class Respuesta:
+    def __init__(self, status_code, content=b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        pass
+
+
+def test_vencimiento_por_ttl(tmp_path):
+    reloj = Reloj()
+    cache = CacheHTTP(path=str(tmp_path / "http.sqlite"), ttl_por_defecto=60, reloj=reloj)
+    cache.guardar(URL, b"<html>1</html>")
+    reloj.ahora += 59
+    assert cache.obtener(URL)["fresca"]
+    reloj.ahora += 2
+    entrada = cache.obtener(URL)
+    assert not entrada["fresca"] and entrada["contenido"] == b"<html>1</html>"
+    # Temporada cerrada: no vence nunca
+    cache.fijar_ttl(1623, None)
+    reloj.ahora += 10**6
+    assert cache.obtener(URL)["fresca"]
+    cache.cerrar()
+
+
+def test_revalidacion_304_devuelve_lo_guardado(tmp_path, monkeypatch):
+    reloj = Reloj()
+    cache = CacheHTTP(path=str(tmp_path / "http.sqlite"), ttl_por_defecto=60, reloj=reloj)
+    cache.guardar(
+        URL, b"<html>1</html>", {"ETag": '"v1"', "Last-Modified": "Sat, 01 Nov 2025 10:00:00 GMT"}
+    )
+    reloj.ahora += 120
+
+    pedidas = []
+
+    def get(url, timeout, headers):
+        pedidas.append(headers)
+        return Respuesta(304)
+
+    monkeypatch.setattr(requester, "CACHE", cache)
+    monkeypatch.setattr(requester, "LIMITADOR", None)
+    monkeypatch.setattr(requester.SESSION, "get", get)
+    assert requester.hacer_solicitud(URL) == b"<html>1</html>"
+    assert pedidas == [
+        {"If-None-Match": '"v1"', "If-Modified-Since": "Sat, 01 Nov 2025 10:00:00 GMT"}
+    ]
+    # El 304 renueva la entrada: la próxima solicitud no sale a la red
+    assert cache.obtener(URL)["fresca"]
+    assert requester.hacer_solicitud(URL) == b"<html>1</html>"
+    assert len(pedidas) == 1
+    cache.cerrar()
+
+
+def test_desalojo_de_lo_menos_usado(tmp_path):
+    reloj = Reloj()
+    cache = CacheHTTP(path=str(tmp_path / "http.sqlite"), max_bytes=2500, reloj=reloj)
+    contenidos = {url: os.urandom(1000) for url in ("a", "b", "c")}
+    cache.guardar("a", contenidos["a"])
+    reloj.ahora += 1
+    cache.guardar("b", contenidos["b"])
+    reloj.ahora += 1
+    assert cache.obtener("a") is not None
+    reloj.ahora += 1
+    cache.guardar("c", contenidos["c"])
+    assert cache.obtener("b") is None
+    assert cache.obtener("a")["contenido"] == contenidos["a"]
+    assert cache.obtener("c")["contenido"] == contenidos["c"]
+    assert cache.tamano_total() <= 2500
+    cache.cerrar()
+
+
+def _accedido(path, url):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT accedido FROM respuestas WHERE url = ?", (url,)).fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_lecturas_sin_commit_hasta_cerrar(tmp_path):
+    path = str(tmp_path / "http.sqlite")
+    reloj = Reloj()
+    cache = CacheHTTP(path=path, reloj=reloj)
+    cache.guardar("a", b"a")
+    reloj.ahora += 5
+    assert cache.obtener("a") is not None
+    # El acceso queda en memoria: otra conexión todavía ve el del guardado
+    assert _accedido(path, "a") == 1000.0
+    cache.cerrar()
+    assert _accedido(path, "a") == 1005.0
+    cache.cerrar()
+
+
+def test_accesos_se_vuelcan_cada_n_lecturas(tmp_path):
+    path = str(tmp_path / "http.sqlite")
+    reloj = Reloj()
+    cache = CacheHTTP(path=path, reloj=reloj)
+    cache.VOLCAR_ACCESOS = 2
+    cache.guardar("a", b"a")
+    cache.guardar("b", b"b")
+    reloj.ahora += 5
+    cache.obtener("a")
+    assert _accedido(path, "a") == 1000.0
+    cache.obtener("b")
+    assert (_accedido(path, "a"), _accedido(path, "b")) == (1005.0, 1005.0)
+    cache.cerrar()
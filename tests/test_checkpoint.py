@@ -0,0 +1,112 @@
+import sys
+from pathlib import Path
+
+# Add the parent directory to sys.path to resolve the ModuleNotFoundError
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from parsers.fases import parsear_fase
+from parsers.grupos import parsear_grupo
+from scraper.checkpoint import Checkpoint
+from scraper.incremental import EstadoIncremental
+from scraper.main import FebambaScraper
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+CONTEXTO = (2019, "JUVENILES", "CONFERENCIA SUR 2 2DA FASE", "ZONA SUR A 2")
+
+
+def test_ultima_linea_truncada_se_descarta(tmp_path):
+    path = tmp_path / "checkpoint.jsonl"
+    checkpoint = Checkpoint(str(path))
+    checkpoint.registrar("a", [{"local": "A"}])
+    checkpoint.registrar("b", [{"local": "B"}])
+    checkpoint.cerrar()
+    path.write_bytes(path.read_bytes()[:-10])
+
+    retomado = Checkpoint(str(path), retomar=True)
+    assert retomado.completadas == {"a": [{"local": "A"}]}
+    # Los appends siguientes quedan alineados con las líneas válidas
+    retomado.registrar("c", [])
+    retomado.cerrar()
+    assert set(Checkpoint(str(path), retomar=True).completadas) == {"a", "c"}
+
+
+def test_sin_retomar_empieza_vacio(tmp_path):
+    path = tmp_path / "checkpoint.jsonl"
+    checkpoint = Checkpoint(str(path))
+    checkpoint.registrar("a", [])
+    checkpoint.cerrar()
+    nuevo = Checkpoint(str(path))
+    nuevo.cerrar()
+    assert nuevo.completadas == {}
+    assert path.read_text(encoding="utf-8") == ""
+
+
+def test_retomar_no_repite_grupos(tmp_path):
+    html = (FIXTURES / "grupo.html").read_bytes()
+    year, categoria, fase_text, grupo_text = CONTEXTO
+    fase_info = parsear_fase(year, fase_text)
+    grupo_info = parsear_grupo(year, fase_text, grupo_text)
+    path = str(tmp_path / "checkpoint.jsonl")
+
+    descargas = []
+
+    def descargar(url):
+        descargas.append(url)
+        return html
+
+    scraper = FebambaScraper(base_url="", checkpoint=Checkpoint(path))
+    scraper._hacer_solicitud = descargar
+    primero = scraper._scrap_partidos_grupo("grupo", year, categoria, fase_info, grupo_info)
+    scraper.checkpoint.cerrar()
+    assert primero and descargas == ["grupo"]
+
+    retomado = FebambaScraper(base_url="", checkpoint=Checkpoint(path, retomar=True))
+    retomado._hacer_solicitud = descargar
+    assert retomado._scrap_partidos_grupo("grupo", year, categoria, fase_info, grupo_info) == primero
+    assert descargas == ["grupo"]
+    retomado.checkpoint.cerrar()
+
+
+def test_eliminar_borra_el_checkpoint(tmp_path):
+    path = tmp_path / "checkpoint.jsonl"
+    checkpoint = Checkpoint(str(path))
+    checkpoint.registrar("a", [])
+    checkpoint.eliminar()
+    assert not path.exists()
+    retomado = Checkpoint(str(path), retomar=True)
+    retomado.cerrar()
+    assert retomado.completadas == {}
+
+
+def test_retomar_restaura_la_huella_incremental(tmp_path):
+    html = (FIXTURES / "grupo.html").read_bytes()
+    year, categoria, fase_text, grupo_text = CONTEXTO
+    fase_info = parsear_fase(year, fase_text)
+    grupo_info = parsear_grupo(year, fase_text, grupo_text)
+    path = str(tmp_path / "checkpoint.jsonl")
+    path_estado = str(tmp_path / "incremental.json")
+
+    def scraper(checkpoint):
+        s = FebambaScraper(
+            base_url="", checkpoint=checkpoint, estado_incremental=EstadoIncremental(path_estado)
+        )
+        s._hacer_solicitud = lambda url: html
+        return s
+
+    # Corrida cortada: el grupo quedó en el checkpoint pero el estado no se guardó
+    cortada = scraper(Checkpoint(path))
+    partidos = cortada._scrap_partidos_grupo("grupo", year, categoria, fase_info, grupo_info)
+    cortada.checkpoint.cerrar()
+    assert partidos
+    huella = cortada.estado_incremental.huellas["grupo"]
+
+    retomada = scraper(Checkpoint(path, retomar=True))
+    assert retomada._scrap_partidos_grupo("grupo", year, categoria, fase_info, grupo_info) == partidos
+    assert retomada.estado_incremental.huellas == {"grupo": huella}
+    retomada.estado_incremental.guardar()
+    retomada.checkpoint.eliminar()
+
+    # La corrida siguiente reconoce el grupo como sin cambios
+    siguiente = scraper(None)
+    assert siguiente._scrap_partidos_grupo("grupo", year, categoria, fase_info, grupo_info) == []
+    assert siguiente.estado_incremental.sin_cambios == 1
@@ -0,0 +1,65 @@
+import os
+import sys
+from pathlib import Path
+
+# Add the parent directory to sys.path to resolve the ModuleNotFoundError
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+import pandas as pd
+
+import corregir_nombres_postscrap
+from corregir_nombres_postscrap import leer_temporada
+from utils.almacen import archivos_temporadas
+
+
+def _csv(path, filas):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("local;visitante\n" + "".join(f"{a};{b}\n" for a, b in filas), encoding="utf-8")
+    return str(path)
+
+
+def test_cache_por_ruta_absoluta(tmp_path, monkeypatch):
+    monkeypatch.setattr(corregir_nombres_postscrap, "CARPETA_CRUDOS", str(tmp_path / "crudos"))
+    uno = _csv(tmp_path / "uno" / "partidos_2024.csv", [("A", "B")])
+    otro = _csv(tmp_path / "otro" / "partidos_2024.csv", [("C", "D")])
+    assert leer_temporada(uno)["local"].tolist() == ["A"]
+    assert leer_temporada(otro)["local"].tolist() == ["C"]
+    assert leer_temporada(uno)["local"].tolist() == ["A"]
+
+
+def test_cache_invalida_si_cambia_el_tamano(tmp_path, monkeypatch):
+    monkeypatch.setattr(corregir_nombres_postscrap, "CARPETA_CRUDOS", str(tmp_path / "crudos"))
+    ruta = _csv(tmp_path / "partidos_2024.csv", [("A", "B")])
+    mtime = os.stat(ruta).st_mtime_ns
+    assert len(leer_temporada(ruta)) == 1
+    # Mismo mtime (p. ej. copiado conservando fechas) pero otro contenido
+    _csv(tmp_path / "partidos_2024.csv", [("A", "B"), ("C", "D")])
+    os.utime(ruta, ns=(mtime, mtime))
+    assert len(leer_temporada(ruta)) == 2
+
+
+def test_solo_lee_los_csv_por_temporada(tmp_path):
+    _csv(tmp_path / "partidos_2024.csv", [("A", "B")])
+    # Salida del scraping completo: separada por comas, con BOM
+    (tmp_path / "2025-10-01.csv").write_text("anio,local,visitante\n2025,A,B\n", encoding="utf-8-sig")
+    (tmp_path / "partidos_2025.csv").mkdir()
+    assert archivos_temporadas(str(tmp_path)) == [str(tmp_path / "partidos_2024.csv")]
+
+
+def test_main_ignora_la_salida_del_scraping_completo(tmp_path, monkeypatch):
+    monkeypatch.setattr(corregir_nombres_postscrap, "CARPETA_CRUDOS", str(tmp_path / "crudos"))
+    data = tmp_path / "Data"
+    data.mkdir()
+    (data / "partidos_2024.csv").write_text(
+        "anio;categoria;local;visitante;ptsL;ptsV\n2024;JUVENILES;A;B;70;60\n", encoding="utf-8"
+    )
+    (data / "2025-10-01.csv").write_text(
+        "anio,categoria,local,visitante\n2025,JUVENILES,A,B\n", encoding="utf-8-sig"
+    )
+    salida = tmp_path / "procesada"
+    monkeypatch.setattr(sys, "argv", [
+        "corregir_nombres_postscrap.py", "--data", str(data), "--salida", str(salida),
+        "--almacen", str(tmp_path / "almacen" / "partidos"), "--workers", "1",
+    ])
+    corregir_nombres_postscrap.main()
+    assert len(pd.read_csv(salida / "19-24 procesado.csv", sep=";")) == 1
@@ -0,0 +1,65 @@
+import sys
+from pathlib import Path
+
+# Add the parent directory to sys.path to resolve the ModuleNotFoundError
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+import pandas as pd
+
+from utils.dataframes import CLAVES_PARTIDO, combinar_partidos
+
+
+def _partido(local, visitante, jornada="1", ptsL="", ptsV="", grupo="A"):
+    return {
+        "categoria": "JUVENILES",
+        "fase": "1RA FASE",
+        "grupo": grupo,
+        "jornada": jornada,
+        "local": local,
+        "visitante": visitante,
+        "ptsL": ptsL,
+        "ptsV": ptsV,
+    }
+
+
+EXISTENTES = pd.DataFrame(
+    [_partido("A", "B", "1", "70", "60"), _partido("C", "D", "1"), _partido("A", "C", "2")]
+)
+
+
+def test_reemplaza_en_su_lugar():
+    nuevos = pd.DataFrame([_partido("C", "D", "1", "55", "58")])
+    resultado = combinar_partidos(EXISTENTES, nuevos)
+    assert len(resultado) == 3
+    assert resultado.loc[1, ["local", "ptsL", "ptsV"]].tolist() == ["C", "55", "58"]
+    assert resultado.drop(index=1).equals(EXISTENTES.drop(index=1))
+
+
+def test_agrega_los_nuevos_al_final():
+    nuevos = pd.DataFrame([_partido("B", "D", "2", "40", "42"), _partido("A", "B", "1", "71", "60")])
+    resultado = combinar_partidos(EXISTENTES, nuevos)
+    assert resultado[["local", "visitante"]].values.tolist() == [
+        ["A", "B"], ["C", "D"], ["A", "C"], ["B", "D"]
+    ]
+    assert resultado.loc[0, "ptsL"] == "71"
+
+
+def test_claves_repetidas_en_nuevos_gana_la_ultima():
+    nuevos = pd.DataFrame([
+        _partido("C", "D", "1", "10", "12"),
+        _partido("B", "D", "2", "1", "2"),
+        _partido("C", "D", "1", "55", "58"),
+        _partido("B", "D", "2", "40", "42"),
+    ])
+    resultado = combinar_partidos(EXISTENTES, nuevos)
+    assert len(resultado) == 4
+    assert resultado.loc[1, ["ptsL", "ptsV"]].tolist() == ["55", "58"]
+    assert resultado.loc[3, ["ptsL", "ptsV"]].tolist() == ["40", "42"]
+
+
+def test_existentes_vacio():
+    nuevos = pd.DataFrame([_partido("A", "B", ptsL="1"), _partido("A", "B", ptsL="2"), _partido("C", "D")])
+    resultado = combinar_partidos(pd.DataFrame(), nuevos)
+    assert resultado[["local", "ptsL"]].values.tolist() == [["A", "2"], ["C", ""]]
+    assert not resultado.duplicated(subset=CLAVES_PARTIDO).any()
+    assert combinar_partidos(EXISTENTES, pd.DataFrame()) is EXISTENTES
@@ -0,0 +1,100 @@
+import json
+import sys
+from pathlib import Path
+
+# Add the parent directory to sys.path to resolve the ModuleNotFoundError
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from mapeos.equipos import IndiceEquipos, clave_equipo
+from mapeos.loader import cargar_mapeo_equipos, normalizar_equipo
+from utils.open_csv import leer_csv_con_encoding_detectado
+
+RAIZ = Path(__file__).resolve().parent.parent
+FIXTURES = RAIZ / "tests" / "fixtures"
+
+MAPEO = {
+    "ALEJANDRO KORN": "CLUB SOCIAL ALEJANDRO KORN",
+    'BOCA JUNIORS "B"': "BOCA JUNIORS AMARILLO",
+    "BANCO NACION": "BANCO NACIÓN",
+}
+
+
+def test_clave_equipo():
+    assert clave_equipo("Cañuelas F.C. - Sub 17") == "CANUELASFCSUB17"
+    assert clave_equipo('BOCA JUNIORS  "B"') == clave_equipo("boca juniors b")
+
+
+def test_variantes_sin_entrada_propia():
+    indice = IndiceEquipos(MAPEO)
+    assert indice.normalizar("CLUB  SOCIAL  ALEJANDRO  KORN") == "CLUB SOCIAL ALEJANDRO KORN"
+    assert indice.normalizar("Boca Juniors B ") == "BOCA JUNIORS AMARILLO"
+    assert indice.normalizar("BANCO NACIÓN") == "BANCO NACIÓN"
+    assert indice.normalizar(" Otro Club ") == "Otro Club"
+    assert indice.desconocidos() == ["Otro Club"]
+
+
+def test_sugerencias_solo_para_desconocidos():
+    indice = IndiceEquipos(MAPEO)
+    assert indice.sugerir("CLUB SOC. ALEJANDRO KORN")[0][0] == "CLUB SOCIAL ALEJANDRO KORN"
+    assert indice.sugerir("RIVER PLATE") == []
+    filas = indice.sugerencias(["ALEJANDRO KORN", "ALEJANDRO KORNN", "ALEJANDRO KORNN", None])
+    assert [(f["nombre"], f["apariciones"]) for f in filas] == [("ALEJANDRO KORNN", 2)]
+
+
+def test_mapa_real():
+    mapeo = cargar_mapeo_equipos()
+    assert normalizar_equipo('A.F.A.L.P.  "A"', mapeo) == "A.F.A.L.P. A"
+    assert normalizar_equipo("FERROCARRIL  OESTE B", mapeo) == normalizar_equipo(
+        "FERRO CARRIL OESTE B", mapeo
+    )
+    assert normalizar_equipo(None, mapeo) is None
+
+
+# Nombres que el índice canónico resuelve distinto que la búsqueda exacta del
+# mapa anterior (tests/fixtures/equipos_map_anterior.json); cada uno tiene su
+# entrada explícita en equipos_map.json
+CAMBIOS_INTENCIONALES = {
+    "BOCA JUNIORS A": "BOCA JUNIORS AZUL",
+    "CAÑUELAS FC - Sub17": "CAÑUELAS FC",
+    "COUNTRY CIB": "COUNTRY BANFIELD",
+    "U GRAL.ARMENIA": "ARMENIA",
+    "U.A.I. URQUIZA": "UAI URQUIZA",
+    "U.V.V.A UNION VECINAL VILLA ADELINA": "U.V.V.ADELINA",
+}
+
+
+def _nombres_de_los_datos():
+    nombres = set()
+    for path in sorted((RAIZ / "Data").glob("partidos_*.csv")):
+        df = leer_csv_con_encoding_detectado(str(path), ";", dtype=str)
+        nombres.update(df["local"].dropna())
+        nombres.update(df["visitante"].dropna())
+    llaves = json.loads((RAIZ / "mapeos" / "llaves_playoffs.json").read_text(encoding="utf-8"))
+    for categorias in llaves["llaves"].values():
+        for cruces in categorias.values():
+            for cruce in cruces:
+                nombres.update(cruce["llave"])
+    return nombres
+
+
+def test_mismos_nombres_que_el_mapa_anterior():
+    anterior = json.loads((FIXTURES / "equipos_map_anterior.json").read_text(encoding="utf-8"))
+    nombres = _nombres_de_los_datos() | set(anterior) | set(anterior.values())
+    mapeo = cargar_mapeo_equipos()
+    cambios = {}
+    for nombre in nombres:
+        # normalizar_equipo antes del índice canónico: búsqueda exacta en mayúsculas
+        viejo = anterior.get(nombre.upper().strip(), nombre.strip())
+        nuevo = normalizar_equipo(nombre, mapeo)
+        if nuevo != viejo:
+            cambios[nombre] = nuevo
+    assert cambios == CAMBIOS_INTENCIONALES
+    for nombre, destino in CAMBIOS_INTENCIONALES.items():
+        assert mapeo.get(nombre.upper()) == destino
+
+
+def test_destino_consistente_no_cambia_de_mayusculas():
+    indice = IndiceEquipos({"GEI BLANCO": "Club GEI BLANCO"})
+    assert indice.normalizar("CLUB GEI BLANCO") == "CLUB GEI BLANCO"
+    assert indice.normalizar("Club  GEI-BLANCO") == "Club GEI BLANCO"
+    assert indice.normalizar("gei blanco") == "Club GEI BLANCO"
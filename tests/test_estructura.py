@@ -0,0 +1,106 @@
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Add the parent directory to sys.path to resolve the ModuleNotFoundError
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from mapeos.loader import cargar_mapeo_equipos
+from parsers.estructura import (
+    CAMPOS_FASE,
+    CAMPOS_GRUPO,
+    parsear_textos_lote,
+    resolver_estructura,
+    resolver_estructura_lote,
+)
+from parsers.fases import parsear_fase
+from parsers.grupos import parsear_grupo
+from parsers.jornadas import parsear_jornada
+from parsers.rondas import inferir_ronda
+
+EQUIPOS_MAP = cargar_mapeo_equipos()
+
+# (anio, categoria, fase_text, grupo_text, jornada_text, local, visitante)
+PARTIDOS = [
+    (2019, "JUVENILES", "CONFERENCIA SUR 2 2DA FASE", "ZONA SUR A 2", "Jornada 3 - 01/06/2019", "EL TALAR", "VICTORIA"),
+    (2019, "CADETES", "CUARTOS DE FINAL CONF 1 NORTE", "NORTE", "Jornada 1 - 10/10/2019", "PINOCHO", "CAZA Y PESCA A"),
+    (2022, "JUVENILES", "PLAY OFF", "CONFERENCIA 2 OESTE", "Jornada 2 - 01/10/2022", "EL TALAR", "VICTORIA"),
+    (2022, "CADETES", "FINAL FOUR", "FINAL FOUR", "Jornada 1 - 01/12/2022", "CAZA Y PESCA A", "PINOCHO"),
+    (2023, "JUVENILES", "CUARTOS DE FINAL - NORTE 2", "NORTE 2", "SEMIFINAL Jornada 2 - 10/12/2023", "A", "B"),
+    (2024, "INFANTILES", "PLAY OFF -NIVEL 2", "NIVEL 2 SUR A", "Jornada 1 - 01/11/2024", "A", "B"),
+    (2025, "PREINFANTILES", "1ER ETAPA", "CENTRO OESTE 4", "Jornada 5 - 01/05/2025", "A", "B"),
+]
+
+
+def _crudos():
+    return pd.DataFrame(
+        PARTIDOS,
+        columns=["anio", "categoria", "fase_text", "grupo_text", "jornada_text", "local", "visitante"],
+    )
+
+
+def test_lote_igual_a_fila_por_fila():
+    resultado = resolver_estructura_lote(parsear_textos_lote(_crudos()), EQUIPOS_MAP)
+    for i, (anio, categoria, fase_text, grupo_text, jornada_text, local, visitante) in enumerate(PARTIDOS):
+        ronda, jornada, _ = parsear_jornada(jornada_text)
+        esperado = resolver_estructura(
+            anio,
+            categoria,
+            parsear_fase(anio, fase_text),
+            parsear_grupo(anio, fase_text, grupo_text),
+            ronda,
+            jornada,
+            local,
+            visitante,
+            EQUIPOS_MAP,
+        )
+        fila = resultado.iloc[i]
+        assert {k: fila[k] for k in esperado} == esperado
+
+
+def test_parsear_textos_lote_sin_grupo():
+    crudos = _crudos()
+    crudos.loc[0, "grupo_text"] = None
+    df = parsear_textos_lote(crudos)
+    assert [df.loc[0, f"fase_{c}"] for c in CAMPOS_FASE] == list(
+        parsear_fase(2019, PARTIDOS[0][2]).values()
+    )
+    assert all(df.loc[0, f"grupo_{c}"] is None for c in CAMPOS_GRUPO)
+    assert df.loc[4, "ronda_jornada"] == "SEMIFINAL"
+    resultado = resolver_estructura_lote(df, EQUIPOS_MAP)
+    assert resultado.loc[0, "grupo"] == "Desconocido"
+
+
+def test_lote_infiere_una_vez_por_combinacion():
+    llamadas = []
+
+    def inferir(*args):
+        llamadas.append(args[:-1])
+        return inferir_ronda(*args)
+
+    df = parsear_textos_lote(pd.concat([_crudos()] * 3, ignore_index=True))
+    resultado = resolver_estructura_lote(df, EQUIPOS_MAP, inferir=inferir)
+    assert len(llamadas) == len(set(llamadas)) == len(PARTIDOS)
+    assert resultado["grupo"].tolist() == resultado["grupo"].iloc[: len(PARTIDOS)].tolist() * 3
+
+
+def test_lote_sin_equipos_en_la_clave_fuera_de_playoffs():
+    llamadas = []
+
+    def inferir(*args):
+        llamadas.append(args[:-1])
+        return inferir_ronda(*args)
+
+    # Misma fase regular y jornada con otros equipos: no hace falta volver a inferir
+    regular = PARTIDOS[0]
+    playoff = PARTIDOS[2]
+    crudos = pd.DataFrame(
+        [regular, regular[:5] + ("PINOCHO", "CAZA Y PESCA A"), playoff, playoff[:5] + ("PINOCHO", "EL TALAR")],
+        columns=_crudos().columns,
+    )
+    resultado = resolver_estructura_lote(parsear_textos_lote(crudos), EQUIPOS_MAP, inferir=inferir)
+    assert len(llamadas) == 3
+    llaves = resultado["llave"].tolist()
+    assert llaves[:2] == [None, None]
+    assert llaves[2] != llaves[3] and llaves[3].startswith("PINOCHO")
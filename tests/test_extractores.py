@@ -0,0 +1,47 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the parent directory to sys.path to resolve the ModuleNotFoundError
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from scraper.extractores import ExtractorBS4, ExtractorLxml, obtener_extractor
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+PAGINAS = sorted(FIXTURES.glob("*.html"))
+
+
+@pytest.mark.parametrize("pagina", PAGINAS, ids=lambda p: p.name)
+@pytest.mark.parametrize("nombre_select", ["DDLCategorias", "DDLFases", "DDLGrupos"])
+def test_opciones_iguales_en_ambos_backends(pagina, nombre_select):
+    html = pagina.read_bytes()
+    assert ExtractorLxml().opciones(html, nombre_select) == ExtractorBS4().opciones(
+        html, nombre_select
+    )
+
+
+@pytest.mark.parametrize("pagina", PAGINAS, ids=lambda p: p.name)
+def test_tablas_partidos_iguales_en_ambos_backends(pagina):
+    html = pagina.read_bytes()
+    assert ExtractorLxml().tablas_partidos(html) == ExtractorBS4().tablas_partidos(html)
+
+
+def test_tablas_partidos_grupo():
+    tablas = ExtractorLxml().tablas_partidos((FIXTURES / "grupo.html").read_bytes())
+    assert len(tablas) == 14
+    assert tablas[0][0].startswith("Jornada 1 -")
+    # Se descartan el encabezado y las filas de menos de 4 celdas
+    assert all(len(fila) == 4 for _, filas in tablas for fila in filas)
+    assert sum(len(filas) for _, filas in tablas) == 14 * 8
+
+
+def test_pagina_sin_panel_de_partidos():
+    html = (FIXTURES / "fase.html").read_bytes()
+    assert ExtractorLxml().tablas_partidos(html) is None
+    assert ExtractorBS4().tablas_partidos(html) is None
+
+
+def test_extractor_desconocido():
+    with pytest.raises(ValueError):
+        obtener_extractor("selectolax")
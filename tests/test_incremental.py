@@ -0,0 +1,27 @@
+import sys
+from pathlib import Path
+
+# Add the parent directory to sys.path to resolve the ModuleNotFoundError
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from scraper.incremental import EstadoIncremental
+
+TABLAS = {
+    "grupo1": [("Jornada 1 - 01/05/2025", [["A", "70", "60", "B"]])],
+    "grupo2": [("Jornada 1 - 01/05/2025", [["C", "", "", "D"]])],
+}
+
+
+def test_solo_marca_los_grupos_que_cambiaron(tmp_path):
+    path = str(tmp_path / "incremental.json")
+    estado = EstadoIncremental(path)
+    assert all(estado.cambio(url, tablas) for url, tablas in TABLAS.items())
+    estado.guardar()
+
+    # Siguiente corrida: grupo2 cargó un resultado, grupo1 sigue igual
+    siguiente = EstadoIncremental(path)
+    actualizadas = dict(TABLAS, grupo2=[("Jornada 1 - 01/05/2025", [["C", "55", "58", "D"]])])
+    assert [url for url, tablas in actualizadas.items() if siguiente.cambio(url, tablas)] == ["grupo2"]
+    assert (siguiente.cambiados, siguiente.sin_cambios) == (1, 1)
+    # Una jornada nueva también cuenta como cambio
+    assert siguiente.cambio("grupo1", TABLAS["grupo1"] + [("Jornada 2 - 08/05/2025", [])])
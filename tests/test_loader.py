@@ -0,0 +1,56 @@
+import json
+import os
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Add the parent directory to sys.path to resolve the ModuleNotFoundError
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from mapeos.loader import (
+    RegistroMapeos,
+    cargar_mapeo_equipos,
+    map_series,
+    mapear_categoria,
+    normalizar_equipo,
+)
+
+
+def test_registro_relee_solo_si_cambia_el_archivo(tmp_path):
+    path = tmp_path / "mapa.json"
+    path.write_text(json.dumps({"A": "1"}), encoding="utf-8")
+    registro = RegistroMapeos(str(tmp_path))
+    primero = registro.obtener("mapa.json")
+    assert registro.obtener("mapa.json") is primero
+    assert registro.indice("mapa.json", "claves", sorted) == ["A"]
+
+    path.write_text(json.dumps({"A": "2", "B": "3"}), encoding="utf-8")
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1_000_000))
+    assert registro.obtener("mapa.json") == {"A": "2", "B": "3"}
+    assert registro.indice("mapa.json", "claves", sorted) == ["A", "B"]
+
+
+def test_mapear_categoria_ignora_mayusculas():
+    assert mapear_categoria("U19 MASCULINO") == "JUVENILES"
+    assert mapear_categoria("u19 Masculino") == "JUVENILES"
+    assert mapear_categoria("Veteranos", "Veteranos") == "Veteranos"
+
+
+def test_map_series_igual_a_fila_por_fila():
+    serie = pd.Series(["BOCA JUNIORS", "Otro Club ", None, "BOCA JUNIORS", 'PLATENSE  "A"'])
+    mapeo = cargar_mapeo_equipos()
+    esperado = serie.apply(lambda x: normalizar_equipo(x, mapeo))
+    assert map_series(serie).equals(esperado)
+    assert map_series(pd.Series(["U-17", "rara"]), "categorias").tolist() == ["CADETES", "rara"]
+
+
+def test_registro_reemplaza_el_indice_si_cambia_la_version(tmp_path):
+    (tmp_path / "mapa.json").write_text(json.dumps({"A": "1"}), encoding="utf-8")
+    registro = RegistroMapeos(str(tmp_path))
+    v1, v2 = {}, {}
+    primero = registro.indice("mapa.json", "claves", list, version=v1)
+    assert registro.indice("mapa.json", "claves", list, version=v1) is primero
+    segundo = registro.indice("mapa.json", "claves", list, version=v2)
+    assert segundo is not primero
+    assert registro.indice("mapa.json", "claves", list, version=v2) is segundo
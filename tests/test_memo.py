@@ -0,0 +1,39 @@
+import sys
+from pathlib import Path
+
+# Add the parent directory to sys.path to resolve the ModuleNotFoundError
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from parsers import memo as memo_parsers
+from parsers.fases import parsear_fase
+from parsers.jornadas import parsear_jornada
+from parsers.memo import MemoParser
+
+
+def test_lru_acotado_y_estadisticas():
+    memo = MemoParser("parsear_fase", parsear_fase, maximo=2)
+    assert memo(2024, "PLAY OFF") == parsear_fase(2024, "PLAY OFF")
+    memo(2024, "PLAY OFF")["nivel"] = "modificado"
+    assert memo(2024, "PLAY OFF")["nivel"] == "Desconocido"
+    memo(2024, "FASE FINAL")
+    memo(2024, "1ER ETAPA")
+    e = memo.estadisticas()
+    assert (e["aciertos"], e["fallos"], e["entradas"], e["desalojos"]) == (2, 3, 2, 1)
+
+
+def test_persistencia(tmp_path, monkeypatch):
+    jornada = MemoParser("parsear_jornada", parsear_jornada)
+    monkeypatch.setattr(memo_parsers, "MEMOS", (jornada,))
+    ruta = tmp_path / "parsers.json"
+    texto = "SEMIFINAL Jornada 2 - 10/12/2023"
+    jornada(texto)
+    memo_parsers.guardar_memo(str(ruta))
+
+    jornada.limpiar()
+    assert memo_parsers.cargar_memo(str(ruta)) == 1
+    assert jornada(texto) == ("SEMIFINAL", "2", "10/12/2023")
+    assert jornada.estadisticas()["aciertos"] == 1
+
+    monkeypatch.setattr(memo_parsers, "firma_parsers", lambda: "otra")
+    jornada.limpiar()
+    assert memo_parsers.cargar_memo(str(ruta)) == 0
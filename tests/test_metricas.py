@@ -0,0 +1,116 @@
+import csv
+import json
+import sys
+from pathlib import Path
+
+# Add the parent directory to sys.path to resolve the ModuleNotFoundError
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+import pytest
+
+from utils.metricas import HistogramaLatencia, Metricas, patron_url
+
+BASE = "https://competicionescabb.gesdeportiva.es/competicion.aspx?competencia=1623"
+
+
+@pytest.mark.parametrize(
+    "url, patron",
+    [
+        (BASE, "competicion"),
+        (f"{BASE}&categoria=3001", "categoria"),
+        (f"{BASE}&categoria=3001&fase=5001", "fase"),
+        (f"{BASE}&categoria=3001&fase=5001&grupo=7000", "grupo"),
+        ("https://competicionescabb.gesdeportiva.es/", "otro"),
+    ],
+)
+def test_patron_url(url, patron):
+    assert patron_url(url) == patron
+
+
+def _limite_superior(segundos):
+    return min(limite for limite in HistogramaLatencia.LIMITES if limite >= segundos)
+
+
+def test_percentiles_sobre_latencias_conocidas():
+    histograma = HistogramaLatencia()
+    assert histograma.percentil(50) is None and histograma.media() is None
+    # 1, 2, ..., 100 ms
+    for ms in range(1, 101):
+        histograma.agregar(ms / 1000)
+
+    assert histograma.n == 100
+    assert histograma.media() == pytest.approx(0.0505)
+    for p in (50, 90, 95):
+        exacto = p / 1000
+        estimado = histograma.percentil(p)
+        # Límite superior del bucket, acotado por el máximo observado
+        assert estimado == min(_limite_superior(exacto), 0.1)
+        assert exacto <= estimado < 1.25 * exacto
+    # El último bucket no supera al máximo observado
+    assert histograma.percentil(100) == 0.1
+    assert histograma.maximo == 0.1
+
+
+def test_latencia_fuera_de_los_buckets():
+    histograma = HistogramaLatencia()
+    histograma.agregar(600.0)
+    assert histograma.percentil(50) == 600.0
+
+
+def _metricas():
+    metricas = Metricas()
+    grupo = f"{BASE}&categoria=3001&fase=5001&grupo=7000"
+    for ms in (10, 20, 30, 40):
+        metricas.registrar_respuesta(grupo, 200, ms / 1000, 1000)
+    metricas.registrar_respuesta(grupo, 404, 0.005)
+    metricas.registrar_respuesta(grupo, 503, 0.5)
+    metricas.registrar_respuesta(grupo, None, 1.0)
+    metricas.registrar_reintento(grupo)
+    metricas.registrar_respuesta(f"{BASE}&categoria=3001", 304, 0.002)
+    metricas.registrar_cache(f"{BASE}&categoria=3001", revalidada=True)
+    metricas.registrar_cache(BASE)
+    return metricas
+
+
+def test_resumen_agrupa_por_patron():
+    filas = {fila["patron"]: fila for fila in _metricas().resumen()}
+    assert list(filas) == ["categoria", "competicion", "grupo"]
+
+    grupo = filas["grupo"]
+    assert grupo["solicitudes"] == 7
+    assert (grupo["ok"], grupo["no_encontradas_404"], grupo["otros_errores_http"]) == (4, 1, 1)
+    assert grupo["errores_conexion"] == 1
+    assert grupo["reintentos"] == 1
+    assert grupo["bytes"] == 4000
+    assert grupo["latencia_max_ms"] == 1000.0
+
+    categoria = filas["categoria"]
+    assert (categoria["solicitudes"], categoria["no_modificadas_304"]) == (1, 1)
+    assert categoria["cache_revalidada"] == 1
+
+    competicion = filas["competicion"]
+    assert (competicion["solicitudes"], competicion["cache_fresca"]) == (0, 1)
+    assert competicion["latencia_p50_ms"] is None
+
+
+def test_exportar_json_y_csv(tmp_path):
+    metricas = _metricas()
+    ruta_json, ruta_csv = metricas.exportar(str(tmp_path / "metricas"), "corrida")
+    assert Path(ruta_json).name == "corrida.json"
+
+    with open(ruta_json, encoding="utf-8") as f:
+        exportado = json.load(f)
+    assert exportado["patrones"] == metricas.resumen()
+    assert exportado["inicio"] == metricas.inicio.isoformat(timespec="seconds")
+
+    with open(ruta_csv, newline="", encoding="utf-8") as f:
+        filas = list(csv.DictReader(f))
+    assert [fila["patron"] for fila in filas] == ["categoria", "competicion", "grupo"]
+    assert filas[2]["solicitudes"] == "7"
+    assert list(filas[0]) == list(exportado["patrones"][0])
+
+
+def test_exportar_sin_solicitudes(tmp_path):
+    ruta_json, ruta_csv = Metricas().exportar(str(tmp_path))
+    assert json.loads(Path(ruta_json).read_text(encoding="utf-8"))["patrones"] == []
+    assert Path(ruta_csv).read_text(encoding="utf-8") == ""
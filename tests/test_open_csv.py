@@ -0,0 +1,38 @@
+import sys
+from pathlib import Path
+
+# Add the parent directory to sys.path to resolve the ModuleNotFoundError
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from utils import open_csv
+from utils.open_csv import (
+    detectar_encoding,
+    leer_csv_con_encoding_detectado,
+    leer_csv_con_encoding_detectado_Comas,
+)
+
+CSV = "local;visitante\nCAÑUELAS FC;SAN ANDRÉS\n"
+
+
+def test_encodings_del_proyecto(tmp_path):
+    casos = {"utf-8": "utf-8", "utf-8-sig": "utf-8-sig", "latin-1": "latin-1"}
+    for encoding, esperado in casos.items():
+        path = tmp_path / f"{encoding}.csv"
+        path.write_bytes(CSV.encode(encoding))
+        assert detectar_encoding(str(path)) == esperado
+        assert leer_csv_con_encoding_detectado(str(path))["local"].tolist() == ["CAÑUELAS FC"]
+
+
+def test_cp1252_pasa_por_chardet(tmp_path):
+    path = tmp_path / "cp1252.csv"
+    path.write_bytes(("equipo\n" + "“CAÑUELAS” FC – Sub 17\n" * 20).encode("cp1252"))
+    assert leer_csv_con_encoding_detectado_Comas(str(path))["equipo"][0] == "“CAÑUELAS” FC – Sub 17"
+
+
+def test_utf8_solo_en_la_muestra(tmp_path, monkeypatch):
+    monkeypatch.setattr(open_csv, "TAMANIO_MUESTRA", 64)
+    path = tmp_path / "mixto.csv"
+    path.write_bytes(("equipo\n" + "A\n" * 100).encode() + "CAÑUELAS\n".encode("latin-1") + b"B\n" * 100)
+    assert detectar_encoding(str(path)) == "utf-8"
+    assert leer_csv_con_encoding_detectado(str(path))["equipo"].tolist()[100] == "CAÑUELAS"
+    assert detectar_encoding(str(path)) == "latin-1"
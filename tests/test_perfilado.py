@@ -0,0 +1,96 @@
+import pstats
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add the parent directory to sys.path to resolve the ModuleNotFoundError
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from utils.perfilado import ETAPAS, PerfilCProfile, Perfilador
+
+
+def _filas(perfilador):
+    return {(f["anio"], f["categoria"]): f for f in perfilador.resumen()}
+
+
+def test_acumula_por_temporada_categoria_y_etapa():
+    perfilador = Perfilador()
+    perfilador.sumar("fetch", 5)  # antes de fijar contexto
+    perfilador.contexto(2024, "U13")
+    perfilador.sumar("fetch", 1_000_000_000)
+    perfilador.sumar("fetch", 500_000_000)
+    perfilador.sumar("parsear_fase", 250_000_000)
+    perfilador.contexto(2025, "U13")
+    perfilador.sumar("fetch", 2_000_000_000)
+
+    filas = _filas(perfilador)
+    assert list(filas) == [(2024, "U13"), (2025, "U13"), (None, None)]
+    fila = filas[(2024, "U13")]
+    assert (fila["fetch_s"], fila["fetch_n"]) == (1.5, 2)
+    assert (fila["parsear_fase_s"], fila["parsear_fase_n"]) == (0.25, 1)
+    # Las etapas sin mediciones aparecen en cero
+    assert all(fila[f"{e}_n"] == 0 for e in ETAPAS if e not in ("fetch", "parsear_fase"))
+    assert (filas[(2025, "U13")]["fetch_s"], filas[(2025, "U13")]["fetch_n"]) == (2.0, 1)
+    assert filas[(None, None)]["fetch_n"] == 1
+
+
+def test_envolver_cuenta_llamadas_y_devuelve_el_resultado():
+    perfilador = Perfilador()
+    doble = perfilador.envolver("parsear_jornada", lambda x: 2 * x)
+    perfilador.contexto(2025, "U15")
+    assert [doble(i) for i in range(3)] == [0, 2, 4]
+    assert doble.__wrapped__(4) == 8
+    fila = _filas(perfilador)[(2025, "U15")]
+    assert fila["parsear_jornada_n"] == 3
+    assert fila["parsear_jornada_s"] >= 0
+
+
+def test_contexto_propio_de_cada_hilo_del_pool():
+    perfilador = Perfilador()
+    hilos = 4
+    # Todos fijan su contexto antes de que alguno mida: si fuera compartido,
+    # las mediciones irían a la última categoría fijada
+    barrera = threading.Barrier(hilos)
+
+    def tarea(i):
+        perfilador.contexto(2025, f"CAT{i}")
+        barrera.wait()
+        for _ in range(i + 1):
+            perfilador.sumar("fetch", 1_000_000)
+
+    with ThreadPoolExecutor(max_workers=hilos) as pool:
+        list(pool.map(tarea, range(hilos)))
+
+    filas = _filas(perfilador)
+    assert sorted(filas) == [(2025, f"CAT{i}") for i in range(hilos)]
+    for i in range(hilos):
+        assert filas[(2025, f"CAT{i}")]["fetch_n"] == i + 1
+    assert len(perfilador._tablas) == hilos
+
+
+def test_imprimir_totales(capsys):
+    perfilador = Perfilador()
+    perfilador.contexto(2025, "U13")
+    perfilador.sumar("fetch", 3_000_000_000)
+    perfilador.contexto(2025, "U15")
+    perfilador.sumar("fetch", 1_000_000_000)
+    perfilador.imprimir()
+    salida = capsys.readouterr().out
+    assert "fetch 100.0%" in salida
+    assert "4.000s" in salida
+
+
+def test_cprofile_sin_ruta_no_hace_nada(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with PerfilCProfile(None) as perfil:
+        sum(range(1000))
+    assert perfil._perfil is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_cprofile_guarda_estadisticas(tmp_path):
+    ruta = tmp_path / "perfil.pstats"
+    with PerfilCProfile(str(ruta)):
+        sorted(range(1000), reverse=True)
+    assert pstats.Stats(str(ruta)).total_calls > 0
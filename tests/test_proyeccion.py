@@ -0,0 +1,51 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add the parent directory to sys.path to resolve the ModuleNotFoundError
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from analisis.proyeccion import fixture_restante, proyectar, puntos_tabla
+
+
+def _grupo(resultados, grupo="1"):
+    return pd.DataFrame(
+        [
+            {"categoria": "U17", "zona": "NORTE", "grupo": grupo, "jornada": j,
+             "local": l, "ptsL": pl, "visitante": v, "ptsV": pv}
+            for j, (l, pl, v, pv) in enumerate(resultados, start=1)
+        ]
+    )
+
+
+def test_puntos_tabla_como_tabla_2025():
+    local, visita = puntos_tabla([80, 60, 20, 0, 0, 55], [70, 75, 0, 20, 0, 55])
+    assert local.tolist() == [2, 1, 2, 0, 0, 1]
+    assert visita.tolist() == [1, 2, 0, 2, 0, 1]
+
+
+def test_fixture_restante_ida_y_vuelta():
+    partidos = _grupo([("A", 80, "B", 70), ("B", 60, "A", 65), ("A", 70, "C", 50)])
+    pendientes = fixture_restante(partidos)
+    assert set(zip(pendientes["local"], pendientes["visitante"])) == {("C", "A"), ("B", "C"), ("C", "B")}
+
+
+def test_proyectar_probabilidades():
+    partidos = pd.concat([
+        # Grupo 1: A gana todo por mucho, faltan las vueltas
+        _grupo([("A", 90, "B", 50), ("A", 95, "C", 55), ("B", 70, "C", 68)]),
+        # Grupo 2: terminado
+        _grupo([("D", 60, "E", 50), ("E", 70, "D", 65)], grupo="2"),
+    ], ignore_index=True)
+    proyeccion = proyectar(partidos, simulaciones=2_000, clasificados=1, semilla=7)
+    otra = proyectar(partidos, simulaciones=2_000, clasificados=1, semilla=7, workers=2)
+    pd.testing.assert_frame_equal(proyeccion, otra)
+
+    columnas = [c for c in proyeccion.columns if c.startswith("prob_pos_")]
+    assert np.allclose(proyeccion[columnas].fillna(0).sum(axis=1), 1)
+    por_equipo = proyeccion.set_index("equipo")
+    assert por_equipo.loc["A", "prob_clasifica"] > 0.9
+    # Grupo terminado: D y E empatan en puntos, D gana por DP
+    assert por_equipo.loc["D", "prob_pos_1"] == 1 and por_equipo.loc["E", "prob_pos_2"] == 1
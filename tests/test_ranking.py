@@ -0,0 +1,117 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add the parent directory to sys.path to resolve the ModuleNotFoundError
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from analisis.Ranking import Functions
+from analisis.Ranking.Functions import (
+    actualizar_temporada,
+    asignar_basis_points,
+    basis_points,
+    calcular_ranking,
+    calculate_orp_vectorized,
+    peso_por_fase,
+    process_all_years,
+    tabla_de_pesos,
+)
+
+
+def test_basis_points_igual_a_fila_por_fila():
+    df = pd.DataFrame(
+        {
+            "ptsL": [20, 0, 0, 80, 70, 61, 50, 40, 59, 55, None, 70.9],
+            "ptsV": [0, 20, 0, 50, 59, 60, 80, 30, 60, 55, 10, 50],
+        }
+    )
+    esperado = df.apply(asignar_basis_points, axis=1, result_type="expand")
+    local, visita = basis_points(df["ptsL"], df["ptsV"])
+    assert local.tolist() == esperado[0].tolist()
+    assert visita.tolist() == esperado[1].tolist()
+
+
+def test_pesos_y_orp_por_tabla():
+    df = pd.DataFrame(
+        {
+            "fase": ["FINAL", "Regular", "FINAL", None],
+            "nivel": ["A", "B", "C", "A"],
+            "local": ["X", "Y", "Z", "X"],
+            "visitante": ["Y", "NUEVO", "X", "Z"],
+        }
+    )
+    pesos = tabla_de_pesos(peso_por_fase, df["fase"], df["nivel"])
+    assert pesos.tolist() == [peso_por_fase(f, n) for f, n in zip(df["fase"], df["nivel"])]
+
+    ranking = pd.DataFrame({"Equipo": ["X", "Y", "Z"], "Puntos": [3, 2, 1]})
+    df = calculate_orp_vectorized(df, ranking)
+    assert np.allclose(df["ORP_LOCAL"], [0.0, 0.0, 1.5, -1.5])
+    assert np.allclose(df["ORP_VISITA"], [1.5, 0.0, -1.5, 1.5])
+
+
+def _partidos(anio, resultados):
+    return pd.DataFrame(
+        [
+            {"anio": anio, "categoria": "U17", "fase": "Regular", "ronda": "Ronda 1", "nivel": "A",
+             "zona": "NORTE", "grupo": "1", "jornada": j, "local": l, "ptsL": pl,
+             "visitante": v, "ptsV": pv}
+            for j, (l, pl, v, pv) in enumerate(resultados, start=1)
+        ]
+    )
+
+
+def test_actualizar_temporada_igual_a_recalcular_todo(tmp_path):
+    anterior = _partidos(2023, [("A", 70, "B", 60), ("C", 50, "D", 80), ("A", 90, "D", 40)])
+    temporada = _partidos(2024, [("A", 60, "C", 65), ("B", 70, "D", 70), ("C", 20, "B", 0)])
+    base = pd.DataFrame({"Equipo": ["A", "B", "C", "D"], "Puntos": 0})
+    incremental, completo = tmp_path / "incremental", tmp_path / "completo"
+    incremental.mkdir()
+    completo.mkdir()
+    process_all_years(pd.concat([anterior, temporada]), [2023, 2024], base, carpeta=str(incremental))
+
+    # Cambia un resultado, se quita un partido y se agrega otro
+    temporada = _partidos(2024, [("A", 60, "C", 85), ("B", 70, "D", 70), ("E", 75, "A", 74)])
+    datos = pd.concat([anterior, temporada], ignore_index=True)
+    _, ranking, total = actualizar_temporada(datos, 2024, 2023, carpeta=str(incremental))
+    process_all_years(datos, [2023, 2024], base, carpeta=str(completo))
+
+    for nombre in ["2024.csv", "Ranking2024.csv", "Ranking2019-2024.csv"]:
+        assert (incremental / nombre).read_bytes() == (completo / nombre).read_bytes()
+    assert "E" in set(ranking["Equipo"]) and "E" in set(total["Equipo"])
+
+
+def test_calcular_ranking_en_memoria(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    datos = pd.concat([
+        _partidos(2023, [("A", 70, "B", 60), ("C", 50, "D", 80)]),
+        _partidos(2024, [("a ", 60, "C", 65), ("B", 70, "D", 40)]),
+    ])
+    rankings, total = calcular_ranking([2023, 2024], data=datos)
+    assert list(tmp_path.iterdir()) == []
+    assert set(rankings) == {2023, 2024}
+    assert set(total["Equipo"]) == {"A", "B", "C", "D"}
+
+    # Un peso por año distinto escala los puntos de esa temporada
+    pesos = {"peso_anio": (lambda anio: 2 if anio == 2023 else 1, ["anio"])}
+    otros, _ = calcular_ranking([2023, 2024], data=datos, pesos=pesos)
+    assert np.allclose(otros[2023][1]["Puntos"], rankings[2023][1]["Puntos"] * 2 / 0.75)
+
+
+def test_main_crea_la_carpeta_de_salida(tmp_path, monkeypatch):
+    datos = _partidos(2023, [("A", 70, "B", 60), ("C", 50, "D", 80)])
+    monkeypatch.setattr(
+        Functions, "cargar_datos", lambda *args: Functions.crear_ranking_base(datos.copy())
+    )
+    salida = tmp_path / "no" / "existe"
+    Functions.main(["--anios", "2023", "--salida", str(salida)])
+    assert (salida / "Ranking2019-2023.csv").exists()
+
+
+def test_main_temporada_sin_anterior_es_error_de_uso(capsys):
+    with pytest.raises(SystemExit) as salida:
+        Functions.main(["--anios", "2019", "2022", "--temporada", "2019"])
+    assert salida.value.code == 2
+    assert "--temporada 2019" in capsys.readouterr().err
@@ -0,0 +1,152 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the parent directory to sys.path to resolve the ModuleNotFoundError
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from parsers.fases import parsear_fase, parsear_fases
+from parsers.grupos import parsear_grupo, parsear_grupos
+from parsers.motor_reglas import TablaReglas
+
+# Salidas de las cadenas if/elif anteriores al motor de reglas
+CASOS_FASE = [
+    (2019, "CONFERENCIA SUR 2 2DA FASE", ("Fase Regular", "2da Fase", "2", "SUR", "Desconocido")),
+    (2019, "CUARTOS DE FINAL CONF 1 NORTE", ("Playoff", "Cuartos de Final", "1", "NORTE", "Desconocido")),
+    (2019, "SUR 1RA FASE", ("Fase Regular", "1ra Fase", "Desconocido", "SUR", "Desconocido")),
+    (2022, "FASE DE CLASIFICACION 2", ("Fase Regular", "1ra Fase", "2", "Desconocida", "Desconocido")),
+    (2022, "PLAY OFF", ("Playoff", "Desconocida", "Desconocido", "Desconocida", "Desconocido")),
+    (2023, "CONFERENCIA 3 SUR A", ("Fase Regular", "2da Fase", "3", "SUR", "A")),
+    (2023, "CUARTOS DE FINAL - NORTE 2", ("Playoff", "Desconocida", "2", "NORTE", "Desconocido")),
+    (2024, "1ER ETAPA 2DA FASE", ("Fase Regular", "2da Fase", "Desconocido", "Desconocida", "Desconocido")),
+    (2024, "PLAY OFF -NIVEL 2", ("Playoff", "Desconocida", 2, "Desconocida", "Desconocido")),
+    (2025, "1ER ETAPA", ("Fase Regular", "Copa Febamba", "NIVELACION", "Desconocida", "Desconocido")),
+    (2026, "1ER ETAPA", ("Desconocida", "Desconocida", "Desconocido", "Desconocida", "Desconocido")),
+]
+
+CASOS_GRUPO = [
+    (2019, "SUR 1RA FASE", "CONFERENCIA NORTE 1 A", ("1", "NORTE", "A")),
+    (2019, "CONFERENCIA SUR 2 2DA FASE", "ZONA SUR A 2", ("2", "SUR", "A")),
+    (2022, "FASE DE CLASIFICACION", "SUR 2B", ("2", "SUR", "B")),
+    (2023, "CONFERENCIA 2", 'NORTE 2"A"', ("2", "NORTE", "A")),
+    (2023, "FASE REGULAR", "CENTRO 1 A", ("1", "CENTRO", "UNICO")),
+    (2024, "FASE FINAL", 'NIVEL 1 SUR "A"', ("1", "SUR", "A")),
+    (2024, "1ER ETAPA 2DA FASE", "NIVEL 2 NORTE A-B", ("2", "NORTE", "A-B")),
+    (2025, "1ER ETAPA", "CENTRO OESTE 4", ("NIVELACION", "CENTRO OESTE", "4")),
+    (2026, "1ER ETAPA", "CENTRO 4", ("Desconocido", "Desconocido", "CENTRO 4")),
+    (2024, "FASE FINAL", "", ("Desconocido", "Desconocido", "Desconocido")),
+]
+
+
+@pytest.mark.parametrize("year, fase_text, esperado", CASOS_FASE)
+def test_parsear_fase(year, fase_text, esperado):
+    resultado = parsear_fase(year, fase_text)
+    assert tuple(resultado[k] for k in ("fase", "ronda", "nivel", "zona", "grupo")) == esperado
+
+
+@pytest.mark.parametrize("year, fase_text, grupo_text, esperado", CASOS_GRUPO)
+def test_parsear_grupo(year, fase_text, grupo_text, esperado):
+    resultado = parsear_grupo(year, fase_text, grupo_text)
+    assert tuple(resultado[k] for k in ("nivel", "zona", "grupo")) == esperado
+
+
+def test_lotes_iguales_a_llamadas_sueltas():
+    fases = ["CONFERENCIA 3 SUR A", "PLAY OFF", "CONFERENCIA 3 SUR A"]
+    assert parsear_fases(2023, fases) == [parsear_fase(2023, f) for f in fases]
+    pares = [("CONFERENCIA 2", 'NORTE 2"A"'), ("FASE REGULAR", "CENTRO 1 A")] * 2
+    assert parsear_grupos(2023, pares) == [parsear_grupo(2023, *p) for p in pares]
+    # Cada resultado es un diccionario propio
+    lote = parsear_fases(2023, fases)
+    lote[0]["zona"] = "X"
+    assert lote[2]["zona"] == "SUR"
+
+
+def test_motor_elif_todas_y_ajustes():
+    tabla = TablaReglas(
+        {
+            "objetivo": "texto",
+            "inicial": {"a": None, "b": None},
+            "temporadas": {
+                "2030": {
+                    "reglas": [
+                        {"si": {"texto": {"contiene": ["X"]}}, "fijar": {"a": "x"}},
+                        {"si": {"texto": {"contiene": ["Y"]}}, "fijar": {"a": "y"}},
+                        {
+                            "todas": True,
+                            "reglas": [
+                                {"extraer": [[{"patron": r"(\d+)", "campos": {"b": "N{1}"}}]]},
+                                {"ajustes": {"b": [{"mapear": {"N1": "uno"}}]}},
+                            ],
+                            "nota": "se ignora",
+                        },
+                    ]
+                }
+            },
+        }
+    )
+    assert tabla.aplicar(2030, {"texto": "XY 1"}) == {"a": "x", "b": None}
+    assert tabla.aplicar(2030, {"texto": "Z 1"}) == {"a": None, "b": "uno"}
+    assert tabla.aplicar(2030, {"texto": "Z 7"}) == {"a": None, "b": "N7"}
+    assert tabla.aplicar(2031, {"texto": "X"}) == {"a": None, "b": None}
+
+
+# Con estos textos la función original de 2023 lanzaba IndexError
+# (fase.split("CONFERENCIA")[1] sin token): no debe quedar un resultado a medias
+@pytest.mark.parametrize("grupo_text", ["CENTRO", "NORTE", "SUR A"])
+def test_parsear_grupo_sin_nivel_en_la_fase(grupo_text):
+    with pytest.raises(ValueError):
+        parsear_grupo(2023, "CONFERENCIA", grupo_text)
+
+
+@pytest.mark.parametrize(
+    "fase_text, grupo_text, esperado",
+    [
+        ("CONFERENCIA 1 OCTAVOS DE FINAL", "CENTRO 1", ("1", "CENTRO", "UNICO")),
+        ("CONFERENCIA OCTAVOS DE FINAL", "NORTE", ("OCTAVOS", "NORTE", "UNICO")),
+        ("CONFERENCIA", "CENTRO 1", ("1", "CENTRO", "UNICO")),
+    ],
+)
+def test_parsear_grupo_nivel_desde_la_fase(fase_text, grupo_text, esperado):
+    resultado = parsear_grupo(2023, fase_text, grupo_text)
+    assert tuple(resultado[k] for k in ("nivel", "zona", "grupo")) == esperado
+
+
+def test_motor_alternativa_requerida():
+    def tabla(requerido):
+        alternativa = {"patron": r"N(\d)", "campos": {"n": 1}, "requerido": requerido}
+        return TablaReglas(
+            {
+                "objetivo": "texto",
+                "inicial": {"n": "?"},
+                "temporadas": {"2030": {"extraer": [[alternativa]]}},
+            }
+        )
+
+    assert tabla(True).aplicar(2030, {"texto": "N4"}) == {"n": "4"}
+    assert tabla(False).aplicar(2030, {"texto": "X"}) == {"n": "?"}
+    valores = {"n": "?"}
+    with pytest.raises(ValueError):
+        tabla(True).aplicar(2030, {"texto": "X"}, valores)
+    assert valores == {"n": "?"}
+
+
+def test_motor_preparar_afecta_a_las_reglas_siguientes():
+    tabla = TablaReglas(
+        {
+            "objetivo": "texto",
+            "inicial": {"a": None},
+            "temporadas": {
+                "2030": {
+                    "todas": True,
+                    "reglas": [
+                        {"preparar": {"texto": [{"reemplazar": ["0", "O"]}]}},
+                        {"si": {"texto": {"igual": "OESTE"}}, "fijar": {"a": "oeste"}},
+                    ],
+                }
+            },
+        }
+    )
+    textos = {"texto": "0ESTE"}
+    assert tabla.aplicar(2030, textos) == {"a": "oeste"}
+    assert textos == {"texto": "0ESTE"}
@@ -0,0 +1,246 @@
+import asyncio
+import sys
+import threading
+from pathlib import Path
+
+# Add the parent directory to sys.path to resolve the ModuleNotFoundError
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+import httpx
+import pytest
+
+from utils import requester
+from utils.requester import (
+    LimitadorSolicitudes,
+    SesionAsync,
+    SolicitudFallida,
+    hacer_solicitud_async,
+    hacer_solicitudes_async,
+)
+
+URL = "https://competicionescabb.gesdeportiva.es/competicion.aspx?competencia=1623"
+
+
+class Reloj:
+    def __init__(self, ahora=100.0):
+        self.ahora = ahora
+
+    def __call__(self):
+        return self.ahora
+
+
+class Respuesta:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.content = b""
+
+
+def _limitador(**kwargs):
+    reloj = Reloj()
+    return LimitadorSolicitudes(4.0, reloj=reloj, **kwargs), reloj
+
+
+@pytest.mark.parametrize("status", [429, 500, 503, None])
+def test_baja_a_la_mitad_ante_errores(status):
+    limitador, reloj = _limitador()
+    limitador.registrar(URL, status)
+    assert limitador.tasa(URL) == 2.0
+    # Dentro del enfriamiento la misma ráfaga de errores no vuelve a bajar
+    limitador.registrar(URL, status)
+    assert limitador.tasa(URL) == 2.0
+    reloj.ahora += limitador.ENFRIAMIENTO
+    limitador.registrar(URL, status)
+    assert limitador.tasa(URL) == 1.0
+    # Nunca por debajo del mínimo
+    for _ in range(10):
+        reloj.ahora += limitador.ENFRIAMIENTO
+        limitador.registrar(URL, status)
+    assert limitador.tasa(URL) == pytest.approx(limitador.minimo)
+
+
+def test_pico_de_latencia_baja_el_ritmo():
+    limitador, reloj = _limitador()
+    for _ in range(5):
+        reloj.ahora += 1
+        limitador.registrar(URL, 200, 0.1)
+    subida = limitador.tasa(URL)
+    assert subida == pytest.approx(4.0 + 5 * limitador.paso)
+    reloj.ahora += 1
+    limitador.registrar(URL, 200, 0.25)
+    assert limitador.tasa(URL) == pytest.approx(subida + limitador.paso)
+    reloj.ahora += 1
+    limitador.registrar(URL, 200, 1.0)
+    assert limitador.tasa(URL) == pytest.approx((subida + limitador.paso) / 2)
+    # El pico entra acotado a FACTOR_PICO_LATENCIA veces la media anterior
+    media = limitador._cubo(URL).latencia_media
+    assert media < 0.2
+
+
+def test_retry_after_frena_al_host():
+    limitador, reloj = _limitador()
+    original = requester.LIMITADOR
+    requester.LIMITADOR = limitador
+    try:
+        requester._registrar_respuesta(URL, Respuesta(429, {"Retry-After": "5"}), 0.1)
+    finally:
+        requester.LIMITADOR = original
+    assert limitador.tasa(URL) == 2.0
+    assert limitador.reservar(URL) >= 5.0
+    # Pasado el Retry-After el turno vuelve a ser inmediato
+    reloj.ahora += 10
+    assert limitador.reservar(URL) == 0.0
+    # Otros hosts no se ven afectados
+    assert limitador.reservar("https://otro.host/") == 0.0
+
+
+def test_penalizar_no_acorta_una_espera_mayor():
+    limitador, _ = _limitador()
+    limitador.penalizar(URL, 10)
+    limitador.penalizar(URL, 1)
+    assert limitador.reservar(URL) >= 10.0
+
+
+def test_suba_hasta_el_maximo():
+    limitador, reloj = _limitador(maximo=5.0)
+    for _ in range(100):
+        reloj.ahora += 0.1
+        limitador.registrar(URL, 200, 0.1)
+    assert limitador.tasa(URL) == 5.0
+
+
+def test_tope_en_vuelo_compartido_entre_hilos_y_corutinas():
+    limitador, _ = _limitador(max_en_vuelo=1)
+
+    async def pedir():
+        async with limitador.en_vuelo_async(URL):
+            return True
+
+    # Un hilo ocupa el único lugar: la corutina espera
+    with limitador.en_vuelo(URL):
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(asyncio.wait_for(pedir(), 0.05))
+    assert asyncio.run(asyncio.wait_for(pedir(), 1))
+    # Y la corutina cancelada no se quedó con el lugar
+    assert limitador.en_vuelo(URL).ocupar(bloquear=False)
+
+
+def test_corutina_despierta_al_liberar_un_hilo():
+    limitador, _ = _limitador(max_en_vuelo=1)
+    cupo = limitador.en_vuelo(URL)
+    cupo.ocupar()
+    threading.Timer(0.05, cupo.liberar).start()
+
+    async def pedir():
+        async with limitador.en_vuelo_async(URL):
+            return not cupo.ocupar(bloquear=False)
+
+    assert asyncio.run(asyncio.wait_for(pedir(), 1))
+    assert cupo.ocupar(bloquear=False)
+
+
+def test_corutinas_toman_el_lugar_en_orden():
+    limitador, _ = _limitador(max_en_vuelo=1)
+    orden = []
+
+    async def pedir(i):
+        async with limitador.en_vuelo_async(URL):
+            orden.append(i)
+            await asyncio.sleep(0)
+
+    async def todas():
+        await asyncio.gather(*(pedir(i) for i in range(5)))
+
+    asyncio.run(todas())
+    assert orden == [0, 1, 2, 3, 4]
+
+
+@pytest.fixture
+def sin_backoff(monkeypatch):
+    dormir = asyncio.sleep
+    monkeypatch.setattr(requester.asyncio, "sleep", lambda *_: dormir(0))
+    monkeypatch.setattr(requester, "LIMITADOR", None)
+    monkeypatch.setattr(requester, "CACHE", None)
+
+
+def _pedir(responder, *urls, **kwargs):
+    pedidos = []
+
+    async def manejar(request):
+        pedidos.append(str(request.url))
+        return await responder(request)
+
+    async def correr():
+        async with SesionAsync(transport=httpx.MockTransport(manejar)) as sesion:
+            if len(urls) == 1:
+                return await hacer_solicitud_async(urls[0], sesion, **kwargs)
+            return await hacer_solicitudes_async(list(urls), sesion, **kwargs)
+
+    return asyncio.run(correr()), pedidos
+
+
+def test_async_404_no_reintenta(sin_backoff):
+    async def responder(request):
+        return httpx.Response(404)
+
+    contenido, pedidos = _pedir(responder, URL, max_intentos=3, lanzar_si_falla=True)
+    assert contenido is None
+    assert pedidos == [URL]
+
+
+def test_async_5xx_reintenta_y_devuelve_none(sin_backoff):
+    async def responder(request):
+        return httpx.Response(503)
+
+    contenido, pedidos = _pedir(responder, URL, max_intentos=3)
+    assert contenido is None
+    assert pedidos == [URL] * 3
+    with pytest.raises(SolicitudFallida):
+        _pedir(responder, URL, max_intentos=2, lanzar_si_falla=True)
+
+
+def test_async_reintenta_hasta_recuperarse(sin_backoff):
+    respuestas = iter([httpx.Response(500), httpx.Response(200, content=b"ok")])
+
+    async def responder(request):
+        return next(respuestas)
+
+    contenido, pedidos = _pedir(responder, URL, max_intentos=3)
+    assert contenido == b"ok"
+    assert len(pedidos) == 2
+
+
+def test_async_varias_urls_en_orden(sin_backoff):
+    urls = [f"{URL}{i}" for i in range(5)]
+
+    async def responder(request):
+        i = int(str(request.url)[-1])
+        # Las primeras tardan más, así que terminan después
+        await asyncio.sleep(0.01 * (5 - i))
+        return httpx.Response(200, content=str(i).encode())
+
+    contenidos, _ = _pedir(responder, *urls)
+    assert contenidos == [b"0", b"1", b"2", b"3", b"4"]
+
+
+def test_async_cancelacion_no_reintenta_y_libera_el_cupo(monkeypatch, sin_backoff):
+    limitador, _ = _limitador(max_en_vuelo=1)
+    monkeypatch.setattr(requester, "LIMITADOR", limitador)
+    pedidos = []
+
+    async def colgado(request):
+        pedidos.append(request.url)
+        await asyncio.Event().wait()
+
+    async def correr():
+        async with SesionAsync(transport=httpx.MockTransport(colgado)) as sesion:
+            tarea = asyncio.create_task(hacer_solicitud_async(URL, sesion))
+            while not pedidos:
+                await asyncio.sleep(0)
+            tarea.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await tarea
+
+    asyncio.run(correr())
+    assert len(pedidos) == 1
+    assert limitador.en_vuelo(URL).ocupar(bloquear=False)
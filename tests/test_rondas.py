@@ -0,0 +1,67 @@
+import json
+import os
+import sys
+from pathlib import Path
+
+# Add the parent directory to sys.path to resolve the ModuleNotFoundError
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from mapeos.loader import RegistroMapeos, cargar_mapeo_equipos
+from parsers import rondas
+from parsers.rondas import inferir_ronda
+
+EQUIPOS_MAP = cargar_mapeo_equipos()
+
+
+def _final_four(anio, categoria, jornada, local, visitante):
+    return inferir_ronda(
+        anio, categoria, "1", "SUR", jornada, "Final Four", local, visitante, EQUIPOS_MAP
+    )
+
+
+def test_final_four_2022_por_llave_en_ambos_sentidos():
+    semifinal = _final_four(2022, "CADETES", "1", "PINOCHO", "CAÑUELAS FC - Sub17")
+    assert (semifinal["ronda"], semifinal["nivel"]) == ("SEMIFINAL", "1")
+    final = _final_four(2022, "Cadetes", "9", "CAZA Y PESCA A", "PINOCHO")
+    assert (final["ronda"], final["nivel"]) == ("FINAL", "1")
+    assert _final_four(2022, "CADETES", "1", "PINOCHO", "OTRO CLUB") is None
+
+
+def test_final_four_generica_con_respaldo_por_jornada():
+    assert _final_four(2023, "JUVENILES", "1", "EL TALAR", "VICTORIA")["ronda"] == "FINAL"
+    assert _final_four(2024, "JUVENILES", "2", "OTRO CLUB", "VICTORIA")["ronda"] == "FINAL"
+    assert _final_four(2019, "JUVENILES", "X", "EL TALAR", "VICTORIA")["ronda"] is None
+    assert _final_four(2025, "JUVENILES", "1", "EL TALAR", "VICTORIA") is None
+
+
+def test_editar_llaves_reconstruye_el_indice(tmp_path, monkeypatch):
+    path = tmp_path / "llaves_playoffs.json"
+    datos = {
+        "temporadas": {"2022": {"final_four": "ff", "ronda_por_jornada": False}},
+        "llaves": {"ff": {"CADETES": [{"ronda": "SEMIFINAL", "nivel": "1", "llave": ["A", "B"]}]}},
+    }
+    path.write_text(json.dumps(datos), encoding="utf-8")
+    monkeypatch.setattr(rondas, "REGISTRO", RegistroMapeos(str(tmp_path)))
+    assert _final_four(2022, "CADETES", "1", "A", "B")["ronda"] == "SEMIFINAL"
+    assert _final_four(2022, "CADETES", "1", "A", "C") is None
+
+    datos["llaves"]["ff"]["CADETES"].append({"ronda": "FINAL", "nivel": "1", "llave": ["A", "C"]})
+    path.write_text(json.dumps(datos), encoding="utf-8")
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1_000_000))
+    assert _final_four(2022, "CADETES", "1", "A", "C")["ronda"] == "FINAL"
+    # Otro mapa de equipos tiene su propio índice
+    otro = {"A": "Z"}
+    assert inferir_ronda(2022, "CADETES", "1", "", "1", "Final Four", "A", "B", otro)["llave"] == "Z-B"
+
+
+def test_indice_de_llaves_uno_por_mapa_vigente(monkeypatch):
+    registro = RegistroMapeos()
+    monkeypatch.setattr(rondas, "REGISTRO", registro)
+    indice = rondas._indice_llaves(EQUIPOS_MAP)
+    assert rondas._indice_llaves(EQUIPOS_MAP) is indice
+    otro = dict(EQUIPOS_MAP)
+    assert rondas._indice_llaves(otro) is not indice
+    # El índice del mapa nuevo reemplaza al anterior en vez de sumarse
+    indices = registro._entradas["llaves_playoffs.json"][2]
+    assert list(indices) == ["llaves_normalizadas"]
+    assert indices["llaves_normalizadas"][0] is otro
@@ -0,0 +1,58 @@
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+# Add the parent directory to sys.path to resolve the ModuleNotFoundError
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+import pytest
+
+from scraper.main import FebambaScraper
+from utils import requester
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+# Dos categorías, tres fases y tres grupos por fase: 18 páginas de partidos
+QUITAR = rb'<option[^>]*value="(?:300[3-7]|700[3-9]|701\d)"[^>]*>[^<]*</option>'
+PAGINAS = {
+    nombre: re.sub(QUITAR, b"", (FIXTURES / f"{nombre}.html").read_bytes())
+    for nombre in ("competicion", "categoria", "fase", "grupo")
+}
+TORNEO = {
+    "Anio": 2025,
+    "id": 1,
+    "url": "https://sitio/competicion.aspx?competencia=1",
+    "torneo": "FORMATIVAS 2025",
+}
+
+
+def _sitio(url):
+    """Devuelve la página de prueba según el nivel de la URL, con una demora variable."""
+    time.sleep(random.Random(url).uniform(0, 0.003))
+    parametros = parse_qs(urlsplit(url).query)
+    for nivel, nombre in (("grupo", "grupo"), ("fase", "fase"), ("categoria", "categoria")):
+        if nivel in parametros:
+            return PAGINAS[nombre]
+    return PAGINAS["competicion"]
+
+
+def _scrapear(max_workers):
+    scraper = FebambaScraper(base_url="", max_workers=max_workers)
+    scraper._hacer_solicitud = _sitio
+    return scraper.scrap_torneo(dict(TORNEO))
+
+
+@pytest.fixture(autouse=True)
+def sin_limitador(monkeypatch):
+    # FebambaScraper configura el limitador global del requester
+    monkeypatch.setattr(requester, "LIMITADOR", None)
+
+
+def test_concurrente_en_el_mismo_orden_que_en_serie():
+    serie = _scrapear(1)
+    assert serie
+    # Distintas categorías y grupos, para que el orden sea significativo
+    assert len({(p["categoria"], p["zona"], p["nivel"]) for p in serie}) > 1
+    assert _scrapear(8) == serie
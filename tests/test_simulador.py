@@ -0,0 +1,57 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add the parent directory to sys.path to resolve the ModuleNotFoundError
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from analisis.Ranking.Functions import calcular_ranking
+from analisis.Ranking.simulador import SimuladorRanking
+
+
+def _partidos(anio, resultados):
+    return pd.DataFrame(
+        [
+            {"anio": anio, "categoria": "U17", "fase": "Regular", "ronda": "Ronda 1", "nivel": "A",
+             "grupo": "1", "jornada": j, "local": l, "ptsL": pl, "visitante": v, "ptsV": pv}
+            for j, (l, pl, v, pv) in enumerate(resultados, start=1)
+        ]
+    )
+
+
+DATOS = pd.concat([
+    _partidos(2023, [("A", 70, "B", 60), ("C", 50, "D", 80), ("A", 90, "D", 40)]),
+    _partidos(2024, [("A", 60, "C", 65), ("B", 70, "D", 72), ("C", 80, "B", 50)]),
+], ignore_index=True)
+
+
+def test_simular_igual_a_recalcular():
+    simulador = SimuladorRanking.desde_datos(DATOS, [2023, 2024])
+    # Se da vuelta B-D (jornada 2) y se agrega un partido nuevo A-B
+    escenario = pd.DataFrame(
+        {"jornada": [2, 4], "local": ["B", "A"], "visitante": ["D", "B"], "ptsL": [90, 75], "ptsV": [60, 70]}
+    )
+    ranking = simulador.simular(escenario)
+
+    datos = DATOS.copy()
+    datos.loc[(datos["anio"] == 2024) & (datos["jornada"] == 2), ["ptsL", "ptsV"]] = [90, 60]
+    nuevo = _partidos(2024, [("A", 75, "B", 70)]).assign(jornada=4, fase=None, ronda=None, nivel=None)
+    _, esperado = calcular_ranking([2023, 2024], data=pd.concat([datos, nuevo], ignore_index=True))
+
+    assert ranking["Equipo"].tolist() == esperado["Equipo"].tolist()
+    assert np.allclose(ranking["Puntos"], esperado["Puntos"])
+    assert (ranking["Cambio"] == ranking["PosicionActual"] - ranking["Posicion"]).all()
+
+
+def test_simular_lote_por_escenario():
+    simulador = SimuladorRanking.desde_datos(DATOS, [2023, 2024])
+    escenario = pd.DataFrame({"jornada": [2], "local": ["B"], "visitante": ["D"]})
+    # Escenario 0: el resultado real; escenario 1: gana B
+    lote = simulador.simular_lote(escenario, [[70], [90]], [[72], [60]])
+    assert lote["puntos"].shape == (2, len(simulador.equipos))
+    assert np.allclose(lote["puntos"][0], simulador.puntos)
+    b, d = simulador.equipos.get_indexer(["B", "D"])
+    assert lote["puntos"][1, b] > lote["puntos"][0, b]
+    assert lote["puntos"][1, d] < lote["puntos"][0, d]
@@ -0,0 +1,116 @@
+import asyncio
+import functools
+import json
+import sys
+from pathlib import Path
+
+# Add the parent directory to sys.path to resolve the ModuleNotFoundError
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+import httpx
+import pytest
+
+from pipelines import torneos_ges
+from utils import requester
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+COMPETICION = (FIXTURES / "competicion.html").read_bytes()
+ERROR = (
+    '<html><body><div class="col-12 tituloPagina">Error al cargar la información</div>'
+    "</body></html>"
+).encode("utf-8")
+
+
+@pytest.fixture(autouse=True)
+def sin_esperas(monkeypatch):
+    dormir = asyncio.sleep
+    monkeypatch.setattr(requester.asyncio, "sleep", lambda *_: dormir(0))
+    monkeypatch.setattr(requester, "LIMITADOR", None)
+    monkeypatch.setattr(requester, "CACHE", None)
+
+
+def _sitio(monkeypatch, competencias=(), caidos=()):
+    """Simula el sitio: `competencias` existen, `caidos` responden 500 y el resto es vacío."""
+    pedidos = []
+
+    def responder(request):
+        comp_id = int(request.url.params["competencia"])
+        pedidos.append(comp_id)
+        if comp_id in caidos:
+            return httpx.Response(500)
+        return httpx.Response(200, content=COMPETICION if comp_id in competencias else ERROR)
+
+    monkeypatch.setattr(
+        torneos_ges,
+        "SesionAsync",
+        functools.partial(requester.SesionAsync, transport=httpx.MockTransport(responder)),
+    )
+    return pedidos
+
+
+def test_parsear_competencia():
+    competencia = torneos_ges.parsear_competencia(1623, COMPETICION)
+    assert competencia == {
+        "id": 1623,
+        "url": torneos_ges.URL_COMPETENCIA.format(id=1623),
+        "federacion": "FEDERACION DE BASQUETBOL DEL AREA METROPOLITANA DE BUENOS AIRES",
+        "torneo": "FORMATIVAS 2025",
+    }
+
+
+@pytest.mark.parametrize("html", [None, b"", ERROR, b"<html><body></body></html>"])
+def test_parsear_competencia_vacia(html):
+    assert torneos_ges.parsear_competencia(7, html) is None
+
+
+def test_descubrir_corta_tras_max_vacios(monkeypatch):
+    pedidos = _sitio(monkeypatch, competencias={10, 12})
+    encontradas = asyncio.run(torneos_ges.descubrir(10, workers=1, max_vacios=3))
+    assert sorted(encontradas) == [10, 12]
+    assert pedidos == [10, 11, 12, 13, 14, 15]
+
+
+def test_descubrir_no_cuenta_fallas_como_vacios(monkeypatch):
+    pedidos = _sitio(monkeypatch, competencias={10, 15}, caidos={11, 12, 13})
+    fallidos = set()
+    registrados = []
+    encontradas = asyncio.run(
+        torneos_ges.descubrir(
+            10, workers=1, max_vacios=2, fallidos=fallidos, al_fallar=registrados.append
+        )
+    )
+    # 11-13 fallaron: solo 14 cuenta como vacío, así que se llega a 15
+    assert sorted(encontradas) == [10, 15]
+    assert fallidos == {11, 12, 13}
+    assert registrados == [11, 12, 13]
+    assert pedidos.count(11) == 3
+
+
+def test_descubrir_reintenta_fallidos_previos(monkeypatch):
+    pedidos = _sitio(monkeypatch, competencias={3, 20}, caidos={5})
+    fallidos = {3, 4, 5}
+    encontradas = asyncio.run(
+        torneos_ges.descubrir(20, hasta=21, workers=1, fallidos=fallidos)
+    )
+    assert sorted(encontradas) == [3, 20]
+    assert fallidos == {5}
+    assert pedidos[:3] == [3, 4, 5]
+
+
+def test_fallidos_persisten_entre_corridas(tmp_path):
+    ruta_json = tmp_path / "gesdeportiva.json"
+    ruta_jsonl = tmp_path / "gesdeportiva.jsonl"
+    ruta_jsonl.write_text(
+        json.dumps({"fallido": 8}) + "\n" + json.dumps({"fallido": 9}) + "\n"
+        + json.dumps({"id": 9, "url": "u9"}) + "\n",
+        encoding="utf-8",
+    )
+    indice = torneos_ges.cargar_indice(str(ruta_json), str(ruta_jsonl))
+    assert list(indice) == [9]
+    fallidos = torneos_ges.cargar_fallidos(str(ruta_json), str(ruta_jsonl))
+    assert fallidos == {8}
+
+    torneos_ges.guardar_indice(indice, str(ruta_json), fallidos)
+    ruta_jsonl.write_text("", encoding="utf-8")
+    assert torneos_ges.cargar_fallidos(str(ruta_json), str(ruta_jsonl)) == {8}
+    assert torneos_ges.cargar_indice(str(ruta_json), str(ruta_jsonl)) == indice
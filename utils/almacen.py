@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+"""
+Almacén columnar de partidos: un dataset Parquet particionado por anio y
+categoria (Data/almacen/partidos.parquet/anio=YYYY/categoria=X/), con tipos
+fijos para todas las temporadas. Los textos repetidos (equipos, fase, zona,
+grupo...) se guardan como diccionarios, los tantos como enteros y la fecha
+ya parseada. cargar_partidos lee solo las particiones y columnas pedidas; si
+el almacén todavía no se generó (p. ej. en un clon nuevo), arma los mismos
+partidos en memoria desde los Data/partidos_*.csv versionados.
+"""
+
+import glob
+import operator
+import os
+import re
+import shutil
+from typing import Iterable, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from utils.dataframes import guardar_dataframe
+from utils.logger import get_logger
+
+logger = get_logger("Almacen")
+
+# Ruta sin extensión, como la recibe guardar_dataframe
+RUTA_ALMACEN = os.path.join("Data", "almacen", "partidos")
+PARTICIONES = ["anio", "categoria"]
+# CSV por temporada (separados por ';') de los que se arma el almacén; otros CSV
+# de Data/, como el <fecha>.csv del scraping completo, tienen otro formato
+CARPETA_TEMPORADAS = "Data"
+PATRON_TEMPORADAS = "partidos_*.csv"
+
+# Columnas de texto con pocos valores distintos: se guardan como diccionario
+COLUMNAS_CATEGORICAS = ["fase", "ronda", "nivel", "zona", "grupo", "local", "visitante"]
+COLUMNAS_ENTERAS = ["jornada", "ptsL", "ptsV"]
+
+_PARTICIONADO = ds.partitioning(
+    pa.schema([("anio", pa.int16()), ("categoria", pa.string())]), flavor="hive"
+)
+
+
+def archivos_temporadas(carpeta: str = CARPETA_TEMPORADAS) -> List[str]:
+    """Rutas de los CSV por temporada (Data/partidos_YYYY.csv), ordenadas."""
+    return sorted(
+        ruta for ruta in glob.glob(os.path.join(carpeta, PATRON_TEMPORADAS)) if os.path.isfile(ruta)
+    )
+
+
+def tipar_partidos(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Lleva un DataFrame de partidos (leído de CSV, con los tipos que haya
+    inferido pandas o todo como texto) al esquema del almacén.
+    Las filas sin anio (filas vacías de algunos CSV) se descartan.
+
+    Args:
+        df (pd.DataFrame): Partidos con las columnas de Data/partidos_YYYY.csv.
+
+    Returns:
+        pd.DataFrame: Copia tipada; las columnas extra se dejan como están.
+    """
+    anio = pd.to_numeric(df["anio"].replace("", None), errors="coerce")
+    df = df[anio.notna()].copy()
+    df["anio"] = anio[anio.notna()].astype("int16")
+    df["categoria"] = df["categoria"].astype(str)
+    for columna in COLUMNAS_ENTERAS:
+        if columna in df.columns:
+            df[columna] = pd.to_numeric(df[columna].replace("", None), errors="coerce").astype("Int16")
+    if "fecha" in df.columns:
+        df["fecha"] = pd.to_datetime(df["fecha"].replace("", None), format="%d/%m/%Y", errors="coerce")
+    for columna in COLUMNAS_CATEGORICAS:
+        if columna in df.columns:
+            valores = df[columna].replace("", None)
+            # Algunas temporadas traen números (p. ej. grupo en 2025)
+            df[columna] = valores.where(valores.isna(), valores.astype(str)).astype("category")
+    return df
+
+
+def guardar_partidos(df: pd.DataFrame, ruta: str = RUTA_ALMACEN, reemplazar_todo: bool = False):
+    """
+    Escribe partidos en el almacén. Las temporadas presentes en `df`
+    reemplazan por completo a las que ya estaban; las demás no se tocan.
+
+    Args:
+        df (pd.DataFrame): Partidos (tipados o no).
+        ruta (str): Ruta del almacén sin extensión.
+        reemplazar_todo (bool): Si es True se borra el almacén entero antes de escribir.
+    """
+    df = tipar_partidos(df)
+    carpeta = f"{ruta}.parquet"
+    if reemplazar_todo and os.path.isdir(carpeta):
+        shutil.rmtree(carpeta)
+    for anio in df["anio"].unique():
+        particion = os.path.join(carpeta, f"anio={anio}")
+        if os.path.isdir(particion):
+            shutil.rmtree(particion)
+    os.makedirs(os.path.dirname(carpeta) or ".", exist_ok=True)
+    guardar_dataframe(df, ruta, formato="parquet", particiones=PARTICIONES)
+
+
+def _en(valores: Iterable) -> List:
+    return list(valores) if not isinstance(valores, (str, int)) else [valores]
+
+
+_OPERADORES = {
+    "==": operator.eq, "=": operator.eq, "!=": operator.ne,
+    "<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge,
+}
+
+
+def _filtrar(df: pd.DataFrame, condiciones: List[tuple]) -> pd.DataFrame:
+    """Aplica en pandas filtros con el formato de pyarrow ([(columna, operador, valor)])."""
+    mascara = pd.Series(True, index=df.index)
+    for columna, operador, valor in condiciones:
+        if operador in ("in", "not in"):
+            cumple = df[columna].isin(list(valor))
+            cumple = ~cumple if operador == "not in" else cumple
+        else:
+            cumple = _OPERADORES[operador](df[columna], valor)
+        mascara &= cumple.fillna(False).astype(bool)
+    return df[mascara]
+
+
+def leer_temporadas_csv(carpeta: str = CARPETA_TEMPORADAS, anios=None) -> pd.DataFrame:
+    """
+    Partidos de los CSV por temporada con los nombres de equipo normalizados y
+    el esquema de tipar_partidos: lo mismo que guarda corregir_nombres_postscrap.py
+    en el almacén.
+
+    Args:
+        carpeta (str): Carpeta con los partidos_YYYY.csv.
+        anios: Año o lista de años a leer (None = todos).
+    """
+    # Se importan acá para no cargar los mapeos ni chardet cuando existe el almacén
+    from mapeos.loader import map_series
+    from utils.open_csv import leer_csv_con_encoding_detectado
+
+    archivos = archivos_temporadas(carpeta)
+    if anios is not None:
+        pedidos = {int(a) for a in _en(anios)}
+        archivos = [
+            ruta for ruta in archivos
+            if int(re.search(r"(\d+)", os.path.basename(ruta)).group(1)) in pedidos
+        ]
+    if not archivos:
+        return tipar_partidos(pd.DataFrame({"anio": [], "categoria": []}))
+    df = pd.concat(
+        [leer_csv_con_encoding_detectado(ruta, sep=";") for ruta in archivos], ignore_index=True
+    )
+    n = len(df)
+    nombres = map_series(pd.concat([df["local"], df["visitante"]], ignore_index=True))
+    df["local"] = nombres.iloc[:n].to_numpy()
+    df["visitante"] = nombres.iloc[n:].to_numpy()
+    return tipar_partidos(df)
+
+
+def cargar_partidos(
+    anios=None,
+    categorias=None,
+    columnas: Optional[List[str]] = None,
+    filtros: Optional[List[tuple]] = None,
+    categoricas: bool = True,
+    ruta: str = RUTA_ALMACEN,
+) -> pd.DataFrame:
+    """
+    Lee partidos del almacén, abriendo solo las particiones que coinciden.
+    Si el almacén no existe los lee de los CSV por temporada de la carpeta Data/
+    que lo contiene (ver leer_temporadas_csv).
+
+    Args:
+        anios: Año o lista de años (None = todos).
+        categorias: Categoría o lista de categorías (None = todas).
+        columnas (List[str]): Columnas a leer (None = todas).
+        filtros (List[tuple]): Filtros extra en formato pyarrow, p. ej. [("zona", "==", "NORTE")].
+        categoricas (bool): Si es False las columnas de texto se devuelven como
+            object, para código que agrupa por ellas y no espera categorías vacías.
+        ruta (str): Ruta del almacén sin extensión.
+
+    Returns:
+        pd.DataFrame: Partidos con el esquema de tipar_partidos.
+    """
+    carpeta = f"{ruta}.parquet"
+    condiciones = list(filtros or [])
+    if anios is not None:
+        condiciones.append(("anio", "in", [int(a) for a in _en(anios)]))
+    if categorias is not None:
+        condiciones.append(("categoria", "in", _en(categorias)))
+
+    if os.path.isdir(carpeta):
+        df = pd.read_parquet(
+            carpeta,
+            columns=columnas,
+            filters=condiciones or None,
+            partitioning=_PARTICIONADO,
+        )
+    else:
+        # Data/almacen/partidos -> Data/
+        carpeta_csv = os.path.dirname(os.path.dirname(ruta))
+        if not archivos_temporadas(carpeta_csv):
+            raise FileNotFoundError(
+                f"No existe el almacén {carpeta} ni CSV {PATRON_TEMPORADAS} en {carpeta_csv}; "
+                f"generarlo con corregir_nombres_postscrap.py"
+            )
+        logger.warning(
+            f"No existe el almacén {carpeta}; se leen los CSV de {carpeta_csv} "
+            f"(generarlo con corregir_nombres_postscrap.py para leer más rápido)"
+        )
+        df = _filtrar(leer_temporadas_csv(carpeta_csv, anios), condiciones)
+        if columnas is not None:
+            df = df[columnas]
+        df = df.reset_index(drop=True)
+    # Las columnas de partición vuelven al principio, como en los CSV
+    df = df[[c for c in PARTICIONES if c in df.columns] + [c for c in df.columns if c not in PARTICIONES]]
+    if not categoricas:
+        for columna in df.columns:
+            if isinstance(df[columna].dtype, pd.CategoricalDtype):
+                df[columna] = df[columna].astype(object)
+    return df
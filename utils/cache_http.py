@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+"""
+Caché HTTP en disco para las páginas de gesdeportiva.
+Guarda las respuestas en SQLite, comprimidas y direccionadas por contenido,
+con TTL por temporada, revalidación ETag/Last-Modified y desalojo por tamaño.
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Callable, Dict, Optional
+
+from utils.logger import get_logger
+
+logger = get_logger("CacheHTTP")
+
+RUTA_POR_DEFECTO = os.path.join("Data", "cache", "http.sqlite")
+PATRON_COMPETENCIA = re.compile(r"competencia=(\d+)")
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS respuestas (
+    url TEXT PRIMARY KEY,
+    digest TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    descargado REAL NOT NULL,
+    accedido REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS contenidos (
+    digest TEXT PRIMARY KEY,
+    datos BLOB NOT NULL,
+    tamano INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_respuestas_accedido ON respuestas (accedido);
+CREATE INDEX IF NOT EXISTS idx_respuestas_digest ON respuestas (digest);
+"""
+
+
+class CacheHTTP:
+    """
+    Caché de respuestas HTTP indexada por URL.
+
+    Los cuerpos se guardan una sola vez por contenido (sha256) y comprimidos con zlib.
+    Cada competencia puede tener su propio TTL: None significa que la temporada está
+    cerrada y sus páginas no vencen nunca.
+
+    La hora de último acceso (para el desalojo) se anota en memoria en cada lectura
+    y se escribe en SQLite al guardar, al cerrar o cada VOLCAR_ACCESOS lecturas,
+    así que una lectura no hace ningún commit.
+    """
+
+    VOLCAR_ACCESOS = 256
+
+    def __init__(
+        self,
+        path: str = RUTA_POR_DEFECTO,
+        max_bytes: int = 512 * 1024 * 1024,
+        ttl_por_defecto: Optional[float] = 0,
+        politicas_ttl: Optional[Dict[int, Optional[float]]] = None,
+        reloj: Callable[[], float] = time.time,
+    ):
+        """
+        Args:
+            path (str): Archivo SQLite de la caché.
+            max_bytes (int): Tamaño máximo de los contenidos comprimidos.
+            ttl_por_defecto (Optional[float]): Segundos de frescura si la competencia no tiene política.
+            politicas_ttl (Dict[int, Optional[float]]): TTL por id de competencia (None = no vence).
+            reloj (Callable[[], float]): Fuente de la hora actual en segundos (inyectable en tests).
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl_por_defecto = ttl_por_defecto
+        self.politicas_ttl = dict(politicas_ttl or {})
+        self.reloj = reloj
+        self._lock = threading.Lock()
+        # url -> hora del último acceso todavía no escrito en la base
+        self._accesos: Dict[str, float] = {}
+
+        directorio = os.path.dirname(path)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(_ESQUEMA)
+        self._conn.commit()
+
+    def fijar_ttl(self, competencia: int, ttl: Optional[float]):
+        """Define el TTL de las páginas de una competencia (None = temporada cerrada)."""
+        self.politicas_ttl[int(competencia)] = ttl
+
+    def ttl_para(self, url: str) -> Optional[float]:
+        match = PATRON_COMPETENCIA.search(url)
+        if match and int(match.group(1)) in self.politicas_ttl:
+            return self.politicas_ttl[int(match.group(1))]
+        return self.ttl_por_defecto
+
+    def obtener(self, url: str) -> Optional[Dict]:
+        """
+        Busca una URL en la caché.
+
+        Returns:
+            Optional[Dict]: contenido, etag, last_modified y si la entrada sigue fresca.
+        """
+        with self._lock:
+            fila = self._conn.execute(
+                "SELECT r.etag, r.last_modified, r.descargado, c.datos "
+                "FROM respuestas r JOIN contenidos c ON r.digest = c.digest "
+                "WHERE r.url = ?",
+                (url,),
+            ).fetchone()
+            if fila is None:
+                return None
+            ahora = self.reloj()
+            self._accesos[url] = ahora
+            if len(self._accesos) >= self.VOLCAR_ACCESOS:
+                self._volcar_accesos()
+                self._conn.commit()
+
+        etag, last_modified, descargado, datos = fila
+        ttl = self.ttl_para(url)
+        return {
+            "contenido": zlib.decompress(datos),
+            "etag": etag,
+            "last_modified": last_modified,
+            "fresca": ttl is None or ahora - descargado < ttl,
+        }
+
+    @staticmethod
+    def cabeceras_condicionales(entrada: Optional[Dict]) -> Dict[str, str]:
+        """Cabeceras If-None-Match / If-Modified-Since para revalidar una entrada."""
+        cabeceras = {}
+        if entrada:
+            if entrada.get("etag"):
+                cabeceras["If-None-Match"] = entrada["etag"]
+            if entrada.get("last_modified"):
+                cabeceras["If-Modified-Since"] = entrada["last_modified"]
+        return cabeceras
+
+    def renovar(self, url: str):
+        """Marca una entrada como recién validada (respuesta 304)."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE respuestas SET descargado = ? WHERE url = ?", (self.reloj(), url)
+            )
+            self._conn.commit()
+
+    def guardar(self, url: str, contenido: bytes, headers=None):
+        """Guarda (o reemplaza) la respuesta de una URL y aplica el límite de tamaño."""
+        headers = headers or {}
+        digest = hashlib.sha256(contenido).hexdigest()
+        ahora = self.reloj()
+        with self._lock:
+            anterior = self._conn.execute(
+                "SELECT digest FROM respuestas WHERE url = ?", (url,)
+            ).fetchone()
+            existe = self._conn.execute(
+                "SELECT 1 FROM contenidos WHERE digest = ?", (digest,)
+            ).fetchone()
+            if not existe:
+                datos = zlib.compress(contenido, 6)
+                self._conn.execute(
+                    "INSERT INTO contenidos (digest, datos, tamano) VALUES (?, ?, ?)",
+                    (digest, datos, len(datos)),
+                )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO respuestas "
+                "(url, digest, etag, last_modified, descargado, accedido) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    url,
+                    digest,
+                    headers.get("ETag"),
+                    headers.get("Last-Modified"),
+                    ahora,
+                    ahora,
+                ),
+            )
+            if anterior and anterior[0] != digest:
+                self._borrar_huerfanos(anterior[0])
+            # El desalojo elige por último acceso: primero se anotan las lecturas pendientes
+            self._accesos.pop(url, None)
+            self._volcar_accesos()
+            self._desalojar()
+            self._conn.commit()
+
+    def _volcar_accesos(self):
+        """Escribe los accesos anotados en memoria (sin commit; se llama con el lock tomado)."""
+        if not self._accesos:
+            return
+        self._conn.executemany(
+            "UPDATE respuestas SET accedido = ? WHERE url = ?",
+            [(accedido, url) for url, accedido in self._accesos.items()],
+        )
+        self._accesos.clear()
+
+    def tamano_total(self) -> int:
+        with self._lock:
+            return self._tamano_total()
+
+    def _tamano_total(self) -> int:
+        return self._conn.execute(
+            "SELECT COALESCE(SUM(tamano), 0) FROM contenidos"
+        ).fetchone()[0]
+
+    def _borrar_huerfanos(self, digest: Optional[str] = None):
+        """Borra contenidos sin URLs que los referencien (todos, o solo `digest`)."""
+        if digest is None:
+            self._conn.execute(
+                "DELETE FROM contenidos WHERE digest NOT IN (SELECT digest FROM respuestas)"
+            )
+        else:
+            self._conn.execute(
+                "DELETE FROM contenidos WHERE digest = ? AND NOT EXISTS "
+                "(SELECT 1 FROM respuestas WHERE digest = ?)",
+                (digest, digest),
+            )
+
+    def _desalojar(self):
+        """Elimina las entradas menos usadas recientemente hasta respetar max_bytes."""
+        total = self._tamano_total()
+        desalojadas = 0
+        while total > self.max_bytes:
+            fila = self._conn.execute(
+                "SELECT url, digest FROM respuestas ORDER BY accedido LIMIT 1"
+            ).fetchone()
+            if fila is None:
+                break
+            self._conn.execute("DELETE FROM respuestas WHERE url = ?", (fila[0],))
+            self._borrar_huerfanos(fila[1])
+            total = self._tamano_total()
+            desalojadas += 1
+        if desalojadas:
+            logger.debug(f"Desalojadas {desalojadas} entradas, tamaño actual {total} bytes")
+
+    def cerrar(self):
+        """Escribe los accesos pendientes y cierra la base (se puede llamar más de una vez)."""
+        with self._lock:
+            if self._conn is None:
+                return
+            self._volcar_accesos()
+            self._conn.commit()
+            self._conn.close()
+            self._conn = None
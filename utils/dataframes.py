@@ -4,7 +4,10 @@ Funciones auxiliares para manipulación de DataFrames en el ETL de FEBAMBA.
 """
 
 import pandas as pd
-from typing import List
+from typing import List, Optional
+
+# Identifica un partido dentro de una temporada
+CLAVES_PARTIDO = ["categoria", "fase", "grupo", "jornada", "local", "visitante"]
 
 
 def crear_dataframe_partidos(partidos: List[dict]) -> pd.DataFrame:
@@ -26,7 +29,9 @@ def crear_dataframe_partidos(partidos: List[dict]) -> pd.DataFrame:
     return df
 
 
-def guardar_dataframe(df: pd.DataFrame, path: str, formato: str = "csv"):
+def guardar_dataframe(
+    df: pd.DataFrame, path: str, formato: str = "csv", particiones: Optional[List[str]] = None
+):
     """
     Guarda un DataFrame en formato CSV o Parquet.
 
@@ -34,10 +39,58 @@ def guardar_dataframe(df: pd.DataFrame, path: str, formato: str = "csv"):
         df (pd.DataFrame): DataFrame a guardar.
         path (str): Ruta de destino (sin extensión).
         formato (str): Formato deseado ('csv' o 'parquet').
+        particiones (List[str]): Solo Parquet: columnas por las que particionar;
+            se escribe un dataset en la carpeta <path>.parquet/col=valor/...
     """
     if formato == "csv":
         df.to_csv(f"{path}.csv", index=False, encoding="utf-8")
     elif formato == "parquet":
-        df.to_parquet(f"{path}.parquet", index=False)
+        df.to_parquet(f"{path}.parquet", index=False, partition_cols=particiones)
     else:
         raise ValueError("Formato no soportado. Usar 'csv' o 'parquet'.")
+
+
+def combinar_partidos(
+    existentes: pd.DataFrame, nuevos: pd.DataFrame, claves: List[str] = CLAVES_PARTIDO
+) -> pd.DataFrame:
+    """
+    Incorpora partidos nuevos o actualizados a un DataFrame existente.
+
+    Los partidos cuya clave ya existe se reemplazan en su misma posición;
+    los demás se agregan al final. Ambos DataFrames se comparan como texto.
+    Si `nuevos` repite una clave, gana su última aparición.
+
+    Args:
+        existentes (pd.DataFrame): Partidos ya guardados.
+        nuevos (pd.DataFrame): Partidos recién scrapeados.
+        claves (List[str]): Columnas que identifican un partido.
+
+    Returns:
+        pd.DataFrame: Partidos combinados.
+    """
+    if nuevos.empty:
+        return existentes
+    if existentes.empty:
+        return nuevos.drop_duplicates(subset=claves, keep="last").reset_index(drop=True)
+
+    columnas = list(existentes.columns)
+    existentes = existentes.fillna("").astype(str)
+    nuevos = (
+        nuevos.reindex(columns=columnas)
+        .fillna("")
+        .astype(str)
+        .drop_duplicates(subset=claves, keep="last")
+    )
+
+    indice_existentes = pd.MultiIndex.from_frame(existentes[claves])
+    indice_nuevos = pd.MultiIndex.from_frame(nuevos[claves])
+
+    reemplazar = indice_existentes.isin(indice_nuevos)
+    if reemplazar.any():
+        por_clave = nuevos.set_index(indice_nuevos)
+        existentes.loc[reemplazar, columnas] = por_clave.loc[
+            indice_existentes[reemplazar], columnas
+        ].to_numpy()
+
+    agregados = nuevos[~indice_nuevos.isin(indice_existentes)]
+    return pd.concat([existentes, agregados], ignore_index=True)
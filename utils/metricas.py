@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+"""
+Métricas de solicitudes HTTP para el ETL de FEBAMBA.
+Acumula, por tipo de página (competicion/categoria/fase/grupo), latencias en un
+histograma de buckets fijos, reintentos, 404, bytes y aciertos de caché.
+Registrar una solicitud es un lock y una búsqueda binaria, así que puede
+quedar activo siempre; al final de la corrida se exporta un resumen JSON/CSV.
+"""
+
+import bisect
+import csv
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from utils.logger import get_logger
+
+logger = get_logger("Metricas")
+
+DIRECTORIO_METRICAS = os.path.join("Data", "metricas")
+
+# Del nivel más profundo al más general: una URL de grupo también trae fase y categoría
+NIVELES_URL = ("grupo", "fase", "categoria", "competencia")
+NOMBRES_PATRON = {"competencia": "competicion"}
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+def patron_url(url: str) -> str:
+    """
+    Clasifica una URL del sitio según el nivel más profundo de su query string.
+
+    Returns:
+        str: 'grupo', 'fase', 'categoria', 'competicion' u 'otro'.
+    """
+    parametros = parse_qs(urlsplit(url).query)
+    for nivel in NIVELES_URL:
+        if nivel in parametros:
+            return NOMBRES_PATRON.get(nivel, nivel)
+    return "otro"
+
+
+class HistogramaLatencia:
+    """
+    Histograma de latencias con buckets geométricos (1 ms a ~2 min, factor 1.25).
+    Los percentiles se estiman con el límite superior del bucket, con error
+    relativo menor al 25% y sin guardar las muestras.
+    """
+
+    LIMITES: Tuple[float, ...] = tuple(0.001 * 1.25**i for i in range(53))
+
+    def __init__(self):
+        self.conteos = [0] * (len(self.LIMITES) + 1)
+        self.n = 0
+        self.suma = 0.0
+        self.maximo = 0.0
+
+    def agregar(self, segundos: float):
+        self.conteos[bisect.bisect_left(self.LIMITES, segundos)] += 1
+        self.n += 1
+        self.suma += segundos
+        if segundos > self.maximo:
+            self.maximo = segundos
+
+    def percentil(self, p: float) -> Optional[float]:
+        """Latencia (segundos) por debajo de la cual queda el p% de las muestras."""
+        if self.n == 0:
+            return None
+        objetivo = p / 100 * self.n
+        acumulado = 0
+        for i, conteo in enumerate(self.conteos):
+            acumulado += conteo
+            if acumulado >= objetivo:
+                limite = self.LIMITES[i] if i < len(self.LIMITES) else self.maximo
+                return min(limite, self.maximo)
+        return self.maximo
+
+    def media(self) -> Optional[float]:
+        return self.suma / self.n if self.n else None
+
+
+class _MetricasPatron:
+    def __init__(self):
+        self.solicitudes = 0
+        self.respuestas: Dict[str, int] = {}
+        self.errores_conexion = 0
+        self.reintentos = 0
+        self.bytes = 0
+        self.cache_fresca = 0
+        self.cache_revalidada = 0
+        self.latencia = HistogramaLatencia()
+
+
+class Metricas:
+    """Contadores de solicitudes por patrón de URL, seguros entre hilos y corutinas."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._patrones: Dict[str, _MetricasPatron] = {}
+        self.inicio = datetime.now()
+
+    def _patron(self, url: str) -> _MetricasPatron:
+        patron = patron_url(url)
+        metricas = self._patrones.get(patron)
+        if metricas is None:
+            metricas = self._patrones[patron] = _MetricasPatron()
+        return metricas
+
+    def registrar_respuesta(
+        self, url: str, status: Optional[int], latencia: float, tamano: int = 0
+    ):
+        """
+        Registra un intento de solicitud que llegó a la red.
+
+        Args:
+            url (str): URL solicitada.
+            status (Optional[int]): Código HTTP, o None si falló la conexión.
+            latencia (float): Segundos hasta tener la respuesta (o el error).
+            tamano (int): Bytes del cuerpo recibido.
+        """
+        with self._lock:
+            metricas = self._patron(url)
+            metricas.solicitudes += 1
+            metricas.latencia.agregar(latencia)
+            metricas.bytes += tamano
+            if status is None:
+                metricas.errores_conexion += 1
+            else:
+                clave = str(status)
+                metricas.respuestas[clave] = metricas.respuestas.get(clave, 0) + 1
+
+    def registrar_reintento(self, url: str):
+        with self._lock:
+            self._patron(url).reintentos += 1
+
+    def registrar_cache(self, url: str, revalidada: bool = False):
+        """Registra una respuesta servida desde la caché (fresca, o confirmada con un 304)."""
+        with self._lock:
+            metricas = self._patron(url)
+            if revalidada:
+                metricas.cache_revalidada += 1
+            else:
+                metricas.cache_fresca += 1
+
+    def reiniciar(self):
+        with self._lock:
+            self._patrones = {}
+            self.inicio = datetime.now()
+
+    def resumen(self) -> List[Dict]:
+        """
+        Devuelve una fila por patrón de URL con contadores y percentiles de latencia (ms).
+        """
+        filas = []
+        with self._lock:
+            for patron in sorted(self._patrones):
+                m = self._patrones[patron]
+                fila = {
+                    "patron": patron,
+                    "solicitudes": m.solicitudes,
+                    "ok": sum(v for k, v in m.respuestas.items() if k.startswith("2")),
+                    "no_modificadas_304": m.respuestas.get("304", 0),
+                    "no_encontradas_404": m.respuestas.get("404", 0),
+                    "otros_errores_http": sum(
+                        v
+                        for k, v in m.respuestas.items()
+                        if not k.startswith("2") and k not in ("304", "404")
+                    ),
+                    "errores_conexion": m.errores_conexion,
+                    "reintentos": m.reintentos,
+                    "bytes": m.bytes,
+                    "cache_fresca": m.cache_fresca,
+                    "cache_revalidada": m.cache_revalidada,
+                }
+                media = m.latencia.media()
+                fila["latencia_media_ms"] = round(media * 1000, 1) if media is not None else None
+                for p in PERCENTILES:
+                    valor = m.latencia.percentil(p)
+                    fila[f"latencia_p{p}_ms"] = round(valor * 1000, 1) if valor is not None else None
+                fila["latencia_max_ms"] = round(m.latencia.maximo * 1000, 1)
+                filas.append(fila)
+        return filas
+
+    def exportar(self, directorio: str = DIRECTORIO_METRICAS, nombre: Optional[str] = None):
+        """
+        Escribe el resumen como <nombre>.json y <nombre>.csv y lo muestra en el log.
+
+        Args:
+            directorio (str): Carpeta de salida (default Data/metricas).
+            nombre (Optional[str]): Nombre base de los archivos (default: fecha y hora de inicio).
+
+        Returns:
+            Tuple[str, str]: Rutas del JSON y del CSV.
+        """
+        filas = self.resumen()
+        nombre = nombre or f"solicitudes_{self.inicio:%Y-%m-%d_%H%M%S}"
+        os.makedirs(directorio, exist_ok=True)
+        ruta_json = os.path.join(directorio, f"{nombre}.json")
+        ruta_csv = os.path.join(directorio, f"{nombre}.csv")
+
+        with open(ruta_json, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "inicio": self.inicio.isoformat(timespec="seconds"),
+                    "fin": datetime.now().isoformat(timespec="seconds"),
+                    "patrones": filas,
+                },
+                f,
+                indent=4,
+            )
+        with open(ruta_csv, "w", newline="", encoding="utf-8") as f:
+            if filas:
+                writer = csv.DictWriter(f, fieldnames=list(filas[0]))
+                writer.writeheader()
+                writer.writerows(filas)
+
+        for fila in filas:
+            logger.info(
+                f"{fila['patron']}: {fila['solicitudes']} solicitudes, "
+                f"p50 {fila['latencia_p50_ms']} ms, p95 {fila['latencia_p95_ms']} ms, "
+                f"{fila['reintentos']} reintentos, {fila['no_encontradas_404']} 404, "
+                f"{fila['bytes'] / 1e6:.1f} MB, caché {fila['cache_fresca']}+{fila['cache_revalidada']}"
+            )
+        logger.info(f"Métricas de solicitudes guardadas en {ruta_json} y {ruta_csv}")
+        return ruta_json, ruta_csv
+
+
+# Instancia global que alimenta utils.requester
+METRICAS = Metricas()
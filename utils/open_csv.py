@@ -1,7 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+Lectura de CSV con detección de encoding.
+El encoding se decide sobre una muestra acotada del principio y del final del
+archivo, probando primero los encodings del proyecto (utf-8-sig, utf-8,
+latin-1) y recurriendo a chardet solo si ninguno encaja. El resultado se
+recuerda por (ruta, mtime, tamaño), así que leer varias veces el mismo
+archivo no lo vuelve a analizar.
+"""
+
+import codecs
+import os
+import re
+import threading
+from typing import Dict, Tuple
+
 import chardet
 import pandas as pd
 
-def leer_csv_con_encoding_detectado(path, sep):
-    with open(path, 'rb') as file:
-        result = chardet.detect(file.read())
-    return pd.read_csv(path, encoding=result['encoding'], sep=sep)
\ No newline at end of file
+TAMANIO_MUESTRA = 64 * 1024
+
+# Bytes 0x80-0x9F: en latin-1 son caracteres de control, en un CSV indican cp1252 u otro
+_CONTROLES_C1 = re.compile(rb"[\x80-\x9f]")
+
+_ENCODINGS: Dict[Tuple[str, int, int], str] = {}
+_lock = threading.Lock()
+
+
+def _muestra(path: str, tamanio: int) -> Tuple[bytes, bytes]:
+    """Primeros y últimos `tamanio` bytes del archivo (el final vacío si el archivo es chico)."""
+    with open(path, "rb") as f:
+        inicio = f.read(tamanio)
+        total = os.fstat(f.fileno()).st_size
+        if total <= 2 * tamanio:
+            return inicio + f.read(), b""
+        f.seek(total - tamanio)
+        return inicio, f.read()
+
+
+def _es_utf8(inicio: bytes, final: bytes) -> bool:
+    try:
+        # El inicio puede cortar un carácter multibyte al final...
+        codecs.getincrementaldecoder("utf-8")().decode(inicio, final=False)
+        # ...y el final al principio: se saltean los bytes de continuación
+        recorte = 0
+        while recorte < min(3, len(final)) and 0x80 <= final[recorte] <= 0xBF:
+            recorte += 1
+        final[recorte:].decode("utf-8")
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+def _detectar(path: str) -> str:
+    inicio, final = _muestra(path, TAMANIO_MUESTRA)
+    if inicio.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    if _es_utf8(inicio, final):
+        return "utf-8"
+    muestra = inicio + final
+    if not _CONTROLES_C1.search(muestra):
+        return "latin-1"
+    return chardet.detect(muestra)["encoding"] or "latin-1"
+
+
+def detectar_encoding(path: str) -> str:
+    """
+    Encoding del archivo, recordado mientras no cambien su mtime ni su tamaño.
+
+    Args:
+        path (str): Ruta del archivo.
+
+    Returns:
+        str: Nombre del encoding ('utf-8-sig', 'utf-8', 'latin-1' u otro de chardet).
+    """
+    estado = os.stat(path)
+    clave = (os.path.abspath(path), estado.st_mtime_ns, estado.st_size)
+    encoding = _ENCODINGS.get(clave)
+    if encoding is None:
+        encoding = _detectar(path)
+        with _lock:
+            _ENCODINGS[clave] = encoding
+    return encoding
+
+
+def leer_csv_con_encoding_detectado(path, sep=";", **kwargs):
+    encoding = detectar_encoding(path)
+    try:
+        return pd.read_csv(path, encoding=encoding, sep=sep, **kwargs)
+    except UnicodeDecodeError:
+        # La muestra parecía utf-8 pero el medio del archivo no lo es
+        if not encoding.startswith("utf-8"):
+            raise
+        estado = os.stat(path)
+        with _lock:
+            _ENCODINGS[(os.path.abspath(path), estado.st_mtime_ns, estado.st_size)] = "latin-1"
+        return pd.read_csv(path, encoding="latin-1", sep=sep, **kwargs)
+
+
+def leer_csv_con_encoding_detectado_Comas(path, **kwargs):
+    """Igual que leer_csv_con_encoding_detectado para CSV separados por comas."""
+    return leer_csv_con_encoding_detectado(path, sep=",", **kwargs)
@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+"""
+Perfilado por etapas del scraping (descarga, extracción de HTML, parsers,
+inferencia de rondas y normalización de equipos).
+Cada hilo acumula tiempos en su propio diccionario, sin locks en el camino
+caliente; el reporte los suma por temporada y categoría al final.
+"""
+
+import cProfile
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from utils.logger import get_logger
+
+logger = get_logger("Perfilado")
+
+# Orden de las columnas del reporte
+ETAPAS = (
+    "fetch",
+    "extraer_html",
+    "parsear_fase",
+    "parsear_grupo",
+    "parsear_jornada",
+    "inferir_ronda",
+    "normalizar_equipo",
+)
+
+
+class Perfilador:
+    """
+    Acumula tiempo y llamadas por (anio, categoria, etapa).
+
+    Uso:
+        perfilador = Perfilador()
+        parsear = perfilador.envolver("parsear_jornada", parsear_jornada)
+        perfilador.contexto(2025, "U13")
+        parsear(texto)
+        perfilador.imprimir()
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._tablas: List[Dict[Tuple, List[int]]] = []
+
+    def _tabla(self) -> Dict[Tuple, List[int]]:
+        tabla = getattr(self._local, "tabla", None)
+        if tabla is None:
+            tabla = self._local.tabla = {}
+            self._local.clave = (None, None)
+            with self._lock:
+                self._tablas.append(tabla)
+        return tabla
+
+    def contexto(self, anio, categoria):
+        """Fija la temporada y categoría a las que se imputan las mediciones de este hilo."""
+        self._tabla()
+        self._local.clave = (anio, categoria)
+
+    def sumar(self, etapa: str, nanosegundos: int):
+        tabla = self._tabla()
+        clave = self._local.clave + (etapa,)
+        acumulado = tabla.get(clave)
+        if acumulado is None:
+            tabla[clave] = [nanosegundos, 1]
+        else:
+            acumulado[0] += nanosegundos
+            acumulado[1] += 1
+
+    def envolver(self, etapa: str, funcion: Callable) -> Callable:
+        """Devuelve `funcion` instrumentada: cada llamada suma su duración a `etapa`."""
+        reloj = time.perf_counter_ns
+        sumar = self.sumar
+
+        def medida(*args, **kwargs):
+            inicio = reloj()
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                sumar(etapa, reloj() - inicio)
+
+        medida.__wrapped__ = funcion
+        return medida
+
+    def resumen(self) -> List[Dict]:
+        """
+        Una fila por (anio, categoria) con segundos y llamadas de cada etapa.
+        """
+        totales: Dict[Tuple, Dict] = {}
+        with self._lock:
+            tablas = list(self._tablas)
+        for tabla in tablas:
+            for (anio, categoria, etapa), (ns, llamadas) in list(tabla.items()):
+                fila = totales.setdefault(
+                    (anio, categoria), {"anio": anio, "categoria": categoria}
+                )
+                fila[f"{etapa}_s"] = fila.get(f"{etapa}_s", 0.0) + ns / 1e9
+                fila[f"{etapa}_n"] = fila.get(f"{etapa}_n", 0) + llamadas
+
+        filas = []
+        for clave in sorted(totales, key=lambda c: (str(c[0]), str(c[1]))):
+            fila = totales[clave]
+            for etapa in ETAPAS:
+                fila.setdefault(f"{etapa}_s", 0.0)
+                fila.setdefault(f"{etapa}_n", 0)
+            filas.append(fila)
+        return filas
+
+    def imprimir(self):
+        """Imprime el desglose por categoría, el total de cada temporada y el total general."""
+        filas = self.resumen()
+        if not filas:
+            logger.info("Perfilado: no hay mediciones")
+            return
+
+        encabezado = f"{'anio':>6} {'categoria':<14}" + "".join(
+            f"{etapa:>18}" for etapa in ETAPAS
+        )
+
+        def linea(anio, categoria, segundos):
+            return f"{str(anio):>6} {str(categoria):<14}" + "".join(
+                f"{segundos[etapa]:>17.3f}s" for etapa in ETAPAS
+            )
+
+        print("\n--- Perfilado por etapa (segundos) ---")
+        print(encabezado)
+        general = dict.fromkeys(ETAPAS, 0.0)
+        for anio in dict.fromkeys(f["anio"] for f in filas):
+            temporada = dict.fromkeys(ETAPAS, 0.0)
+            for fila in (f for f in filas if f["anio"] == anio):
+                segundos = {etapa: fila[f"{etapa}_s"] for etapa in ETAPAS}
+                print(linea(anio, fila["categoria"], segundos))
+                for etapa in ETAPAS:
+                    temporada[etapa] += segundos[etapa]
+                    general[etapa] += segundos[etapa]
+            print(linea(anio, "TOTAL", temporada))
+
+        total = sum(general.values()) or 1.0
+        print(linea("", "TOTAL", general))
+        print(
+            "Reparto: "
+            + ", ".join(f"{etapa} {100 * general[etapa] / total:.1f}%" for etapa in ETAPAS)
+        )
+        llamadas = {etapa: sum(f[f"{etapa}_n"] for f in filas) for etapa in ETAPAS}
+        print(
+            "Costo medio por llamada: "
+            + ", ".join(
+                f"{etapa} {1e6 * general[etapa] / llamadas[etapa]:.0f}us"
+                for etapa in ETAPAS
+                if llamadas[etapa]
+            )
+        )
+
+
+class PerfilCProfile:
+    """
+    Context manager que corre cProfile y vuelca las estadísticas (pstats) al salir.
+    Solo perfila el hilo principal: para ver el scraper completo usar --workers 1.
+    """
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self._perfil = cProfile.Profile() if path else None
+
+    def __enter__(self):
+        if self._perfil is not None:
+            self._perfil.enable()
+        return self
+
+    def __exit__(self, *exc):
+        if self._perfil is not None:
+            self._perfil.disable()
+            self._perfil.dump_stats(self.path)
+            logger.info(f"Perfil cProfile guardado en {self.path} (ver con python -m pstats)")
@@ -1,14 +1,24 @@
 # -*- coding: utf-8 -*-
 """
 Requester utility para el ETL de FEBAMBA.
-Maneja solicitudes HTTP GET con retries y exponential backoff.
+Maneja solicitudes HTTP GET con retries y exponential backoff,
+en versión bloqueante (requests) y asíncrona (httpx + asyncio).
 """
 
+import asyncio
+import collections
+import contextlib
+import threading
 import time
+import httpx
 import requests
-from typing import Optional
+from requests.adapters import HTTPAdapter
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlsplit
 
+from utils.cache_http import CacheHTTP
 from utils.logger import get_logger
+from utils.metricas import METRICAS
 
 logger = get_logger("Requester")
 
@@ -19,6 +29,321 @@ SESSION.headers.update(
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
     }
 )
+# Pool de conexiones suficiente para el modo concurrente del scraper
+SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
+
+class _CupoEnVuelo:
+    """
+    Tope de solicitudes simultáneas de un host, compartido por hilos y corutinas.
+    Los hilos esperan en una Condition; las corutinas, en un future de su event
+    loop que se resuelve cuando se libera un lugar (se les pasa directamente,
+    sin sondear).
+    """
+
+    def __init__(self, maximo: int):
+        self._condicion = threading.Condition()
+        self._libres = maximo
+        # (loop, future) de las corutinas que esperan un lugar, en orden de llegada
+        self._corutinas = collections.deque()
+
+    def ocupar(self, bloquear: bool = True) -> bool:
+        """Toma un lugar desde un hilo; con bloquear=False devuelve False si no hay."""
+        with self._condicion:
+            while self._libres == 0:
+                if not bloquear:
+                    return False
+                self._condicion.wait()
+            self._libres -= 1
+            return True
+
+    async def ocupar_async(self):
+        """Toma un lugar desde una corutina sin bloquear el event loop."""
+        with self._condicion:
+            if self._libres > 0:
+                self._libres -= 1
+                return
+            loop = asyncio.get_running_loop()
+            futuro = loop.create_future()
+            self._corutinas.append((loop, futuro))
+        try:
+            await futuro
+        except asyncio.CancelledError:
+            # Si el lugar llegó a entregarse antes de la cancelación, se devuelve
+            if futuro.done() and not futuro.cancelled():
+                self.liberar()
+            raise
+
+    def liberar(self):
+        """Devuelve un lugar: pasa a la primera corutina en espera o despierta a un hilo."""
+        with self._condicion:
+            while self._corutinas:
+                loop, futuro = self._corutinas.popleft()
+                if futuro.done():
+                    continue  # corutina cancelada mientras esperaba
+                try:
+                    loop.call_soon_threadsafe(self._entregar, futuro)
+                    return
+                except RuntimeError:
+                    continue  # su event loop ya se cerró
+            self._libres += 1
+            self._condicion.notify()
+
+    def _entregar(self, futuro: asyncio.Future):
+        # Corre en el event loop de la corutina
+        if futuro.cancelled():
+            self.liberar()
+        else:
+            futuro.set_result(None)
+
+    def __enter__(self):
+        self.ocupar()
+        return self
+
+    def __exit__(self, *exc):
+        self.liberar()
+
+
+class _CuboHost:
+    """Estado del token bucket y del ritmo adaptativo de un host."""
+
+    def __init__(self, tasa: float, rafaga: float, max_en_vuelo: Optional[int], ahora: float):
+        self.tasa = tasa
+        self.rafaga = rafaga
+        self.tokens = rafaga
+        self.actualizado = ahora
+        self.latencia_media: Optional[float] = None
+        self.ultima_baja = 0.0
+        self.en_vuelo = _CupoEnVuelo(max_en_vuelo) if max_en_vuelo else None
+
+    def recargar(self, ahora: float):
+        self.tokens = min(
+            self.rafaga, self.tokens + (ahora - self.actualizado) * self.tasa
+        )
+        self.actualizado = ahora
+
+
+class LimitadorSolicitudes:
+    """
+    Presupuesto de cortesía compartido por todos los fetchers del proceso
+    (hilos del scraper y corutinas de hacer_solicitud_async).
+
+    Cada host tiene un token bucket: se acumulan `tasa` tokens por segundo hasta
+    `rafaga`, y cada solicitud consume uno. Si no hay, se reserva el turno
+    (tokens negativos) y se devuelve cuánto hay que esperarlo.
+
+    La tasa es adaptativa (AIMD): ante 429/5xx, errores de conexión o picos de
+    latencia se reduce a la mitad; con cada respuesta sana sube de a poco hasta
+    `maximo`. Opcionalmente limita además las solicitudes en vuelo por host, con
+    un mismo cupo para hilos (en_vuelo) y corutinas (en_vuelo_async).
+    """
+
+    FACTOR_BAJA = 0.5
+    FACTOR_PICO_LATENCIA = 3.0
+    ALFA_LATENCIA = 0.2
+    # Tras una baja se ignoran otras señales durante este tiempo, para no
+    # castigar varias veces la misma ráfaga de errores concurrentes
+    ENFRIAMIENTO = 1.0
+
+    def __init__(
+        self,
+        solicitudes_por_segundo: float,
+        maximo: Optional[float] = None,
+        minimo: Optional[float] = None,
+        rafaga: float = 1.0,
+        max_en_vuelo: Optional[int] = None,
+        adaptativo: bool = True,
+        reloj: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            solicitudes_por_segundo (float): Ritmo inicial por host.
+            maximo (Optional[float]): Techo al que puede subir el ritmo (default 4x el inicial).
+            minimo (Optional[float]): Piso del ritmo ante errores (default 1/10 del inicial).
+            rafaga (float): Solicitudes que pueden salir juntas tras un período ocioso.
+            max_en_vuelo (Optional[int]): Solicitudes simultáneas por host (None = sin tope).
+            adaptativo (bool): Si es False el ritmo queda fijo.
+            reloj (Callable[[], float]): Reloj monotónico en segundos (inyectable en tests).
+        """
+        self.inicial = solicitudes_por_segundo
+        self.maximo = maximo if maximo is not None else 4 * solicitudes_por_segundo
+        self.minimo = minimo if minimo is not None else solicitudes_por_segundo / 10
+        self.rafaga = rafaga
+        self.max_en_vuelo = max_en_vuelo
+        self.adaptativo = adaptativo
+        self.reloj = reloj
+        # Suba aditiva: duplicar el ritmo inicial lleva unas 20 respuestas sanas
+        self.paso = solicitudes_por_segundo / 20
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, _CuboHost] = {}
+
+    def _cubo(self, url: str) -> _CuboHost:
+        host = urlsplit(url).netloc
+        cubo = self._hosts.get(host)
+        if cubo is None:
+            cubo = self._hosts[host] = _CuboHost(
+                self.inicial, self.rafaga, self.max_en_vuelo, self.reloj()
+            )
+        return cubo
+
+    def tasa(self, url: str) -> float:
+        """Ritmo actual (solicitudes por segundo) para el host de la URL."""
+        with self._lock:
+            return self._cubo(url).tasa
+
+    def reservar(self, url: str) -> float:
+        """Consume un token del host y devuelve cuántos segundos hay que esperar el turno."""
+        with self._lock:
+            cubo = self._cubo(url)
+            cubo.recargar(self.reloj())
+            cubo.tokens -= 1
+            return -cubo.tokens / cubo.tasa if cubo.tokens < 0 else 0.0
+
+    def esperar(self, url: str):
+        """Bloquea el hilo actual hasta que haya turno para una nueva solicitud al host."""
+        espera = self.reservar(url)
+        if espera > 0:
+            time.sleep(espera)
+
+    def en_vuelo(self, url: str):
+        """Context manager que ocupa un lugar del tope de solicitudes simultáneas del host."""
+        with self._lock:
+            cupo = self._cubo(url).en_vuelo
+        return cupo if cupo is not None else contextlib.nullcontext()
+
+    @contextlib.asynccontextmanager
+    async def en_vuelo_async(self, url: str):
+        """
+        Versión para corutinas de en_vuelo: ocupa un lugar del mismo tope que los
+        hilos y espera a que se libere uno sin bloquear el event loop.
+        """
+        with self._lock:
+            cupo = self._cubo(url).en_vuelo
+        if cupo is None:
+            yield
+            return
+        await cupo.ocupar_async()
+        try:
+            yield
+        finally:
+            cupo.liberar()
+
+    def _bajar(self, cubo: _CuboHost, ahora: float, motivo: str):
+        if ahora - cubo.ultima_baja < self.ENFRIAMIENTO:
+            return
+        anterior = cubo.tasa
+        cubo.tasa = max(self.minimo, cubo.tasa * self.FACTOR_BAJA)
+        cubo.ultima_baja = ahora
+        logger.info(f"Bajando ritmo ({motivo}): {anterior:.2f} ➔ {cubo.tasa:.2f} req/s")
+
+    def registrar(self, url: str, status: Optional[int], latencia: Optional[float] = None):
+        """
+        Informa el resultado de una solicitud para adaptar el ritmo del host.
+
+        Args:
+            url (str): URL solicitada.
+            status (Optional[int]): Código HTTP, o None si falló la conexión.
+            latencia (Optional[float]): Segundos que tardó la respuesta.
+        """
+        if not self.adaptativo:
+            return
+        with self._lock:
+            cubo = self._cubo(url)
+            ahora = self.reloj()
+            cubo.recargar(ahora)
+            if status is None or status == 429 or status >= 500:
+                self._bajar(cubo, ahora, f"HTTP {status}" if status else "error de conexión")
+                return
+
+            if latencia is not None:
+                media = cubo.latencia_media
+                if media is not None and latencia > self.FACTOR_PICO_LATENCIA * media:
+                    self._bajar(cubo, ahora, f"latencia {latencia:.2f}s vs {media:.2f}s")
+                    # El pico entra suavizado para que la media no se dispare
+                    latencia = self.FACTOR_PICO_LATENCIA * media
+                cubo.latencia_media = (
+                    latencia
+                    if media is None
+                    else media + self.ALFA_LATENCIA * (latencia - media)
+                )
+                if cubo.ultima_baja == ahora:
+                    return
+
+            cubo.tasa = min(self.maximo, cubo.tasa + self.paso)
+
+    def penalizar(self, url: str, segundos: float):
+        """Respeta un Retry-After: nadie sale hacia el host antes de `segundos`."""
+        with self._lock:
+            cubo = self._cubo(url)
+            cubo.recargar(self.reloj())
+            cubo.tokens = min(cubo.tokens, -segundos * cubo.tasa)
+
+
+LIMITADOR: Optional[LimitadorSolicitudes] = None
+CACHE: Optional[CacheHTTP] = None
+
+
+class SolicitudFallida(Exception):
+    """Se agotaron los intentos de una solicitud (errores HTTP distintos de 404 o de conexión)."""
+
+
+def configurar_limitador(solicitudes_por_segundo: Optional[float], **kwargs):
+    """
+    Activa (o desactiva con None) el presupuesto global de solicitudes por segundo.
+
+    Args:
+        solicitudes_por_segundo (Optional[float]): Ritmo inicial por host para todo el proceso.
+        **kwargs: maximo, minimo, rafaga, max_en_vuelo y adaptativo de LimitadorSolicitudes.
+    """
+    global LIMITADOR
+    LIMITADOR = (
+        LimitadorSolicitudes(solicitudes_por_segundo, **kwargs)
+        if solicitudes_por_segundo
+        else None
+    )
+
+
+def _en_vuelo(url: str):
+    return LIMITADOR.en_vuelo(url) if LIMITADOR is not None else contextlib.nullcontext()
+
+
+def _en_vuelo_async(url: str):
+    return LIMITADOR.en_vuelo_async(url) if LIMITADOR is not None else contextlib.nullcontext()
+
+
+def _registrar_respuesta(url: str, response, latencia: float):
+    """
+    Informa el resultado a las métricas y al limitador, y respeta un
+    Retry-After numérico en los 429.
+    """
+    METRICAS.registrar_respuesta(url, response.status_code, latencia, len(response.content))
+    if LIMITADOR is None:
+        return
+    LIMITADOR.registrar(url, response.status_code, latencia)
+    if response.status_code == 429:
+        try:
+            espera = float(response.headers.get("Retry-After", ""))
+        except ValueError:
+            return
+        LIMITADOR.penalizar(url, espera)
+
+
+def _registrar_error_conexion(url: str, latencia: float):
+    METRICAS.registrar_respuesta(url, None, latencia)
+    if LIMITADOR is not None:
+        LIMITADOR.registrar(url, None)
+
+
+def configurar_cache(cache: Optional[CacheHTTP]):
+    """
+    Activa (o desactiva con None) la caché en disco para todas las solicitudes.
+
+    Args:
+        cache (Optional[CacheHTTP]): Caché a usar por hacer_solicitud y hacer_solicitud_async.
+    """
+    global CACHE
+    CACHE = cache
 
 
 def hacer_solicitud(
@@ -35,13 +360,32 @@ def hacer_solicitud(
     Returns:
         Optional[bytes]: Contenido binario de la respuesta o None si falló.
     """
+    entrada = CACHE.obtener(url) if CACHE is not None else None
+    if entrada is not None and entrada["fresca"]:
+        logger.debug(f"Caché fresca para {url}")
+        METRICAS.registrar_cache(url)
+        return entrada["contenido"]
+    cabeceras = CacheHTTP.cabeceras_condicionales(entrada)
+
     intentos = 0
 
     while intentos < max_intentos:
+        if LIMITADOR is not None:
+            LIMITADOR.esperar(url)
+        inicio = time.monotonic()
         try:
-            response = SESSION.get(url, timeout=timeout)
+            with _en_vuelo(url):
+                response = SESSION.get(url, timeout=timeout, headers=cabeceras)
+            _registrar_respuesta(url, response, time.monotonic() - inicio)
+            if response.status_code == 304 and entrada is not None:
+                logger.debug(f"Sin cambios (304) en {url}")
+                CACHE.renovar(url)
+                METRICAS.registrar_cache(url, revalidada=True)
+                return entrada["contenido"]
             response.raise_for_status()
             logger.debug(f"Solicitud exitosa a {url}")
+            if CACHE is not None:
+                CACHE.guardar(url, response.content, response.headers)
             return response.content
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 404:
@@ -52,6 +396,7 @@ def hacer_solicitud(
                     f"Error HTTP {e.response.status_code} en {url}, intento {intentos + 1}/{max_intentos}"
                 )
         except requests.exceptions.RequestException as e:
+            _registrar_error_conexion(url, time.monotonic() - inicio)
             logger.error(
                 f"Excepción en solicitud a {url}: {e}, intento {intentos + 1}/{max_intentos}"
             )
@@ -60,8 +405,158 @@ def hacer_solicitud(
         if intentos < max_intentos:
             wait_time = 2**intentos  # Exponential backoff: 2s, 4s, 8s, 16s...
             logger.info(f"Esperando {wait_time}s antes de reintentar {url}...")
+            METRICAS.registrar_reintento(url)
             time.sleep(wait_time)
         else:
             logger.error(f"Fallaron todos los {max_intentos} intentos para {url}")
 
     return None
+
+
+class SesionAsync:
+    """
+    Sesión HTTP asíncrona compartida: un único pool de conexiones keep-alive
+    y un tope de solicitudes simultáneas por host.
+
+    Uso:
+        async with SesionAsync(max_por_host=8) as sesion:
+            html = await hacer_solicitud_async(url, sesion)
+    """
+
+    def __init__(
+        self,
+        max_por_host: int = 8,
+        max_conexiones: int = 32,
+        timeout: int = 30,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        """
+        Args:
+            max_por_host (int): Solicitudes simultáneas por host de esta sesión.
+            max_conexiones (int): Tamaño del pool de conexiones.
+            timeout (int): Timeout por solicitud en segundos.
+            transport (httpx.AsyncBaseTransport): Transporte de httpx (p. ej. MockTransport en tests).
+        """
+        self.max_por_host = max_por_host
+        self.cliente = httpx.AsyncClient(
+            transport=transport,
+            headers=dict(SESSION.headers),
+            limits=httpx.Limits(
+                max_connections=max_conexiones,
+                max_keepalive_connections=max_conexiones,
+            ),
+            timeout=timeout,
+            follow_redirects=True,
+        )
+        self._semaforos: Dict[str, asyncio.Semaphore] = {}
+
+    def semaforo(self, url: str) -> asyncio.Semaphore:
+        """Devuelve el semáforo que limita la concurrencia contra el host de la URL."""
+        host = urlsplit(url).netloc
+        if host not in self._semaforos:
+            # El tope del limitador global (compartido con los hilos) se aplica aparte
+            self._semaforos[host] = asyncio.Semaphore(self.max_por_host)
+        return self._semaforos[host]
+
+    async def cerrar(self):
+        await self.cliente.aclose()
+
+    async def __aenter__(self) -> "SesionAsync":
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.cerrar()
+
+
+async def hacer_solicitud_async(
+    url: str,
+    sesion: SesionAsync,
+    max_intentos: int = 5,
+    timeout: int = 30,
+    lanzar_si_falla: bool = False,
+) -> Optional[bytes]:
+    """
+    Versión asíncrona de hacer_solicitud: mismos reintentos, backoff y tratamiento del 404.
+    La espera entre intentos no ocupa el cupo del host y la tarea puede cancelarse
+    en cualquier punto (asyncio.CancelledError se propaga sin reintentar).
+
+    Args:
+        url (str): URL a solicitar.
+        sesion (SesionAsync): Sesión con el pool de conexiones compartido.
+        max_intentos (int): Número máximo de intentos (default 5).
+        timeout (int): Timeout por intento en segundos (default 30).
+        lanzar_si_falla (bool): Si es True, agotar los intentos lanza SolicitudFallida
+            en lugar de devolver None, para distinguirlo de un 404.
+
+    Returns:
+        Optional[bytes]: Contenido binario de la respuesta o None si falló.
+    """
+    entrada = CACHE.obtener(url) if CACHE is not None else None
+    if entrada is not None and entrada["fresca"]:
+        logger.debug(f"Caché fresca para {url}")
+        METRICAS.registrar_cache(url)
+        return entrada["contenido"]
+    cabeceras = CacheHTTP.cabeceras_condicionales(entrada)
+
+    intentos = 0
+
+    while intentos < max_intentos:
+        if LIMITADOR is not None:
+            espera = LIMITADOR.reservar(url)
+            if espera > 0:
+                await asyncio.sleep(espera)
+        inicio = time.monotonic()
+        try:
+            async with sesion.semaforo(url), _en_vuelo_async(url):
+                response = await sesion.cliente.get(
+                    url, timeout=timeout, headers=cabeceras
+                )
+            _registrar_respuesta(url, response, time.monotonic() - inicio)
+            if response.status_code == 304 and entrada is not None:
+                logger.debug(f"Sin cambios (304) en {url}")
+                CACHE.renovar(url)
+                METRICAS.registrar_cache(url, revalidada=True)
+                return entrada["contenido"]
+            response.raise_for_status()
+            logger.debug(f"Solicitud exitosa a {url}")
+            if CACHE is not None:
+                CACHE.guardar(url, response.content, response.headers)
+            return response.content
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 404:
+                logger.warning(f"Recurso no encontrado (404) en {url}")
+                return None  # No reintentar si es 404
+            else:
+                logger.warning(
+                    f"Error HTTP {e.response.status_code} en {url}, intento {intentos + 1}/{max_intentos}"
+                )
+        except httpx.HTTPError as e:
+            _registrar_error_conexion(url, time.monotonic() - inicio)
+            logger.error(
+                f"Excepción en solicitud a {url}: {e!r}, intento {intentos + 1}/{max_intentos}"
+            )
+
+        intentos += 1
+        if intentos < max_intentos:
+            wait_time = 2**intentos  # Exponential backoff: 2s, 4s, 8s, 16s...
+            logger.info(f"Esperando {wait_time}s antes de reintentar {url}...")
+            METRICAS.registrar_reintento(url)
+            await asyncio.sleep(wait_time)
+        else:
+            logger.error(f"Fallaron todos los {max_intentos} intentos para {url}")
+
+    if lanzar_si_falla:
+        raise SolicitudFallida(url)
+    return None
+
+
+async def hacer_solicitudes_async(
+    urls: List[str], sesion: SesionAsync, **kwargs
+) -> List[Optional[bytes]]:
+    """
+    Descarga varias URLs a la vez desde el mismo event loop.
+    Devuelve los contenidos en el mismo orden que `urls`.
+    """
+    return await asyncio.gather(
+        *(hacer_solicitud_async(url, sesion, **kwargs) for url in urls)
+    )
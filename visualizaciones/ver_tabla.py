@@ -3,8 +3,13 @@ import streamlit as st
 from pathlib import Path
 import os
 import re
+import sys
 import plotly.express as px
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.almacen import RUTA_ALMACEN, cargar_partidos
+
 st.set_page_config(page_title="FORMATIVAS FEBAMBA 2025", layout="wide")
 
 st.title("TORNEO DE FORMATIVAS FEBAMBA 2025")
@@ -98,14 +103,13 @@ st.dataframe(tabla, use_container_width=True)
 
 # Mostrar resultados de partidos para la selección actual
 st.subheader("Resultados de partidos")
-partidos_path = Path(script_dir) / ".." / "Data" / "partidos_2025.csv"
-partidos_path = partidos_path.resolve()
-if not partidos_path.exists():
-    st.error(f"No se encontró el archivo de partidos: {partidos_path}")
+almacen_path = (Path(script_dir) / ".." / RUTA_ALMACEN).resolve()
+try:
+    partidos = cargar_partidos(anios=2025, categoricas=False, ruta=str(almacen_path))
+except FileNotFoundError as e:
+    st.error(str(e))
     st.stop()
 
-partidos = pd.read_csv(partidos_path, sep=";")
-
 # Filtros según selección
 # Normalizar mayúsculas y espacios para evitar problemas de coincidencia
 partidos['zona'] = partidos['zona'].astype(str).str.strip().str.upper()
@@ -128,16 +132,21 @@ equipo_sel = st.selectbox("Equipo", tabla.index.tolist(), key="equipo_detalle")
 tipo_sel = st.selectbox("Tipo de resultado", ["Ganados", "Perdidos", "No Presenta"], key="tipo_detalle")
 
 def get_tooltip(equipo, tipo, partidos_filtrados):
+    # ptsL/ptsV son Int16 con nulos (partidos sin resultado): las comparaciones dan <NA>
+    # y se toman como False para poder filtrar con las máscaras
+    ptsL, ptsV = partidos_filtrados['ptsL'], partidos_filtrados['ptsV']
+    es_local = partidos_filtrados['local'] == equipo
+    es_visitante = partidos_filtrados['visitante'] == equipo
     if tipo == 'Ganados':
-        ganados = partidos_filtrados[(partidos_filtrados['local'] == equipo) & (partidos_filtrados['ptsL'] > partidos_filtrados['ptsV'])]
-        ganados = pd.concat([ganados, partidos_filtrados[(partidos_filtrados['visitante'] == equipo) & (partidos_filtrados['ptsV'] > partidos_filtrados['ptsL'])]])
+        ganados = partidos_filtrados[(es_local & (ptsL > ptsV)).fillna(False)]
+        ganados = pd.concat([ganados, partidos_filtrados[(es_visitante & (ptsV > ptsL)).fillna(False)]])
         return ganados
     if tipo == 'Perdidos':
-        perdidos = partidos_filtrados[(partidos_filtrados['local'] == equipo) & (partidos_filtrados['ptsL'] < partidos_filtrados['ptsV'])]
-        perdidos = pd.concat([perdidos, partidos_filtrados[(partidos_filtrados['visitante'] == equipo) & (partidos_filtrados['ptsV'] < partidos_filtrados['ptsL'])]])
+        perdidos = partidos_filtrados[(es_local & (ptsL < ptsV)).fillna(False)]
+        perdidos = pd.concat([perdidos, partidos_filtrados[(es_visitante & (ptsV < ptsL)).fillna(False)]])
         return perdidos
     if tipo == 'No Presenta':
-        np = partidos_filtrados[((partidos_filtrados['local'] == equipo) & (partidos_filtrados['ptsL'] == 0)) | ((partidos_filtrados['visitante'] == equipo) & (partidos_filtrados['ptsV'] == 0))]
+        np = partidos_filtrados[((es_local & (ptsL == 0)) | (es_visitante & (ptsV == 0))).fillna(False)]
         return np
     return pd.DataFrame()
 